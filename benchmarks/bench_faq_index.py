@@ -0,0 +1,64 @@
+"""Auto-suggest latency: in-memory FaqIndex vs search_faq_ranked against SQLite
+
+Usage: python benchmarks/bench_faq_index.py [--faqs 300] [--messages 2000]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.database_manager import DatabaseManager
+from utils.faq_index import FaqIndex
+
+WORDS = [
+    '파이썬', '설치', '에러가', '오류', '디스코드', '봇', '토큰', '권한', '서버', '데이터베이스',
+    'python', 'pip', 'module', 'import', 'token', 'discord', 'sqlite', 'windows', 'linux', 'path',
+    'venv', 'permission', 'timeout', 'unicode', 'encoding', 'thread', 'async', 'await', 'build', 'deploy',
+]
+
+def sentence(rng: random.Random, length: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(length))
+
+async def run(faqs: int, messages: int):
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, 'bench.db'))
+        await db.initialize()
+        for _ in range(faqs):
+            await db.add_faq(sentence(rng, 6), sentence(rng, 40), ','.join(rng.sample(WORDS, 3)))
+        
+        started = time.perf_counter()
+        index = FaqIndex()
+        index.build(await db.get_all_faq())
+        print(f'Built index of {len(index)} FAQs in {(time.perf_counter() - started) * 1000:.1f} ms')
+        
+        queries = [sentence(rng, 8) + '?' for _ in range(messages)]
+        
+        started = time.perf_counter()
+        for query in queries:
+            await db.search_faq_ranked(query, limit=2)
+        db_elapsed = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        for query in queries:
+            index.search(query, limit=2)
+        index_elapsed = time.perf_counter() - started
+        
+        print(f'search_faq_ranked (SQLite) {db_elapsed / messages * 1e6:9.1f} us/message')
+        print(f'FaqIndex.search            {index_elapsed / messages * 1e6:9.1f} us/message')
+        await db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--faqs', type=int, default=300)
+    parser.add_argument('--messages', type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.faqs, args.messages))
+
+if __name__ == '__main__':
+    main()
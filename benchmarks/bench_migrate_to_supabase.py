@@ -0,0 +1,140 @@
+"""End-to-end SQLite -> Supabase migration against the PostgREST stand-in: interrupt, resume, verify
+
+Seeds a SQLite database, migrates it into benchmarks/postgrest_stub.py, kills the run
+after a few question chunks, resumes from the checkpoint and checks that row counts and
+checksums match. A row then tampered with on the Supabase side must show as a mismatch.
+
+Usage: python benchmarks/bench_migrate_to_supabase.py [--questions 3000] [--chunk-size 200] [--latency-ms 2]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.postgrest_stub import PostgrestStub, STUB_KEY
+from database.schema_migrations import load_migrations
+
+# Question chunks uploaded before the first run is killed
+CHUNKS_BEFORE_CRASH = 3
+
+class Crash(BaseException):
+    """Stands in for the process being killed mid-migration (not retried like an upload error)"""
+
+async def seed(path: str, questions: int):
+    from database.database_manager import DatabaseManager
+    
+    db = DatabaseManager(path)
+    await db.initialize()
+    await db.add_user(1, 'asker')
+    await db.add_user(2, 'admin', 'Admin', True)
+    for i in range(questions):
+        question_id = await db.create_question(1, 10000 + i, f'question {i}', 'link', 'Python', 'error', 'tried')
+        if i % 3 == 0:
+            await db.add_answer(question_id, 2, f'answer {i}', is_solution=i % 2 == 0)
+            await db.record_response_time(question_id, i % 90, 2)
+    for i in range(20):
+        await db.add_faq(f'faq {i}', f'answer {i}', 'python', 2)
+    await db.close()
+
+async def migrate(args, sqlite_path: str, checkpoint_path: str, crash_after: int = None) -> dict:
+    """One migrator run; crash_after kills it once that many question chunks were uploaded"""
+    from database.supabase_manager import SupabaseManager
+    from utils.migrate_to_supabase import TABLES, Checkpoint, SupabaseMigrator
+    
+    manager = SupabaseManager()
+    await manager.connect()
+    upserted = {'questions': 0}
+    upsert_rows = manager.upsert_rows
+    
+    async def counting_upsert(table, rows, on_conflict):
+        if table == 'questions':
+            if crash_after is not None and upserted[table] >= crash_after * args.chunk_size:
+                raise Crash()
+            upserted[table] += len(rows)
+        await upsert_rows(table, rows, on_conflict)
+    
+    manager.upsert_rows = counting_upsert
+    migrator = SupabaseMigrator(sqlite_path, manager, Checkpoint(checkpoint_path), args.chunk_size, args.parallel)
+    started = time.perf_counter()
+    crashed = False
+    try:
+        for table in TABLES:
+            await migrator.migrate_table(table)
+    except Crash:
+        crashed = True
+    finally:
+        migrator.close()
+        await manager.close()
+    return {'crashed': crashed, 'questions': upserted['questions'], 'seconds': time.perf_counter() - started}
+
+async def verify(sqlite_path: str, tables: list = None) -> list:
+    from database.supabase_manager import SupabaseManager
+    from utils.migrate_to_supabase import TABLES, Checkpoint, SupabaseMigrator
+    
+    manager = SupabaseManager()
+    await manager.connect()
+    migrator = SupabaseMigrator(sqlite_path, manager, Checkpoint(os.devnull, restart=True))
+    try:
+        return [await migrator.verify_table(table) for table in TABLES if tables is None or table.name in tables]
+    finally:
+        migrator.close()
+        await manager.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--questions', type=int, default=3000)
+    parser.add_argument('--chunk-size', type=int, default=200)
+    parser.add_argument('--parallel', type=int, default=4)
+    parser.add_argument('--latency-ms', type=float, default=2)
+    args = parser.parse_args()
+    
+    stub = PostgrestStub(latency=args.latency_ms / 1000).start()
+    stub.tables['schema_version'] = [{'version': m.version, 'name': m.name} for m in load_migrations('supabase')]
+    os.environ['DATABASE_TYPE'] = 'supabase'
+    os.environ['SUPABASE_URL'] = stub.url
+    os.environ['SUPABASE_ANON_KEY'] = STUB_KEY
+    
+    failures = []
+    
+    def check(ok: bool, message: str):
+        print(f"{'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures.append(message)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_path = os.path.join(tmp, 'bot.db')
+        checkpoint_path = os.path.join(tmp, 'checkpoint.json')
+        asyncio.run(seed(sqlite_path, args.questions))
+        print(f'Seeded {args.questions} questions, chunks of {args.chunk_size}, {args.parallel} in flight')
+        
+        first = asyncio.run(migrate(args, sqlite_path, checkpoint_path, crash_after=CHUNKS_BEFORE_CRASH))
+        check(first['crashed'], f"first run killed after {first['questions']} question rows")
+        
+        from utils.migrate_to_supabase import Checkpoint
+        state = Checkpoint(checkpoint_path).table('questions')
+        check(bool(state['last_key']) and not state['done'],
+              f"checkpoint resumes questions after id {state['last_key']} ({state['rows']} rows)")
+        
+        second = asyncio.run(migrate(args, sqlite_path, checkpoint_path))
+        check(not second['crashed'] and second['questions'] == args.questions - state['rows'],
+              f"resumed run uploaded the remaining {second['questions']} question rows "
+              f"in {second['seconds']:.2f}s")
+        
+        for report in asyncio.run(verify(sqlite_path)):
+            check(report['count_ok'] and report['checksum_ok'],
+                  f"{report['table']}: {report['local_rows']} local / {report['remote_rows']} remote rows, "
+                  f"checksum {'ok' if report['checksum_ok'] else 'MISMATCH'}")
+        
+        stub.tables['questions'][len(stub.tables['questions']) // 2]['title'] = 'tampered'
+        report = asyncio.run(verify(sqlite_path, ['questions']))[0]
+        check(report['count_ok'] and not report['checksum_ok'], 'tampered question row reported as a checksum mismatch')
+    
+    stub.stop()
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""/통계 overview: one COUNT(*) per counter vs the single-scan get_overview_stats()
+
+Usage: python benchmarks/bench_overview_stats.py [--sizes 100000 1000000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_query_plans import populate
+from database.database_manager import DatabaseManager
+
+# The statements the statistics cog used to run, one per counter
+LEGACY_QUERIES = [
+    'SELECT COUNT(*) FROM questions',
+    "SELECT COUNT(*) FROM questions WHERE status = 'solved'",
+    "SELECT COUNT(*) FROM questions WHERE status = 'in_progress'",
+    "SELECT COUNT(*) FROM questions WHERE status = 'open'",
+    'SELECT COUNT(*) FROM users',
+    "SELECT COUNT(DISTINCT user_id) FROM questions WHERE created_at >= date('now', '-30 days')",
+    "SELECT COUNT(*) FROM users WHERE created_at >= date('now', '-7 days')",
+    'SELECT COUNT(*) FROM answers',
+    "SELECT AVG(response_time_minutes) FROM response_times WHERE created_at >= date('now', '-30 days')",
+    "SELECT MIN(response_time_minutes) FROM response_times WHERE created_at >= date('now', '-30 days')",
+    'SELECT programming_language, COUNT(*) AS count FROM questions GROUP BY programming_language ORDER BY count DESC LIMIT 5',
+    "SELECT COUNT(*) FROM questions WHERE created_at >= date('now', '-7 days')",
+    "SELECT COUNT(*) FROM answers WHERE created_at >= date('now', '-7 days')",
+    "SELECT COUNT(*) FROM questions WHERE status = 'solved' AND updated_at >= date('now', '-7 days')",
+    'SELECT COUNT(*) FROM faq',
+    "SELECT COALESCE(SUM(faq_searches), 0) FROM daily_stats WHERE date >= date('now', '-7 days')",
+]
+
+async def legacy_overview(manager: DatabaseManager):
+    async with manager.pool.reader() as db:
+        for query in LEGACY_QUERIES:
+            async with db.execute(query) as cursor:
+                await cursor.fetchall()
+
+async def median_ms(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+async def run_size(questions: int, users: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        manager = DatabaseManager(path)
+        await manager.initialize()
+        await manager.close()
+        
+        conn = sqlite3.connect(path)
+        populate(conn, questions, users)
+        conn.execute('ANALYZE')
+        conn.close()
+        
+        manager = DatabaseManager(path)
+        await manager.initialize()
+        legacy = await median_ms(lambda: legacy_overview(manager), repeat)
+        single_scan = await median_ms(manager.get_overview_stats, repeat)
+        await manager.close()
+    
+    print(f'{questions:>10,} questions   {len(LEGACY_QUERIES)} statements {legacy:9.1f} ms   '
+          f'get_overview_stats() {single_scan:9.1f} ms   {legacy / single_scan:5.1f}x')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--users', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    for questions in args.sizes:
+        asyncio.run(run_size(questions, args.users, args.repeat))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Query plans and timings before/after the index migration
+
+Usage: python benchmarks/bench_query_plans.py [--questions 1000000]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.schema_migrations import load_migrations
+
+LANGUAGES = ['Python', 'JavaScript', 'Java', 'C++', 'C#', 'Go', 'Rust', 'Kotlin', 'TypeScript', 'PHP']
+STATUSES = ['open', 'in_progress', 'solved', 'closed']
+
+QUERIES = {
+    'get_user_questions': (
+        'SELECT * FROM questions WHERE user_id = ? ORDER BY created_at DESC', ('user_id',)
+    ),
+    'solved_last_7_days': (
+        "SELECT COUNT(*) FROM questions WHERE status = 'solved' AND created_at >= date('now', '-7 days')", ()
+    ),
+    'questions_last_7_days': (
+        "SELECT COUNT(*) FROM questions WHERE created_at >= date('now', '-7 days')", ()
+    ),
+    'top_languages_30_days': (
+        "SELECT programming_language, COUNT(*) AS count FROM questions "
+        "WHERE created_at >= date('now', '-30 days') GROUP BY programming_language ORDER BY count DESC LIMIT 10", ()
+    ),
+    'answers_of_question': (
+        'SELECT * FROM answers WHERE question_id = ?', ('question_id',)
+    ),
+    'avg_response_time_30_days': (
+        "SELECT AVG(response_time_minutes) FROM response_times WHERE created_at >= date('now', '-30 days')", ()
+    ),
+}
+
+def populate(conn: sqlite3.Connection, questions: int, users: int):
+    """Fill the tables with synthetic history spread over ~3 years"""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    
+    def timestamp() -> str:
+        return (now - timedelta(minutes=rng.randrange(3 * 365 * 24 * 60))).strftime('%Y-%m-%d %H:%M:%S')
+    
+    conn.executemany(
+        'INSERT INTO users (user_id, username, display_name, created_at) VALUES (?, ?, ?, ?)',
+        ((uid, f'user{uid}', f'User {uid}', timestamp()) for uid in range(1, users + 1))
+    )
+    conn.executemany(
+        '''INSERT INTO questions (id, user_id, thread_id, title, os, programming_language,
+                                  error_message, purpose, status, created_at, updated_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+        (
+            (qid, rng.randint(1, users), 10 ** 12 + qid, f'question {qid}', 'Windows 11',
+             rng.choice(LANGUAGES), 'Traceback ...', 'purpose', rng.choice(STATUSES), ts, ts)
+            for qid in range(1, questions + 1)
+            for ts in (timestamp(),)
+        )
+    )
+    conn.executemany(
+        'INSERT INTO answers (question_id, admin_id, answer_text, is_solution, created_at) VALUES (?, ?, ?, ?, ?)',
+        ((rng.randint(1, questions), 1, 'answer', rng.random() < 0.3, timestamp()) for _ in range(questions // 2))
+    )
+    conn.executemany(
+        'INSERT INTO response_times (question_id, response_time_minutes, created_at) VALUES (?, ?, ?)',
+        ((rng.randint(1, questions), rng.randint(1, 5000), timestamp()) for _ in range(questions // 5))
+    )
+    conn.commit()
+
+def run_queries(conn: sqlite3.Connection, label: str, repeat: int):
+    """Print query plan and median timing of every benchmark query"""
+    params = {'user_id': 7, 'question_id': 12345}
+    print(f'\n=== {label} ===')
+    for name, (sql, param_names) in QUERIES.items():
+        args = tuple(params[p] for p in param_names)
+        plan = ' | '.join(row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', args))
+        
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            conn.execute(sql, args).fetchall()
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        
+        print(f'{name:28s} {timings[len(timings) // 2] * 1000:9.2f} ms   {plan}')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--questions', type=int, default=1_000_000)
+    parser.add_argument('--users', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    migrations = load_migrations('sqlite')
+    initial, indexes = migrations[0], migrations[1]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, 'bench.db'))
+        conn.executescript(initial.sql)
+        
+        started = time.perf_counter()
+        populate(conn, args.questions, args.users)
+        print(f'Populated {args.questions:,} questions in {time.perf_counter() - started:.1f}s')
+        
+        run_queries(conn, f'before {indexes.version:04d}_{indexes.name}', args.repeat)
+        
+        started = time.perf_counter()
+        conn.executescript(indexes.sql)
+        conn.execute('ANALYZE')
+        print(f'\nBuilt indexes in {time.perf_counter() - started:.1f}s')
+        
+        run_queries(conn, f'after {indexes.version:04d}_{indexes.name}', args.repeat)
+        conn.close()
+
+if __name__ == '__main__':
+    main()
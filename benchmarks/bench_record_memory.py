@@ -0,0 +1,89 @@
+"""Memory and build time of 100k question rows: per-row dicts vs QuestionRecord
+
+Usage: python benchmarks/bench_record_memory.py [--rows 100000]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.records import QuestionRecord, row_factory
+from database.schema_migrations import load_migrations
+
+QUESTION_COLUMNS = (
+    'id', 'user_id', 'thread_id', 'title', 'os', 'programming_language', 'error_message',
+    'purpose', 'code_snippet', 'log_files', 'screenshot_url', 'attempted_solutions',
+    'status', 'created_at', 'updated_at',
+)
+
+def dict_rows(conn: sqlite3.Connection):
+    """The previous hand-built 15-key dict per row"""
+    rows = conn.execute('SELECT * FROM questions').fetchall()
+    return [{
+        'id': row[0],
+        'user_id': row[1],
+        'thread_id': row[2],
+        'title': row[3],
+        'os': row[4],
+        'programming_language': row[5],
+        'error_message': row[6],
+        'purpose': row[7],
+        'code_snippet': row[8],
+        'log_files': row[9],
+        'screenshot_url': row[10],
+        'attempted_solutions': row[11],
+        'status': row[12],
+        'created_at': row[13],
+        'updated_at': row[14]
+    } for row in rows]
+
+def record_rows(conn: sqlite3.Connection):
+    """Rows built by the shared record row factory"""
+    cursor = conn.execute('SELECT * FROM questions')
+    cursor.row_factory = row_factory(QuestionRecord)
+    return cursor.fetchall()
+
+def measure(label: str, build, conn: sqlite3.Connection, rows: int):
+    """Print retained memory per row and build time"""
+    # Time without tracemalloc, its hooks distort allocation-heavy code
+    started = time.perf_counter()
+    result = build(conn)
+    elapsed = time.perf_counter() - started
+    del result
+    
+    tracemalloc.start()
+    result = build(conn)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    assert len(result) == rows
+    print(f'{label:16s} {current / rows:8.1f} B/row retained   {peak / 2 ** 20:7.1f} MiB peak   {elapsed * 1000:8.1f} ms')
+    del result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    args = parser.parse_args()
+    
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(load_migrations('sqlite')[0].sql)
+    conn.executemany(
+        f'INSERT INTO questions ({", ".join(QUESTION_COLUMNS)}) VALUES ({", ".join("?" * len(QUESTION_COLUMNS))})',
+        (
+            (i, i % 1000, 10 ** 12 + i, f'[Python] question {i}', 'Windows 11', 'Python 3.12',
+             'ModuleNotFoundError', 'purpose', None, None, None, None, 'open',
+             '2024-01-01 00:00:00', '2024-01-01 00:00:00')
+            for i in range(1, args.rows + 1)
+        )
+    )
+    
+    print(f'{args.rows:,} question rows (row values themselves are included in both)')
+    measure('dict per row', dict_rows, conn, args.rows)
+    measure('QuestionRecord', record_rows, conn, args.rows)
+
+if __name__ == '__main__':
+    main()
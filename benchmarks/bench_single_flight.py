@@ -0,0 +1,64 @@
+"""Concurrent identical Supabase reads with and without request coalescing
+
+Runs against the local PostgREST stand-in (benchmarks/postgrest_stub.py).
+
+Usage: python benchmarks/bench_single_flight.py [--concurrency 50] [--latency-ms 20]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.postgrest_stub import PostgrestStub, STUB_KEY
+from database.schema_migrations import load_migrations
+
+async def run_mode(stub: PostgrestStub, coalesce: bool, concurrency: int):
+    from database.single_flight import SingleFlightManager
+    from database.supabase_manager import SupabaseManager
+    
+    manager = SupabaseManager()
+    await manager.initialize()
+    db_manager = SingleFlightManager(manager) if coalesce else manager
+    
+    requests_before = stub.requests
+    started = time.perf_counter()
+    # Admins opening the same three threads at once
+    results = await asyncio.gather(*(
+        db_manager.get_question_by_thread(1001 + i % 3) for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    requests = stub.requests - requests_before
+    await db_manager.close()
+    
+    assert all(result is not None for result in results)
+    label = 'single-flight' if coalesce else 'direct'
+    print(f'{label:14s} wall {elapsed * 1000:8.1f} ms   HTTP requests {requests:4d}')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    args = parser.parse_args()
+    
+    stub = PostgrestStub(latency=args.latency_ms / 1000).start()
+    stub.tables['questions'] = [
+        {'id': i, 'user_id': 1, 'thread_id': 1000 + i, 'title': f'question {i}', 'status': 'open'}
+        for i in range(1, 11)
+    ]
+    stub.tables['schema_version'] = [{'version': m.version, 'name': m.name} for m in load_migrations('supabase')]
+    
+    os.environ['DATABASE_TYPE'] = 'supabase'
+    os.environ['SUPABASE_URL'] = stub.url
+    os.environ['SUPABASE_ANON_KEY'] = STUB_KEY
+    
+    print(f'{args.concurrency} concurrent get_question_by_thread() calls over 3 threads, '
+          f'{args.latency_ms:.0f} ms simulated round-trip')
+    for coalesce in (False, True):
+        asyncio.run(run_mode(stub, coalesce, args.concurrency))
+    stub.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Event-loop lag while 50 Supabase requests are in flight: blocking calls vs executor vs async client
+
+Runs against the local PostgREST stand-in (benchmarks/postgrest_stub.py).
+
+Usage: python benchmarks/bench_supabase_loop_lag.py [--concurrency 50] [--latency-ms 20]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.postgrest_stub import PostgrestStub, STUB_KEY
+from database.schema_migrations import load_migrations
+
+PROBE_INTERVAL = 0.005
+
+async def probe_lag(stop: asyncio.Event, lags: list):
+    """Measure how late a periodic 5 ms timer fires, like the gateway heartbeat would"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+async def run_mode(mode: str, concurrency: int):
+    from database.supabase_manager import SupabaseManager
+    
+    manager = SupabaseManager(use_async_client=(mode == 'async'))
+    await manager.initialize()
+    if mode == 'blocking':
+        # The previous behaviour: the sync client called directly from the coroutine
+        async def blocking_execute(builder):
+            return builder.execute()
+        manager._execute = blocking_execute
+    
+    stop = asyncio.Event()
+    lags = []
+    probe = asyncio.create_task(probe_lag(stop, lags))
+    await asyncio.sleep(0.05)
+    
+    started = time.perf_counter()
+    results = await asyncio.gather(*(manager.get_question(i % 10 + 1) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    
+    stop.set()
+    await probe
+    await manager.close()
+    
+    assert all(result is not None for result in results)
+    lags.sort()
+    print(
+        f'{mode:9s} wall {elapsed * 1000:8.1f} ms   '
+        f'loop lag p50 {lags[len(lags) // 2] * 1000:7.1f} ms   max {lags[-1] * 1000:7.1f} ms'
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    args = parser.parse_args()
+    
+    stub = PostgrestStub(latency=args.latency_ms / 1000).start()
+    stub.tables['questions'] = [
+        {'id': i, 'user_id': 1, 'thread_id': 1000 + i, 'title': f'question {i}', 'status': 'open'}
+        for i in range(1, 11)
+    ]
+    stub.tables['schema_version'] = [{'version': m.version, 'name': m.name} for m in load_migrations('supabase')]
+    
+    os.environ['DATABASE_TYPE'] = 'supabase'
+    os.environ['SUPABASE_URL'] = stub.url
+    os.environ['SUPABASE_ANON_KEY'] = STUB_KEY
+    
+    print(f'{args.concurrency} concurrent get_question() calls, {args.latency_ms:.0f} ms simulated round-trip')
+    for mode in ('blocking', 'executor', 'async'):
+        asyncio.run(run_mode(mode, args.concurrency))
+    stub.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Tokenizer throughput and FAQ auto-suggest recall: previous keyword LIKE matching vs tokenizers
+
+Usage: python benchmarks/bench_tokenizer.py [--repeat 2000]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.records import FaqRecord
+from utils.faq_index import FaqIndex
+from utils.tokenizer import get_tokenizer
+
+FAQS = [
+    (1, '파이썬 설치 방법', 'python.org 에서 설치 파일을 받고 PATH 추가를 체크하세요.', 'python,설치,install'),
+    (2, '디스코드 봇 토큰 오류', '개발자 포털에서 토큰을 재발급하고 .env 파일을 수정하세요.', 'discord,token,토큰'),
+    (3, 'ModuleNotFoundError 해결', '가상환경을 활성화한 뒤 pip install 로 모듈을 설치하세요.', 'pip,module,import'),
+    (4, '가상환경 만들기', 'python -m venv venv 로 만들고 activate 스크립트를 실행하세요.', 'venv,virtualenv'),
+    (5, '인코딩 에러 해결', "파일을 열 때 encoding='utf-8' 을 지정하세요.", 'UnicodeDecodeError,utf-8'),
+    (6, '권한 거부 오류', '관리자 권한으로 터미널을 실행하거나 파일 권한을 확인하세요.', 'PermissionError,권한'),
+    (7, '데이터베이스 연결 실패', 'DATABASE_PATH 설정과 파일 경로가 올바른지 확인하세요.', 'sqlite,database,db'),
+    (8, '슬래시 명령어가 안 보여요', '봇을 다시 초대할 때 applications.commands 범위를 포함하세요.', 'slash,command,명령어'),
+    (9, '들여쓰기 오류', 'IndentationError 는 탭과 스페이스를 섞어 쓸 때 발생합니다.', 'IndentationError,indent'),
+    (10, '비동기 함수 호출', 'async 함수는 await 로 호출해야 결과를 받을 수 있습니다.', 'async,await,asyncio'),
+    (11, '요청 시간 초과', '네트워크 상태를 확인하고 timeout 값을 늘려보세요.', 'timeout,TimeoutError'),
+    (12, '깃 푸시 거부', 'git pull 로 원격 변경을 먼저 합친 뒤 push 하세요.', 'git,push,rejected'),
+]
+
+# (message, expected FAQ id)
+QUERIES = [
+    ('파이썬을 설치하는데 자꾸 실패해요?', 1),
+    ('파이썬설치 어떻게 하나요?', 1),
+    ('봇 토큰이 잘못됐다고 나와요 왜 그런가요?', 2),
+    ('디스코드봇 로그인 에러가 나요', 2),
+    ('ModuleNotFoundError: No module named requests 문제', 3),
+    ('모듈을 못 찾는다는 에러가 떠요?', 3),
+    ('가상환경은 어떻게 만드나요?', 4),
+    ('venv 활성화가 안 돼요 도움', 4),
+    ('UnicodeDecodeError 가 발생해요?', 5),
+    ('인코딩이 깨지는 문제가 있어요', 5),
+    ('PermissionError: [Errno 13] 오류', 6),
+    ('권한이 없다고 나와요 왜죠?', 6),
+    ('데이터베이스에 연결이 안 돼요?', 7),
+    ('sqlite db 파일 경로 문제', 7),
+    ('슬래시 명령어를 등록했는데 안 보여요?', 8),
+    ('명령어가 안 떠요 도움!', 8),
+    ('IndentationError: unexpected indent 에러', 9),
+    ('들여쓰기가 이상하다고 나와요?', 9),
+    ('async 함수 결과가 coroutine 으로 나와요?', 10),
+    ('await 를 어디에 써야 하나요?', 10),
+    ('요청할 때 timeout 오류가 나요', 11),
+    ('시간초과 에러가 계속 발생해요?', 11),
+    ('git push 가 rejected 돼요?', 12),
+    ('깃 푸시가 거부됐어요 왜?', 12),
+]
+
+def faq_records():
+    return [FaqRecord(id=i, question=q, answer=a, keywords=k) for i, q, a, k in FAQS]
+
+def previous_suggest(faqs, message: str, limit: int = 2):
+    """The previous on_message logic: first 3 words longer than 2 chars, substring LIKE each"""
+    words = [word for word in re.findall(r'\b\w+\b', message.lower()) if len(word) > 2]
+    found = []
+    for keyword in words[:3]:
+        for faq in faqs:
+            text = ' '.join(faq[field] or '' for field in ('question', 'answer', 'keywords')).lower()
+            if keyword in text and faq not in found:
+                found.append(faq)
+    return found[:limit]
+
+def recall(suggest, limit: int = 2) -> float:
+    hits = sum(1 for message, expected in QUERIES if expected in [faq['id'] for faq in suggest(message, limit)])
+    return hits / len(QUERIES)
+
+def throughput(tokenizer, repeat: int) -> float:
+    texts = [text for faq in FAQS for text in faq[1:]] + [message for message, _ in QUERIES]
+    tokens = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            tokens += len(tokenizer.index_terms(text))
+    return tokens / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+    
+    faqs = faq_records()
+    print(f'{len(FAQS)} FAQs, {len(QUERIES)} labelled messages, recall@2')
+    print(f'{"previous keyword LIKE":24s} recall {recall(lambda m, k: previous_suggest(faqs, m, k)):6.1%}')
+    
+    for name in ('simple', 'korean'):
+        tokenizer = get_tokenizer(name)
+        index = FaqIndex(tokenizer)
+        index.build(faqs)
+        print(
+            f'{"FaqIndex + " + name:24s} recall {recall(index.search):6.1%}   '
+            f'{throughput(tokenizer, args.repeat) / 1e6:6.2f} M tokens/s'
+        )
+
+if __name__ == '__main__':
+    main()
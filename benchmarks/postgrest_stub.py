@@ -0,0 +1,233 @@
+"""Minimal in-memory PostgREST stand-in for local Supabase benchmarks
+
+Supports what SupabaseManager uses: select / insert / update / delete on
+/rest/v1/<table> with eq, neq, gt, gte, lt, lte, is and in filters, order,
+limit / offset and Range paging, plus registered /rest/v1/rpc/<fn> handlers.
+Every request sleeps for a fixed latency to stand in for the network round-trip.
+
+Usage: python benchmarks/postgrest_stub.py [--port 54321] [--latency-ms 20]
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+from urllib.parse import parse_qsl, urlsplit
+
+# Key accepted by the Supabase client's JWT format check
+STUB_KEY = 'stub.stub.stub'
+
+FILTER_OPERATORS = {
+    'eq': lambda a, b: a is not None and a == b,
+    'neq': lambda a, b: a is not None and a != b,
+    'gt': lambda a, b: a is not None and a > b,
+    'gte': lambda a, b: a is not None and a >= b,
+    'lt': lambda a, b: a is not None and a < b,
+    'lte': lambda a, b: a is not None and a <= b,
+}
+
+def _coerce(value: str, sample):
+    """Convert a query string value to the type stored in the column"""
+    if isinstance(sample, bool):
+        return value == 'true'
+    if isinstance(sample, int):
+        try:
+            return int(value)
+        except ValueError:
+            return value
+    if isinstance(sample, float):
+        return float(value)
+    return value
+
+class PostgrestStub:
+    """Threaded HTTP server holding tables as lists of dicts"""
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.02):
+        self.latency = latency
+        self.tables: Dict[str, List[Dict]] = {}
+        self.sequences: Dict[str, int] = {}
+        self.rpcs: Dict[str, Callable[[Dict], object]] = {}
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self._thread = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+    
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='postgrest-stub', daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def rpc(self, name: str):
+        """Register an RPC handler taking the JSON params"""
+        def register(func):
+            self.rpcs[name] = func
+            return func
+        return register
+    
+    def _matches(self, row: Dict, filters: List) -> bool:
+        for column, negate, operator, value in filters:
+            current = row.get(column)
+            if operator == 'is':
+                result = current is None if value == 'null' else current == (value == 'true')
+            elif operator == 'in':
+                options = [_coerce(v.strip('"'), current) for v in value.strip('()').split(',')]
+                result = current in options
+            else:
+                result = FILTER_OPERATORS[operator](current, _coerce(value, current))
+            if result == negate:
+                return False
+        return True
+    
+    def _handler_class(self):
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def log_message(self, format, *args):
+                pass
+            
+            def _send(self, status: int, body=None, headers: Dict = None):
+                payload = json.dumps(body, default=str).encode() if body is not None else b''
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(payload)
+            
+            def _body(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                return json.loads(self.rfile.read(length)) if length else None
+            
+            def _parse(self):
+                parts = urlsplit(self.path)
+                path = parts.path.split('/rest/v1/', 1)[-1]
+                params = parse_qsl(parts.query, keep_blank_values=True)
+                filters, options = [], {}
+                for key, value in params:
+                    if key in ('select', 'order', 'limit', 'offset', 'on_conflict', 'columns'):
+                        options[key] = value
+                        continue
+                    match = re.match(r'^(not\.)?(\w+)\.(.*)$', value)
+                    if match:
+                        filters.append((key, bool(match.group(1)), match.group(2), match.group(3)))
+                return path, filters, options
+            
+            def _select(self, rows: List[Dict], options: Dict) -> List[Dict]:
+                if 'order' in options:
+                    for term in reversed(options['order'].split(',')):
+                        column, _, direction = term.partition('.')
+                        rows = sorted(
+                            rows,
+                            key=lambda row: (row.get(column) is None, row.get(column)),
+                            reverse=direction.startswith('desc')
+                        )
+                offset = int(options.get('offset', 0))
+                limit = options.get('limit')
+                range_header = self.headers.get('Range')
+                if range_header:
+                    first, _, last = range_header.partition('-')
+                    offset, limit = int(first), int(last) - int(first) + 1
+                rows = rows[offset:offset + int(limit) if limit is not None else None]
+                select = options.get('select', '*')
+                if select != '*':
+                    columns = [column.strip() for column in select.split(',')]
+                    rows = [{column: row.get(column) for column in columns} for row in rows]
+                return rows
+            
+            def _handle(self, method: str):
+                time.sleep(stub.latency)
+                path, filters, options = self._parse()
+                # Always consume the body, the connection is kept alive for the next request
+                body = self._body()
+                with stub.lock:
+                    stub.requests += 1
+                    if path.startswith('rpc/'):
+                        handler = stub.rpcs.get(path[4:])
+                        if handler is None:
+                            return self._send(404, {'message': f'function {path[4:]} not found'})
+                        return self._send(200, handler(body or {}))
+                    
+                    table = stub.tables.setdefault(path, [])
+                    if method == 'GET':
+                        rows = [row for row in table if stub._matches(row, filters)]
+                        headers = {'Content-Range': f'0-{max(len(rows) - 1, 0)}/{len(rows)}'}
+                        return self._send(200, self._select(rows, options), headers)
+                    
+                    if method == 'POST':
+                        rows = body if isinstance(body, list) else [body]
+                        inserted = []
+                        for row in rows:
+                            row = dict(row)
+                            if 'id' not in row and path not in ('users', 'daily_stats'):
+                                stub.sequences[path] = stub.sequences.get(path, 0) + 1
+                                row['id'] = stub.sequences[path]
+                            row.setdefault('created_at', time.strftime('%Y-%m-%dT%H:%M:%S'))
+                            conflict = options.get('on_conflict')
+                            existing = next(
+                                (r for r in table if conflict and all(r.get(c) == row.get(c) for c in conflict.split(','))),
+                                None
+                            )
+                            if existing is not None:
+                                if 'ignore-duplicates' not in (self.headers.get('Prefer') or ''):
+                                    existing.update(row)
+                                    inserted.append(existing)
+                                continue
+                            table.append(row)
+                            inserted.append(row)
+                        return self._send(201, inserted)
+                    
+                    matched = [row for row in table if stub._matches(row, filters)]
+                    if method == 'PATCH':
+                        for row in matched:
+                            row.update(body or {})
+                        return self._send(200, matched)
+                    if method == 'DELETE':
+                        stub.tables[path] = [row for row in table if row not in matched]
+                        return self._send(200, matched)
+                return self._send(405, {'message': 'method not allowed'})
+            
+            def do_GET(self):
+                self._handle('GET')
+            
+            def do_HEAD(self):
+                self._handle('GET')
+            
+            def do_POST(self):
+                self._handle('POST')
+            
+            def do_PATCH(self):
+                self._handle('PATCH')
+            
+            def do_DELETE(self):
+                self._handle('DELETE')
+        
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=54321)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    args = parser.parse_args()
+    
+    stub = PostgrestStub(port=args.port, latency=args.latency_ms / 1000)
+    print(f'PostgREST stub on {stub.url} (key: {STUB_KEY})')
+    stub.server.serve_forever()
+
+if __name__ == '__main__':
+    main()
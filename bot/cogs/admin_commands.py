@@ -47,6 +47,21 @@ class AdminCommands(commands.Cog):
         )
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        """Record an admin's first message in a question thread as its first response"""
+        if message.author.bot or not isinstance(message.channel, discord.Thread):
+            return
+        
+        # O(1) in-memory check, most messages stop here without any I/O
+        db_manager = self.bot.db_manager
+        question_thread = db_manager.awaiting_first_response(message.channel.id)
+        if question_thread is None or message.author.id == question_thread.user_id:
+            return
+        
+        if isinstance(message.author, discord.Member) and self.is_admin(message.author):
+            db_manager.record_first_response(question_thread.question_id, message.author.id, message.created_at)
+    
     @app_commands.command(name="권한확인", description="현재 사용자의 관리자 권한을 확인합니다")
     async def check_permissions(self, interaction: discord.Interaction):
         """Check user's admin permissions"""
@@ -126,7 +141,7 @@ class AdminCommands(commands.Cog):
         
         try:
             db_manager = self.bot.db_manager
-            question = await db_manager.get_question(question_id)
+            question = await db_manager.get_question(question_id, shape='summary')
             
             if not question:
                 await interaction.response.send_message(
@@ -194,7 +209,7 @@ class AdminCommands(commands.Cog):
             await interaction.response.defer(ephemeral=True)
             
             db_manager = self.bot.db_manager
-            question = await db_manager.get_question(question_id)
+            question = await db_manager.get_question(question_id, shape='summary')
             
             if not question:
                 await interaction.followup.send(
@@ -211,22 +226,10 @@ class AdminCommands(commands.Cog):
                 is_solution=is_solution
             )
             
-            # Update daily statistics
+            # Update daily statistics (first response / solution times are tracked by the database manager)
             await db_manager.update_daily_stats('answers_given')
             if is_solution:
                 await db_manager.update_daily_stats('questions_solved')
-                
-                # Calculate and record response time
-                question = await db_manager.get_question(question_id)
-                if question and question['created_at']:
-                    from datetime import datetime
-                    try:
-                        created_time = datetime.fromisoformat(question['created_at'].replace('Z', '+00:00'))
-                        response_time = datetime.now() - created_time
-                        minutes = int(response_time.total_seconds() / 60)
-                        await db_manager.record_response_time(question_id, minutes)
-                    except Exception:
-                        pass  # 시간 계산 실패시 무시
             
             # Post answer in thread
             thread = interaction.guild.get_channel_or_thread(question['thread_id'])
@@ -363,14 +366,36 @@ class AdminCommands(commands.Cog):
             return
         
         try:
-            # Placeholder for search functionality
-            await interaction.response.send_message(
-                f"🔍 질문 검색 기능은 구현 중입니다.\n"
-                f"키워드: '{keyword}'\n"
-                f"검색 범위: {search_type}",
-                ephemeral=True
+            db_manager = self.bot.db_manager
+            questions = await db_manager.search_questions(keyword, search_type)
+            
+            if not questions:
+                await interaction.response.send_message(
+                    f"🔍 '{keyword}'와 관련된 질문을 찾을 수 없습니다. (검색 범위: {search_type})",
+                    ephemeral=True
+                )
+                return
+            
+            embed = discord.Embed(
+                title=f"🔍 질문 검색 결과: '{keyword}'",
+                description=f"검색 범위: {search_type} · {len(questions)}개의 질문을 찾았습니다.",
+                color=discord.Color.blue(),
+                timestamp=discord.utils.utcnow()
             )
             
+            for question in questions[:10]:
+                thread_link = f"<#{question['thread_id']}>" if question['thread_id'] else "스레드 없음"
+                embed.add_field(
+                    name=f"#{question['id']} {question['title'][:80]}",
+                    value=f"상태: {question['status']} · {thread_link}",
+                    inline=False
+                )
+            
+            if len(questions) > 10:
+                embed.set_footer(text="상위 10개 결과만 표시합니다. 키워드를 더 구체적으로 입력해보세요.")
+            
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            
         except Exception as e:
             self.bot.logger.error(f"Error searching questions: {e}")
             await interaction.response.send_message(
@@ -401,7 +426,7 @@ class AdminCommands(commands.Cog):
             await interaction.response.defer(ephemeral=True)
             
             db_manager = self.bot.db_manager
-            question = await db_manager.get_question(question_id)
+            question = await db_manager.get_question(question_id, shape='summary')
             
             if not question:
                 await interaction.followup.send(
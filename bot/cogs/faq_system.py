@@ -2,13 +2,27 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from typing import Optional, List
-import re
+from utils.faq_index import FaqIndex
 
 class FAQSystem(commands.Cog):
     """FAQ (자주 묻는 질문) 관리 시스템"""
     
     def __init__(self, bot):
         self.bot = bot
+        self.faq_index = FaqIndex()
+    
+    async def cog_load(self):
+        """Build the in-memory FAQ index used by auto-suggest"""
+        self.faq_index.build(await self.bot.db_manager.get_all_faq())
+        self.bot.logger.info(f"FAQ index built with {len(self.faq_index)} FAQs")
+    
+    async def _reindex_faq(self, faq_id: int):
+        """Refresh one FAQ in the index after it was added or edited"""
+        faq = await self.bot.db_manager.get_faq_by_id(faq_id)
+        if faq:
+            self.faq_index.upsert(faq)
+        else:
+            self.faq_index.remove(faq_id)
     
     def is_admin(self, user: discord.Member) -> bool:
         """Check if user is admin"""
@@ -41,12 +55,13 @@ class FAQSystem(commands.Cog):
             db_manager = self.bot.db_manager
             
             # Add FAQ to database
-            await db_manager.add_faq(
+            faq_id = await db_manager.add_faq(
                 question=question,
                 answer=answer,
                 keywords=keywords,
                 created_by=interaction.user.id
             )
+            await self._reindex_faq(faq_id)
             
             embed = discord.Embed(
                 title="✅ FAQ가 추가되었습니다",
@@ -180,6 +195,7 @@ class FAQSystem(commands.Cog):
             
             # Delete FAQ
             await db_manager.delete_faq(faq_id)
+            self.faq_index.remove(faq_id)
             
             embed = discord.Embed(
                 title="🗑️ FAQ가 삭제되었습니다",
@@ -247,6 +263,7 @@ class FAQSystem(commands.Cog):
                 answer=answer,
                 keywords=keywords
             )
+            await self._reindex_faq(faq_id)
             
             embed = discord.Embed(
                 title="✏️ FAQ가 수정되었습니다",
@@ -299,28 +316,8 @@ class FAQSystem(commands.Cog):
             return
         
         try:
-            db_manager = self.bot.db_manager
-            
-            # Extract keywords from message
-            words = re.findall(r'\b\w+\b', message_lower)
-            potential_keywords = [word for word in words if len(word) > 2]
-            
-            if not potential_keywords:
-                return
-            
-            # Search for relevant FAQs
-            relevant_faqs = []
-            for keyword in potential_keywords[:3]:  # Check first 3 keywords
-                faqs = await db_manager.search_faq(keyword)
-                relevant_faqs.extend(faqs)
-            
-            # Remove duplicates
-            seen_ids = set()
-            unique_faqs = []
-            for faq in relevant_faqs:
-                if faq['id'] not in seen_ids:
-                    unique_faqs.append(faq)
-                    seen_ids.add(faq['id'])
+            # Rank against the in-memory index, the message hot path never touches the DB
+            unique_faqs = self.faq_index.search(message.content, limit=2)
             
             if unique_faqs:
                 embed = discord.Embed(
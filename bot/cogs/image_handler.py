@@ -28,11 +28,11 @@ class ImageHandler(commands.Cog):
             return
         
         try:
-            # Get question info from database
+            # Get question info from the in-memory thread index
             db_manager = self.bot.db_manager
-            question = await db_manager.get_question_by_thread(message.channel.id)
+            question_thread = await db_manager.lookup_question_thread(message.channel.id)
             
-            if not question:
+            if not question_thread:
                 return  # Not a question thread
             
             # Check for image attachments
@@ -63,7 +63,7 @@ class ImageHandler(commands.Cog):
             # Check if user is admin or question author
             from config.config import Config
             is_admin = False
-            is_author = message.author.id == question['user_id']
+            is_author = message.author.id == question_thread.user_id
             
             guild = message.guild
             if guild:
@@ -277,7 +277,7 @@ class OptionalInfoModal(discord.ui.Modal, title='추가 정보 입력'):
             await interaction.response.defer(ephemeral=True)
             
             # Get question and post additional info to thread
-            question = await self.db_manager.get_question(self.question_id)
+            question = await self.db_manager.get_question(self.question_id, shape='summary')
             if question:
                 channel = interaction.guild.get_channel_or_thread(question['thread_id'])
                 if channel:
@@ -347,7 +347,8 @@ class QuestionHandler(commands.Cog):
         """View user's questions"""
         try:
             db_manager = self.bot.db_manager
-            questions = await db_manager.get_user_questions(interaction.user.id)
+            # One row past the page tells whether there are more to count
+            questions = await db_manager.get_user_questions(interaction.user.id, limit=11, shape='summary')
             
             if not questions:
                 await interaction.response.send_message(
@@ -378,7 +379,8 @@ class QuestionHandler(commands.Cog):
                 )
             
             if len(questions) > 10:
-                embed.set_footer(text=f"총 {len(questions)}개 질문 중 최근 10개만 표시")
+                total = await db_manager.count_user_questions(interaction.user.id)
+                embed.set_footer(text=f"총 {total}개 질문 중 최근 10개만 표시")
             
             await interaction.response.send_message(embed=embed, ephemeral=True)
             
@@ -2,24 +2,36 @@ import discord
 from discord.ext import commands, tasks
 from discord import app_commands
 from typing import Optional, Dict, List, Tuple
-import aiosqlite
 import asyncio
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import json
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib import font_manager
 import io
 import base64
+from database.statistics import PERIOD_DAYS
+from utils.charts import ChartService
+
+PERIOD_NAMES = {
+    'week': "최근 7일",
+    'month': "최근 30일",
+    'quarter': "최근 90일",
+    'all': "전체 기간",
+}
 
 class StatisticsSystem(commands.Cog):
     """상세 통계 시스템"""
     
     def __init__(self, bot):
+        from config.config import Config
         self.bot = bot
-        # 한글 폰트 설정 (시스템에 따라 조정 필요)
-        plt.rcParams['font.family'] = ['Malgun Gothic', 'DejaVu Sans', 'Arial Unicode MS']
-        plt.rcParams['axes.unicode_minus'] = False
+        # 차트는 별도 프로세스에서 렌더링 (matplotlib은 첫 차트 요청 시 로드)
+        self.charts = ChartService(
+            workers=Config.CHART_RENDER_WORKERS,
+            max_entries=Config.CHART_CACHE_MAX_ENTRIES
+        )
+    
+    async def cog_unload(self):
+        """Stop the chart render workers"""
+        self.charts.close()
     
     def is_admin(self, user: discord.Member) -> bool:
         """Check if user is admin"""
@@ -287,226 +299,154 @@ class StatisticsSystem(commands.Cog):
                 ephemeral=True
             )
     
+    @staticmethod
+    def _format_minutes(minutes: Optional[float]) -> str:
+        """Response time in minutes as a short Korean duration"""
+        if minutes is None:
+            return "데이터 없음"
+        if minutes < 60:
+            return f"{minutes:.0f}분"
+        if minutes < 1440:
+            return f"{minutes / 60:.1f}시간"
+        return f"{minutes / 1440:.1f}일"
+    
     async def _get_basic_statistics(self, db_manager) -> Dict:
         """기본 통계 데이터 수집"""
         try:
-            async with aiosqlite.connect(db_manager.db_path) as db:
-                stats = {}
-                
-                # 질문 통계
-                async with db.execute('SELECT COUNT(*) FROM questions') as cursor:
-                    stats['total_questions'] = (await cursor.fetchone())[0]
-                
-                async with db.execute("SELECT COUNT(*) FROM questions WHERE status = 'solved'") as cursor:
-                    stats['solved_questions'] = (await cursor.fetchone())[0]
-                
-                async with db.execute("SELECT COUNT(*) FROM questions WHERE status = 'in_progress'") as cursor:
-                    stats['in_progress_questions'] = (await cursor.fetchone())[0]
-                
-                async with db.execute("SELECT COUNT(*) FROM questions WHERE status = 'open'") as cursor:
-                    stats['open_questions'] = (await cursor.fetchone())[0]
-                
-                # 해결률 계산
-                if stats['total_questions'] > 0:
-                    stats['solve_rate'] = (stats['solved_questions'] / stats['total_questions']) * 100
-                else:
-                    stats['solve_rate'] = 0
-                
-                # 사용자 통계
-                async with db.execute('SELECT COUNT(*) FROM users') as cursor:
-                    stats['total_users'] = (await cursor.fetchone())[0]
-                
-                # 활성 사용자 (최근 30일 내 질문한 사용자)
-                async with db.execute('''
-                    SELECT COUNT(DISTINCT user_id) FROM questions 
-                    WHERE created_at >= date('now', '-30 days')
-                ''') as cursor:
-                    stats['active_users'] = (await cursor.fetchone())[0]
-                
-                # 신규 사용자 (최근 7일)
-                async with db.execute('''
-                    SELECT COUNT(*) FROM users 
-                    WHERE created_at >= date('now', '-7 days')
-                ''') as cursor:
-                    stats['new_users_week'] = (await cursor.fetchone())[0]
-                
-                # 답변 통계
-                async with db.execute('SELECT COUNT(*) FROM answers') as cursor:
-                    stats['total_answers'] = (await cursor.fetchone())[0]
-                
-                # 평균 응답 시간 계산 (간단화)
-                stats['avg_response_time'] = "계산 중..."
-                stats['fastest_response'] = "계산 중..."
-                
-                # 인기 프로그래밍 언어
-                async with db.execute('''
-                    SELECT programming_language, COUNT(*) as count 
-                    FROM questions 
-                    GROUP BY programming_language 
-                    ORDER BY count DESC 
-                    LIMIT 5
-                ''') as cursor:
-                    stats['popular_languages'] = await cursor.fetchall()
-                
-                # 최근 활동 (7일)
-                async with db.execute('''
-                    SELECT COUNT(*) FROM questions 
-                    WHERE created_at >= date('now', '-7 days')
-                ''') as cursor:
-                    stats['recent_questions'] = (await cursor.fetchone())[0]
-                
-                async with db.execute('''
-                    SELECT COUNT(*) FROM answers 
-                    WHERE created_at >= date('now', '-7 days')
-                ''') as cursor:
-                    stats['recent_answers'] = (await cursor.fetchone())[0]
-                
-                async with db.execute('''
-                    SELECT COUNT(*) FROM questions 
-                    WHERE status = 'solved' AND updated_at >= date('now', '-7 days')
-                ''') as cursor:
-                    stats['recent_solved'] = (await cursor.fetchone())[0]
-                
-                # FAQ 통계
-                async with db.execute('SELECT COUNT(*) FROM faq') as cursor:
-                    stats['total_faq'] = (await cursor.fetchone())[0]
-                
-                # FAQ 검색 수는 별도 테이블이 없으므로 기본값
-                stats['faq_searches_week'] = 0
-                
-                return stats
-                
+            stats = await db_manager.get_overview_stats()
+            if not stats:
+                return {}
+            
+            # 해결률 계산
+            if stats['total_questions'] > 0:
+                stats['solve_rate'] = (stats['solved_questions'] / stats['total_questions']) * 100
+            else:
+                stats['solve_rate'] = 0
+            
+            stats['avg_response_time'] = self._format_minutes(stats['avg_response_time'])
+            stats['fastest_response'] = self._format_minutes(stats['fastest_response'])
+            return stats
+            
         except Exception as e:
             self.bot.logger.error(f"Error collecting basic statistics: {e}")
             return {}
     
     async def _get_detailed_statistics(self, db_manager, period: str) -> Dict:
         """상세 통계 데이터 수집"""
-        # 기간 설정
-        if period == 'week':
-            date_filter = "date('now', '-7 days')"
-            period_name = "최근 7일"
-        elif period == 'month':
-            date_filter = "date('now', '-30 days')"
-            period_name = "최근 30일"
-        elif period == 'quarter':
-            date_filter = "date('now', '-90 days')"
-            period_name = "최근 90일"
-        else:  # all
-            date_filter = "'1970-01-01'"
-            period_name = "전체 기간"
+        period_name = PERIOD_NAMES[period]
         
         try:
-            async with aiosqlite.connect(db_manager.db_path) as db:
-                stats = {'period_name': period_name}
-                
-                # 기간 내 총 질문 수
-                async with db.execute(f'''
-                    SELECT COUNT(*) FROM questions 
-                    WHERE created_at >= {date_filter}
-                ''') as cursor:
-                    stats['total_questions'] = (await cursor.fetchone())[0]
-                
-                # 기간 내 해결된 질문 수
-                async with db.execute(f'''
-                    SELECT COUNT(*) FROM questions 
-                    WHERE status = 'solved' AND created_at >= {date_filter}
-                ''') as cursor:
-                    solved = (await cursor.fetchone())[0]
-                
-                # 해결률
-                if stats['total_questions'] > 0:
-                    stats['solve_rate'] = (solved / stats['total_questions']) * 100
-                else:
-                    stats['solve_rate'] = 0
-                
-                # 평균 일일 질문 수
-                days = 7 if period == 'week' else 30 if period == 'month' else 90 if period == 'quarter' else 365
-                stats['avg_daily_questions'] = stats['total_questions'] / days
-                
-                # 간단한 트렌드 분석
-                if stats['total_questions'] > 0:
-                    if stats['solve_rate'] >= 80:
-                        trend = "🟢 높은 해결률을 유지하고 있습니다!"
-                    elif stats['solve_rate'] >= 60:
-                        trend = "🟡 양호한 해결률입니다."
-                    else:
-                        trend = "🔴 해결률 개선이 필요합니다."
-                    
-                    if stats['avg_daily_questions'] >= 5:
-                        trend += "\n📈 활발한 질문 활동을 보이고 있습니다."
-                    elif stats['avg_daily_questions'] >= 1:
-                        trend += "\n📊 적당한 질문 활동을 보이고 있습니다."
-                    else:
-                        trend += "\n📉 질문 활동이 저조합니다."
-                    
-                    stats['trends'] = trend
+            period_stats = await db_manager.get_period_stats(PERIOD_DAYS[period])
+            stats = {'period_name': period_name, 'total_questions': period_stats['total_questions']}
+            
+            # 해결률
+            if stats['total_questions'] > 0:
+                stats['solve_rate'] = (period_stats['solved_questions'] / stats['total_questions']) * 100
+            else:
+                stats['solve_rate'] = 0
+            
+            # 일별 롤업 기반 트렌드 (전체 기간은 실제 기록이 있는 날짜 수로 평균)
+            trend_stats = await db_manager.get_trend_stats(PERIOD_DAYS[period])
+            stats['avg_daily_questions'] = trend_stats['avg_daily_questions']
+            
+            if stats['total_questions'] > 0:
+                if stats['solve_rate'] >= 80:
+                    lines = ["🟢 높은 해결률을 유지하고 있습니다!"]
+                elif stats['solve_rate'] >= 60:
+                    lines = ["🟡 양호한 해결률입니다."]
                 else:
-                    stats['trends'] = "📭 분석할 데이터가 부족합니다."
-                
-                return stats
-                
+                    lines = ["🔴 해결률 개선이 필요합니다."]
+                lines.extend(self._format_trends(trend_stats))
+                stats['trends'] = "\n".join(lines)
+            else:
+                stats['trends'] = "📭 분석할 데이터가 부족합니다."
+            
+            return stats
+            
         except Exception as e:
             self.bot.logger.error(f"Error collecting detailed statistics: {e}")
             return {'period_name': period_name, 'total_questions': 0, 'solve_rate': 0, 'avg_daily_questions': 0, 'trends': '오류 발생'}
     
+    def _format_trends(self, trend_stats: Dict) -> List[str]:
+        """트렌드 분석 결과를 임베드용 문장으로 변환"""
+        lines = [f"📊 7일 이동평균: 하루 {trend_stats['moving_average']:.1f}건"]
+        
+        week = trend_stats['questions_week']
+        if week['change'] is not None:
+            arrow = "📈" if week['change'] >= 0 else "📉"
+            lines.append(f"{arrow} 최근 7일 {week['this_week']:.0f}건 (전주 대비 {week['change']:+.0f}%)")
+        elif week['last_week'] is not None:
+            lines.append(f"📈 최근 7일 {week['this_week']:.0f}건 (전주 0건)")
+        
+        solved_week = trend_stats['solved_week']
+        if solved_week['change'] is not None:
+            lines.append(f"✅ 최근 7일 해결 {solved_week['this_week']:.0f}건 (전주 대비 {solved_week['change']:+.0f}%)")
+        
+        forecast = trend_stats['forecast']
+        if forecast is not None:
+            lines.append(f"🔮 다음 7일 예상 질문: 약 {forecast['total']:.0f}건")
+        
+        # 가장 두드러진 이상치 3개만 표시
+        for day, count, z_score in trend_stats['anomalies'][:3]:
+            kind = "급증" if z_score > 0 else "급감"
+            lines.append(f"⚠️ {day}: {count}건 ({kind}, z={z_score:+.1f})")
+        return lines
+    
     async def _get_user_statistics(self, db_manager, user_id: int) -> Dict:
         """사용자별 통계 데이터 수집"""
         try:
-            async with aiosqlite.connect(db_manager.db_path) as db:
-                stats = {}
-                
-                # 총 질문 수
-                async with db.execute('SELECT COUNT(*) FROM questions WHERE user_id = ?', (user_id,)) as cursor:
-                    stats['total_questions'] = (await cursor.fetchone())[0]
-                
-                # 해결된 질문 수
-                async with db.execute("SELECT COUNT(*) FROM questions WHERE user_id = ? AND status = 'solved'", (user_id,)) as cursor:
-                    stats['solved_questions'] = (await cursor.fetchone())[0]
-                
-                # 진행 중인 질문 수
-                async with db.execute("SELECT COUNT(*) FROM questions WHERE user_id = ? AND status IN ('open', 'in_progress')", (user_id,)) as cursor:
-                    stats['active_questions'] = (await cursor.fetchone())[0]
-                
-                # 해결률
-                if stats['total_questions'] > 0:
-                    stats['solve_rate'] = (stats['solved_questions'] / stats['total_questions']) * 100
-                else:
-                    stats['solve_rate'] = 0
-                
-                # 자주 사용하는 언어
-                async with db.execute('''
-                    SELECT programming_language, COUNT(*) as count 
-                    FROM questions WHERE user_id = ? 
-                    GROUP BY programming_language 
-                    ORDER BY count DESC 
-                    LIMIT 3
-                ''', (user_id,)) as cursor:
-                    languages = await cursor.fetchall()
-                    stats['favorite_languages'] = [lang[0] for lang in languages]
-                
-                # 첫 질문과 최근 질문 날짜
-                async with db.execute('''
-                    SELECT MIN(created_at), MAX(created_at) 
-                    FROM questions WHERE user_id = ?
-                ''', (user_id,)) as cursor:
-                    dates = await cursor.fetchone()
-                    if dates[0]:
-                        stats['first_question_date'] = dates[0][:10]
-                        stats['last_question_date'] = dates[1][:10]
-                    else:
-                        stats['first_question_date'] = "없음"
-                        stats['last_question_date'] = "없음"
-                
-                # 평균 응답 시간 (간단화)
-                stats['avg_response_time'] = "계산 중..."
-                
-                return stats
-                
+            stats = await db_manager.get_user_stats(user_id)
+            if not stats:
+                return {}
+            
+            # 해결률
+            if stats['total_questions'] > 0:
+                stats['solve_rate'] = (stats['solved_questions'] / stats['total_questions']) * 100
+            else:
+                stats['solve_rate'] = 0
+            
+            # 첫 질문과 최근 질문 날짜
+            stats['first_question_date'] = str(stats['first_question_at'])[:10] if stats['first_question_at'] else "없음"
+            stats['last_question_date'] = str(stats['last_question_at'])[:10] if stats['last_question_at'] else "없음"
+            stats['avg_response_time'] = self._format_minutes(stats['avg_response_time'])
+            
+            return stats
+            
         except Exception as e:
             self.bot.logger.error(f"Error collecting user statistics: {e}")
             return {}
     
+    async def _get_dashboard_data(self, db_manager) -> Dict:
+        """대시보드 데이터 수집 (롤업 테이블 기반)"""
+        stats = await db_manager.get_dashboard_stats()
+        if not stats:
+            raise RuntimeError("Dashboard statistics are unavailable")
+        
+        week_questions = stats['week_questions']
+        stats['week_solve_rate'] = (stats['week_solved'] / week_questions * 100) if week_questions else 0
+        stats['avg_daily'] = week_questions / 7
+        stats['total_solve_rate'] = (
+            stats['solved_questions'] / stats['total_questions'] * 100 if stats['total_questions'] else 0
+        )
+        stats['pending_questions'] = stats['open_questions']
+        stats['active_questions'] = stats['in_progress_questions']
+        stats['avg_response_time'] = self._format_minutes(stats['avg_response_time'])
+        stats['week_efficiency'] = (
+            f"질문당 답변 {stats['week_answers'] / week_questions:.1f}개" if week_questions else "데이터 없음"
+        )
+        stats['satisfaction'] = "데이터 없음"
+        
+        # 응답시간 분위수 (일별 스케치 병합, response_times 스캔 없음)
+        percentiles = await db_manager.get_response_time_percentiles(7)
+        if percentiles.get('count'):
+            stats['response_percentiles'] = " / ".join(
+                self._format_minutes(percentiles[key]) for key in ('p50', 'p90', 'p99')
+            )
+        else:
+            stats['response_percentiles'] = "데이터 없음"
+        stats['median_response_minutes'] = percentiles.get('p50') or 0
+        return stats
+    
     @app_commands.command(name="대시보드", description="실시간 대시보드를 표시합니다 (관리자 전용)")
     async def dashboard(self, interaction: discord.Interaction):
         """실시간 대시보드 표시"""
@@ -549,7 +489,8 @@ class StatisticsSystem(commands.Cog):
                     f"질문 수: **{dashboard_data['week_questions']}**\n"
                     f"해결률: **{dashboard_data['week_solve_rate']:.1f}%**\n"
                     f"평균 일일 질문: **{dashboard_data['avg_daily']:.1f}**\n"
-                    f"평균 응답시간: **{dashboard_data['avg_response_time']}**"
+                    f"평균 응답시간: **{dashboard_data['avg_response_time']}**\n"
+                    f"응답시간 p50/p90/p99: **{dashboard_data['response_percentiles']}**"
                 ),
                 inline=True
             )
@@ -595,8 +536,8 @@ class StatisticsSystem(commands.Cog):
                 alerts.append("🔴 대기중인 질문이 많습니다!")
             if dashboard_data['week_solve_rate'] < 70:
                 alerts.append("🟡 이번주 해결률이 낮습니다.")
-            if dashboard_data['avg_response_time_minutes'] > 1440:  # 24시간 이상
-                alerts.append("🟠 평균 응답시간이 깁니다.")
+            if dashboard_data['median_response_minutes'] > 1440:  # 중앙값 24시간 이상
+                alerts.append("🟠 응답시간이 깁니다.")
             
             if alerts:
                 embed.add_field(
@@ -621,36 +562,51 @@ class StatisticsSystem(commands.Cog):
                 "❌ 대시보드 생성 중 오류가 발생했습니다.",
                 ephemeral=True
             )
-        """차트 생성"""
+    
+    async def _generate_chart(self, db_manager, period: str, chart_type: str) -> Optional[io.BytesIO]:
+        """차트 생성 (프로세스 풀에서 렌더링, 같은 데이터의 차트는 캐시된 PNG 재사용)"""
         try:
-            # 차트 생성은 복잡하므로 기본 구조만 구현
-            # 실제 환경에서는 matplotlib 설치 필요
-            
-            plt.figure(figsize=(10, 6))
-            
-            if chart_type == "daily":
-                # 일별 질문 수 차트
-                plt.title("일별 질문 수")
-                plt.xlabel("날짜")
-                plt.ylabel("질문 수")
-                # 실제 데이터 조회 및 그래프 생성 코드 필요
-                
-            elif chart_type == "language":
-                # 언어별 질문 수 파이 차트
-                plt.title("프로그래밍 언어별 질문 분포")
-                # 실제 데이터 조회 및 파이차트 생성 코드 필요
-            
-            # 차트를 바이트 버퍼로 저장
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-            buffer.seek(0)
-            plt.close()
-            
-            return buffer
+            title, data = await self._get_chart_data(db_manager, period, chart_type)
+            png = await self.charts.render(chart_type, period, title, data)
+            return io.BytesIO(png)
             
         except Exception as e:
             self.bot.logger.error(f"Error generating chart: {e}")
             return None
+    
+    async def _get_chart_data(self, db_manager, period: str, chart_type: str) -> Tuple[str, List[tuple]]:
+        """차트 제목과 데이터 행 수집"""
+        period_name = PERIOD_NAMES[period]
+        
+        if chart_type == "status":
+            # 현재 질문 상태 분포 (기간 무관)
+            overview = await db_manager.get_overview_stats()
+            counts = [
+                ("대기중", overview.get('open_questions', 0)),
+                ("진행중", overview.get('in_progress_questions', 0)),
+                ("해결됨", overview.get('solved_questions', 0)),
+            ]
+            counts.append(("기타", overview.get('total_questions', 0) - sum(count for _, count in counts)))
+            return "질문 상태 분포", [(label, count) for label, count in counts if count > 0]
+        
+        period_stats = await db_manager.get_period_stats(PERIOD_DAYS[period])
+        
+        if chart_type == "language":
+            return f"프로그래밍 언어별 질문 분포 ({period_name})", list(period_stats.get('top_languages', []))
+        
+        daily = [tuple(row) for row in period_stats.get('daily_questions', [])]
+        if chart_type == "daily":
+            return f"일별 질문 수 ({period_name})", daily
+        
+        # 주별 합계 (월요일 시작)
+        weeks: Dict[str, List[int]] = {}
+        for day, questions, solved in daily:
+            day = date.fromisoformat(str(day)[:10])
+            week = (day - timedelta(days=day.weekday())).isoformat()
+            totals = weeks.setdefault(week, [0, 0])
+            totals[0] += questions
+            totals[1] += solved or 0
+        return f"주별 질문 수 ({period_name})", [(week, *totals) for week, totals in sorted(weeks.items())]
 
 async def setup(bot):
     await bot.add_cog(StatisticsSystem(bot))
\ No newline at end of file
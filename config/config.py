@@ -18,10 +18,48 @@ class Config:
     # Database Configuration
     DATABASE_TYPE = os.getenv('DATABASE_TYPE', 'sqlite')  # 'sqlite' or 'supabase'
     DATABASE_PATH = os.getenv('DATABASE_PATH', 'database/bot.db')  # SQLite용
+    DATABASE_POOL_SIZE = int(os.getenv('DATABASE_POOL_SIZE', 4))  # SQLite 읽기 연결 수
+    DATABASE_POOL_TIMEOUT = float(os.getenv('DATABASE_POOL_TIMEOUT', 10))  # 연결 대기 제한 (초)
+    DATABASE_WRITE_BATCH_SIZE = int(os.getenv('DATABASE_WRITE_BATCH_SIZE', 64))  # 그룹 커밋당 최대 쓰기 수
+    DATABASE_WRITE_MAX_LATENCY_MS = float(os.getenv('DATABASE_WRITE_MAX_LATENCY_MS', 5))  # 그룹 커밋 최대 대기 (ms)
+    DATABASE_COALESCE_READS = os.getenv('DATABASE_COALESCE_READS', 'true').lower() == 'true'  # 동시에 들어온 같은 조회를 한 번만 실행
+    DATABASE_CACHE_ENABLED = os.getenv('DATABASE_CACHE_ENABLED', 'true').lower() == 'true'  # 자주 쓰는 조회 결과 캐시
+    DATABASE_CACHE_MAX_ENTRIES = int(os.getenv('DATABASE_CACHE_MAX_ENTRIES', 1024))  # 캐시 최대 항목 수 (LRU)
+    DATABASE_CACHE_TTL = float(os.getenv('DATABASE_CACHE_TTL', 60))  # 캐시 항목 유지 시간 (초)
+    
+    # SQLite Performance Profile (모든 연결에 적용)
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))  # bytes
+    SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', -16000))  # 음수 = KiB 단위
+    SQLITE_TEMP_STORE = os.getenv('SQLITE_TEMP_STORE', 'MEMORY')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_CHECKPOINT_INTERVAL = float(os.getenv('SQLITE_CHECKPOINT_INTERVAL', 300))  # WAL 체크포인트 주기 (초)
+    SQLITE_OPTIMIZE_INTERVAL = float(os.getenv('SQLITE_OPTIMIZE_INTERVAL', 3600))  # PRAGMA optimize 주기 (초)
+    
+    @classmethod
+    def sqlite_pragmas(cls):
+        """SQLite PRAGMA profile, in the order it is applied"""
+        return [
+            ('busy_timeout', cls.SQLITE_BUSY_TIMEOUT_MS),
+            ('journal_mode', cls.SQLITE_JOURNAL_MODE),
+            ('synchronous', cls.SQLITE_SYNCHRONOUS),
+            ('mmap_size', cls.SQLITE_MMAP_SIZE),
+            ('cache_size', cls.SQLITE_CACHE_SIZE),
+            ('temp_store', cls.SQLITE_TEMP_STORE),
+        ]
+    
+    # Statistics Configuration
+    STATS_FLUSH_INTERVAL = float(os.getenv('STATS_FLUSH_INTERVAL', 5))  # daily_stats 카운터 반영 주기 (초)
+    CHART_RENDER_WORKERS = int(os.getenv('CHART_RENDER_WORKERS', 1))  # 차트 렌더링 프로세스 수
+    CHART_CACHE_MAX_ENTRIES = int(os.getenv('CHART_CACHE_MAX_ENTRIES', 32))  # 렌더링된 차트 PNG 캐시 수
     
     # Supabase Configuration
     SUPABASE_URL = os.getenv('SUPABASE_URL')  # Supabase Project URL
     SUPABASE_ANON_KEY = os.getenv('SUPABASE_ANON_KEY')  # Supabase Anon Key
+    SUPABASE_TIMEOUT = float(os.getenv('SUPABASE_TIMEOUT', 10))  # PostgREST 요청 제한 시간 (초)
+    SUPABASE_MAX_CONNECTIONS = int(os.getenv('SUPABASE_MAX_CONNECTIONS', 20))  # keep-alive HTTP 연결 수
+    SUPABASE_EXECUTOR_WORKERS = int(os.getenv('SUPABASE_EXECUTOR_WORKERS', 8))  # 동기 클라이언트 사용 시 스레드 수
     
     # Logging Configuration
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
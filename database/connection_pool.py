@@ -0,0 +1,180 @@
+import asyncio
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
+
+import aiosqlite
+from utils.logger import setup_logger
+
+# PRAGMA values are interpolated into SQL, so only allow plain words/numbers
+PRAGMA_VALUE_PATTERN = re.compile(r'^-?\w+$')
+
+class ConnectionPool:
+    """Persistent aiosqlite connection pool (N readers + 1 dedicated writer)"""
+    
+    def __init__(self, db_path: str, size: int = 4, checkout_timeout: float = 10.0,
+                 pragmas: List[Tuple[str, object]] = None):
+        self.db_path = db_path
+        self.size = max(1, size)
+        self.checkout_timeout = checkout_timeout
+        # Applied in order on every new connection
+        self.pragmas = list(pragmas or [])
+        for name, value in self.pragmas:
+            if not PRAGMA_VALUE_PATTERN.match(str(value)):
+                raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+        self.logger = setup_logger()
+        
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._writer_lock = asyncio.Lock()
+        self._closed = True
+        
+        # Checkout metrics
+        self._metrics = {
+            'reader_checkouts': 0,
+            'reader_wait_total': 0.0,
+            'reader_wait_max': 0.0,
+            'reader_timeouts': 0,
+            'writer_checkouts': 0,
+            'writer_wait_total': 0.0,
+            'writer_wait_max': 0.0,
+            'writer_timeouts': 0,
+        }
+    
+    async def open(self):
+        """Open all reader connections and the writer connection"""
+        if not self._closed:
+            return
+        
+        self._idle = asyncio.Queue()
+        try:
+            for _ in range(self.size):
+                conn = await self._connect()
+                self._readers.append(conn)
+                self._idle.put_nowait(conn)
+            # The writer manages its own transactions (BEGIN/COMMIT)
+            self._writer = await self._connect(isolation_level=None)
+        except Exception:
+            await self._close_connections()
+            raise
+        
+        self._closed = False
+        self.logger.info(f"Database connection pool opened ({self.size} readers + 1 writer)")
+    
+    async def _connect(self, **kwargs) -> aiosqlite.Connection:
+        """Open a single connection and apply the performance profile"""
+        conn = await aiosqlite.connect(self.db_path, **kwargs)
+        try:
+            for name, value in self.pragmas:
+                await conn.execute(f'PRAGMA {name} = {value}')
+        except Exception:
+            await conn.close()
+            raise
+        return conn
+    
+    async def get_effective_pragmas(self) -> Dict[str, object]:
+        """Read back the PRAGMA values actually in effect on the writer"""
+        effective = {}
+        async with self.writer() as db:
+            for name, _ in self.pragmas:
+                async with db.execute(f'PRAGMA {name}') as cursor:
+                    row = await cursor.fetchone()
+                    effective[name] = row[0] if row else None
+        return effective
+    
+    async def close(self):
+        """Close every pooled connection"""
+        if self._closed:
+            return
+        
+        self._closed = True
+        # Wait for in-flight writes to finish before tearing down
+        async with self._writer_lock:
+            await self._close_connections()
+        self.logger.info("Database connection pool closed")
+    
+    async def _close_connections(self):
+        """Close connections, logging (not raising) individual failures"""
+        connections = list(self._readers)
+        if self._writer is not None:
+            connections.append(self._writer)
+        
+        for conn in connections:
+            try:
+                await conn.close()
+            except Exception as e:
+                self.logger.error(f"Error closing pooled connection: {e}")
+        
+        self._readers = []
+        self._writer = None
+        self._idle = None
+    
+    @asynccontextmanager
+    async def reader(self):
+        """Check out a read connection"""
+        if self._closed:
+            raise RuntimeError("Connection pool is not open")
+        
+        started = time.perf_counter()
+        try:
+            conn = await asyncio.wait_for(self._idle.get(), timeout=self.checkout_timeout)
+        except asyncio.TimeoutError:
+            self._metrics['reader_timeouts'] += 1
+            raise TimeoutError(f"Timed out waiting {self.checkout_timeout}s for a read connection")
+        self._record_wait('reader', time.perf_counter() - started)
+        
+        try:
+            yield conn
+        finally:
+            self._idle.put_nowait(conn)
+    
+    @asynccontextmanager
+    async def writer(self):
+        """Check out the dedicated write connection"""
+        if self._closed:
+            raise RuntimeError("Connection pool is not open")
+        
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._writer_lock.acquire(), timeout=self.checkout_timeout)
+        except asyncio.TimeoutError:
+            self._metrics['writer_timeouts'] += 1
+            raise TimeoutError(f"Timed out waiting {self.checkout_timeout}s for the write connection")
+        self._record_wait('writer', time.perf_counter() - started)
+        
+        try:
+            yield self._writer
+        except Exception:
+            # Never hand a half-finished transaction to the next writer
+            try:
+                await self._writer.rollback()
+            except Exception as e:
+                self.logger.error(f"Error rolling back write connection: {e}")
+            raise
+        finally:
+            self._writer_lock.release()
+    
+    def _record_wait(self, kind: str, waited: float):
+        """Record checkout wait time"""
+        self._metrics[f'{kind}_checkouts'] += 1
+        self._metrics[f'{kind}_wait_total'] += waited
+        if waited > self._metrics[f'{kind}_wait_max']:
+            self._metrics[f'{kind}_wait_max'] = waited
+    
+    def get_metrics(self) -> Dict:
+        """Get pool size and checkout timing metrics"""
+        metrics = dict(self._metrics)
+        metrics['size'] = self.size
+        metrics['readers_idle'] = self._idle.qsize() if self._idle else 0
+        metrics['readers_in_use'] = len(self._readers) - metrics['readers_idle']
+        metrics['writer_in_use'] = self._writer_lock.locked()
+        
+        for kind in ('reader', 'writer'):
+            checkouts = metrics[f'{kind}_checkouts']
+            metrics[f'{kind}_wait_avg_ms'] = (metrics[f'{kind}_wait_total'] / checkouts * 1000) if checkouts else 0.0
+            metrics[f'{kind}_wait_max_ms'] = metrics.pop(f'{kind}_wait_max') * 1000
+            metrics.pop(f'{kind}_wait_total')
+        
+        return metrics
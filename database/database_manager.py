@@ -1,8 +1,28 @@
-import aiosqlite
+import asyncio
 import os
+import time
 from datetime import datetime
 from typing import Optional, Dict, List
 from utils.logger import setup_logger
+from database.connection_pool import ConnectionPool
+from database.write_actor import WriteActor, WriteResult
+from database.stats_aggregator import DailyStatsAggregator, ResponseTimeSketches, DAILY_STAT_COLUMNS
+from database.schema_migrations import apply_sqlite_migrations
+from database.records import UserRecord, QuestionRecord, FaqRecord, row_factory, FULL, SUMMARY
+from database.thread_index import ThreadIndex, QuestionThread
+from database.statistics import (
+    ACTIVE_STATUSES, ROLLUP_COLUMNS, USER_STATS_COLUMNS, admin_response_summaries, dashboard_totals,
+    overview_totals, period_start, response_time_summary, user_stats_summary
+)
+from database.quantiles import TDigest
+from database.response_tracker import ResponseTracker, ResponseEvent, FIRST_RESPONSE, format_utc
+from database.trends import TREND_HISTORY_DAYS, compute_trends
+from database.rollups import (
+    SQLITE_BACKFILLS, rebuild_sqlite_rollups, rebuild_sqlite_sketches, rebuild_sqlite_user_stats
+)
+from database.text_search import (
+    search_terms, fts5_match_query, like_score, FAQ_SEARCH_COLUMNS, QUESTION_SEARCH_COLUMNS
+)
 
 class DatabaseManager:
     """Database manager for InventOnBot"""
@@ -11,338 +31,351 @@ class DatabaseManager:
         from config.config import Config
         self.db_path = db_path or Config.DATABASE_PATH
         self.logger = setup_logger()
+        self.pool = ConnectionPool(
+            self.db_path,
+            size=Config.DATABASE_POOL_SIZE,
+            checkout_timeout=Config.DATABASE_POOL_TIMEOUT,
+            pragmas=Config.sqlite_pragmas()
+        )
+        self.checkpoint_interval = Config.SQLITE_CHECKPOINT_INTERVAL
+        self.optimize_interval = Config.SQLITE_OPTIMIZE_INTERVAL
+        self._maintenance_task = None
+        self.faq_fts_enabled = False
+        self.thread_index = ThreadIndex()
+        self.write_actor = WriteActor(
+            self.pool,
+            max_batch=Config.DATABASE_WRITE_BATCH_SIZE,
+            max_latency=Config.DATABASE_WRITE_MAX_LATENCY_MS / 1000
+        )
+        self.stats_aggregator = DailyStatsAggregator(
+            self._apply_daily_stats_deltas,
+            flush_interval=Config.STATS_FLUSH_INTERVAL
+        )
+        self.response_time_sketches = ResponseTimeSketches(
+            self._merge_response_time_sketches,
+            flush_interval=Config.STATS_FLUSH_INTERVAL
+        )
+        self.response_tracker = ResponseTracker(
+            self._write_response_events,
+            flush_interval=Config.STATS_FLUSH_INTERVAL
+        )
         
     async def initialize(self):
-        """Initialize database and create tables"""
+        """Initialize database and apply schema migrations"""
         try:
             # Ensure database directory exists
             db_dir = os.path.dirname(self.db_path)
             if db_dir and not os.path.exists(db_dir):
                 os.makedirs(db_dir)
             
-            # Create tables
-            await self._create_tables()
+            # Open pooled connections
+            await self.pool.open()
+            effective = await self.pool.get_effective_pragmas()
+            self.logger.info(
+                "SQLite profile: " + ", ".join(f"{name}={value}" for name, value in effective.items())
+            )
+            
+            # Create tables / apply pending migrations
+            await self._apply_migrations()
+            
+            # Load question thread IDs so non-question threads never hit the DB
+            await self._load_thread_index()
+            await self._load_response_tracker()
+            
+            # All mutations go through the single writer from here on
+            await self.write_actor.start()
+            await self.stats_aggregator.start()
+            await self.response_time_sketches.start()
+            await self.response_tracker.start()
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop(), name='sqlite-maintenance')
             self.logger.info("Database initialized successfully")
             
         except Exception as e:
             self.logger.error(f"Database initialization failed: {e}")
             raise
     
-    async def _create_tables(self):
-        """Create database tables"""
-        async with aiosqlite.connect(self.db_path) as db:
-            # Users table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    user_id INTEGER PRIMARY KEY,
-                    username TEXT NOT NULL,
-                    display_name TEXT,
-                    is_admin BOOLEAN DEFAULT FALSE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Questions table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS questions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    thread_id INTEGER UNIQUE,
-                    title TEXT NOT NULL,
-                    os TEXT NOT NULL,
-                    programming_language TEXT NOT NULL,
-                    error_message TEXT NOT NULL,
-                    purpose TEXT NOT NULL,
-                    code_snippet TEXT,
-                    log_files TEXT,
-                    screenshot_url TEXT,
-                    attempted_solutions TEXT,
-                    status TEXT DEFAULT 'open',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (user_id)
-                )
-            ''')
-            
-            # Answers table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS answers (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    question_id INTEGER NOT NULL,
-                    admin_id INTEGER NOT NULL,
-                    answer_text TEXT NOT NULL,
-                    is_solution BOOLEAN DEFAULT FALSE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (question_id) REFERENCES questions (id),
-                    FOREIGN KEY (admin_id) REFERENCES users (user_id)
-                )
-            ''')
-            
-            # FAQ table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS faq (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    question TEXT NOT NULL,
-                    answer TEXT NOT NULL,
-                    keywords TEXT,
-                    created_by INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (created_by) REFERENCES users (user_id)
-                )
-            ''')
-            
-            # Statistics tracking table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS daily_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date DATE UNIQUE,
-                    questions_created INTEGER DEFAULT 0,
-                    questions_solved INTEGER DEFAULT 0,
-                    answers_given INTEGER DEFAULT 0,
-                    new_users INTEGER DEFAULT 0,
-                    faq_searches INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Response time tracking
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS response_times (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    question_id INTEGER,
-                    response_time_minutes INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (question_id) REFERENCES questions (id)
-                )
-            ''')
-            
-            await db.commit()
-    
-    async def add_user(self, user_id: int, username: str, display_name: str = None, is_admin: bool = False):
-        """Add or update user"""
-        async with aiosqlite.connect(self.db_path) as db:
-            # Check if user already exists
-            async with db.execute('SELECT user_id FROM users WHERE user_id = ?', (user_id,)) as cursor:
-                existing_user = await cursor.fetchone()
-            
-            await db.execute('''
-                INSERT OR REPLACE INTO users (user_id, username, display_name, is_admin)
-                VALUES (?, ?, ?, ?)
-            ''', (user_id, username, display_name, is_admin))
-            await db.commit()
-            
-            # If this is a new user, update daily stats
-            if not existing_user:
-                await self.update_daily_stats('new_users')
+    async def _apply_migrations(self):
+        """Bring the schema up to date with the versioned migrations"""
+        async with self.pool.writer() as db:
+            # Backfills fill new tables with existing history inside their migration's transaction
+            applied = await apply_sqlite_migrations(db, self.logger, SQLITE_BACKFILLS)
+            async with db.execute("SELECT 1 FROM sqlite_master WHERE name = 'faq_fts'") as cursor:
+                self.faq_fts_enabled = await cursor.fetchone() is not None
+        if applied:
+            self.logger.info(f"Applied schema migrations: {', '.join(str(v) for v in applied)}")
+        if not self.faq_fts_enabled:
+            self.logger.warning("FTS5 is not available, FAQ search falls back to LIKE scans")
     
-    async def get_user(self, user_id: int) -> Optional[Dict]:
-        """Get user by ID"""
-        async with aiosqlite.connect(self.db_path) as db:
+    async def _load_thread_index(self):
+        """Bulk load the question thread index"""
+        async with self.pool.reader() as db:
             async with db.execute(
-                'SELECT * FROM users WHERE user_id = ?', (user_id,)
+                'SELECT thread_id, id, user_id FROM questions WHERE thread_id IS NOT NULL'
             ) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    return {
-                        'user_id': row[0],
-                        'username': row[1],
-                        'display_name': row[2],
-                        'is_admin': bool(row[3]),
-                        'created_at': row[4]
-                    }
-                return None
+                self.thread_index.load(await cursor.fetchall())
+        self.logger.info(f"Loaded {len(self.thread_index)} question threads into the thread index")
+    
+    async def _load_response_tracker(self):
+        """Load the open questions still waiting for a first response or a solution"""
+        async with self.pool.reader() as db:
+            async with db.execute(f'''
+                SELECT id, created_at, first_response_at IS NULL, solved_at IS NULL
+                FROM questions
+                WHERE status IN ({', '.join('?' * len(ACTIVE_STATUSES))})
+                  AND (first_response_at IS NULL OR solved_at IS NULL)
+            ''', ACTIVE_STATUSES) as cursor:
+                self.response_tracker.load(await cursor.fetchall())
+    
+    async def _maintenance_loop(self):
+        """Periodically checkpoint the WAL and refresh planner statistics"""
+        last_optimize = time.monotonic()
+        while True:
+            await asyncio.sleep(self.checkpoint_interval)
+            try:
+                async with self.pool.writer() as db:
+                    await db.execute('PRAGMA wal_checkpoint(PASSIVE)')
+                    if time.monotonic() - last_optimize >= self.optimize_interval:
+                        await db.execute('PRAGMA optimize')
+                        last_optimize = time.monotonic()
+            except Exception as e:
+                self.logger.error(f"SQLite maintenance failed: {e}")
+    
+    async def _fetch_one(self, record_cls, query: str, params: tuple = ()):
+        """Run a read query on a pooled reader and return one record (or None)"""
+        async with self.pool.reader() as db:
+            async with db.execute(query, params) as cursor:
+                cursor.row_factory = row_factory(record_cls)
+                return await cursor.fetchone()
+    
+    async def _fetch_all(self, record_cls, query: str, params: tuple = ()) -> List:
+        """Run a read query on a pooled reader and return all rows as records"""
+        async with self.pool.reader() as db:
+            async with db.execute(query, params) as cursor:
+                cursor.row_factory = row_factory(record_cls)
+                return await cursor.fetchall()
+    
+    async def _execute_write(self, query: str, params: tuple = ()) -> WriteResult:
+        """Queue a mutation on the write actor and wait for its group commit"""
+        return await self.write_actor.submit(query, params)
+    
+    async def _execute_atomic(self, statements: List[tuple]) -> List[WriteResult]:
+        """Queue (query, params) mutations that commit together or not at all"""
+        return await self.write_actor.submit_atomic(statements)
+    
+    async def add_user(self, user_id: int, username: str, display_name: str = None, is_admin: bool = False) -> bool:
+        """Add or update user, returns True when the user is new"""
+        # An ignored insert means the user already exists
+        inserted = await self._execute_write('''
+            INSERT OR IGNORE INTO users (user_id, username, display_name, is_admin)
+            VALUES (?, ?, ?, ?)
+        ''', (user_id, username, display_name, is_admin))
+        
+        if inserted.rowcount:
+            # New user, update daily stats
+            await self.update_daily_stats('new_users')
+        else:
+            await self._execute_write('''
+                UPDATE users SET username = ?, display_name = ?, is_admin = ?
+                WHERE user_id = ?
+            ''', (username, display_name, is_admin, user_id))
+        return bool(inserted.rowcount)
+    
+    async def get_user(self, user_id: int) -> Optional[UserRecord]:
+        """Get user by ID"""
+        return await self._fetch_one(
+            UserRecord, 'SELECT * FROM users WHERE user_id = ?', (user_id,)
+        )
     
     async def create_question(self, user_id: int, thread_id: int, title: str, 
                             os: str, programming_language: str, error_message: str, 
                             purpose: str, code_snippet: str = None, log_files: str = None,
                             screenshot_url: str = None, attempted_solutions: str = None) -> int:
         """Create a new question"""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute('''
-                INSERT INTO questions (user_id, thread_id, title, os, programming_language, 
-                                     error_message, purpose, code_snippet, log_files, 
-                                     screenshot_url, attempted_solutions)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (user_id, thread_id, title, os, programming_language, error_message, 
-                  purpose, code_snippet, log_files, screenshot_url, attempted_solutions))
-            await db.commit()
-            return cursor.lastrowid
-    
-    async def get_question(self, question_id: int) -> Optional[Dict]:
-        """Get question by ID"""
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                'SELECT * FROM questions WHERE id = ?', (question_id,)
-            ) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    return {
-                        'id': row[0],
-                        'user_id': row[1],
-                        'thread_id': row[2],
-                        'title': row[3],
-                        'os': row[4],
-                        'programming_language': row[5],
-                        'error_message': row[6],
-                        'purpose': row[7],
-                        'code_snippet': row[8],
-                        'log_files': row[9],
-                        'screenshot_url': row[10],
-                        'attempted_solutions': row[11],
-                        'status': row[12],
-                        'created_at': row[13],
-                        'updated_at': row[14]
-                    }
-                return None
-    
-    async def get_question_by_thread(self, thread_id: int) -> Optional[Dict]:
+        result = await self._execute_write('''
+            INSERT INTO questions (user_id, thread_id, title, os, programming_language, 
+                                 error_message, purpose, code_snippet, log_files, 
+                                 screenshot_url, attempted_solutions)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (user_id, thread_id, title, os, programming_language, error_message, 
+              purpose, code_snippet, log_files, screenshot_url, attempted_solutions))
+        self.thread_index.add(thread_id, result.lastrowid, user_id)
+        self.response_tracker.track(result.lastrowid)
+        return result.lastrowid
+    
+    async def get_question(self, question_id: int, shape: str = FULL) -> Optional[QuestionRecord]:
+        """Get question by ID ('summary' shape skips the long text columns)"""
+        columns = ', '.join(QuestionRecord.columns(shape))
+        return await self._fetch_one(
+            QuestionRecord, f'SELECT {columns} FROM questions WHERE id = ?', (question_id,)
+        )
+    
+    async def get_question_by_thread(self, thread_id: int) -> Optional[QuestionRecord]:
         """Get question by thread ID"""
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                'SELECT * FROM questions WHERE thread_id = ?', (thread_id,)
-            ) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    return {
-                        'id': row[0],
-                        'user_id': row[1],
-                        'thread_id': row[2],
-                        'title': row[3],
-                        'os': row[4],
-                        'programming_language': row[5],
-                        'error_message': row[6],
-                        'purpose': row[7],
-                        'code_snippet': row[8],
-                        'log_files': row[9],
-                        'screenshot_url': row[10],
-                        'attempted_solutions': row[11],
-                        'status': row[12],
-                        'created_at': row[13],
-                        'updated_at': row[14]
-                    }
-                return None
+        if self.thread_index.loaded and self.thread_index.lookup(thread_id) is None:
+            return None  # Not a question thread
+        return await self._fetch_one(
+            QuestionRecord, 'SELECT * FROM questions WHERE thread_id = ?', (thread_id,)
+        )
     
     async def update_question_status(self, question_id: int, status: str):
         """Update question status"""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute('''
-                UPDATE questions 
-                SET status = ?, updated_at = CURRENT_TIMESTAMP 
-                WHERE id = ?
-            ''', (status, question_id))
-            await db.commit()
+        await self._execute_write('''
+            UPDATE questions 
+            SET status = ?, updated_at = CURRENT_TIMESTAMP 
+            WHERE id = ?
+        ''', (status, question_id))
+        if status == 'solved':
+            self.response_tracker.solved(question_id)
     
     async def add_answer(self, question_id: int, admin_id: int, answer_text: str, is_solution: bool = False) -> int:
         """Add an answer to a question"""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute('''
-                INSERT INTO answers (question_id, admin_id, answer_text, is_solution)
-                VALUES (?, ?, ?, ?)
-            ''', (question_id, admin_id, answer_text, is_solution))
-            await db.commit()
-            return cursor.lastrowid
-    
-    async def get_user_questions(self, user_id: int) -> List[Dict]:
-        """Get all questions for a user"""
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                'SELECT * FROM questions WHERE user_id = ? ORDER BY created_at DESC', 
-                (user_id,)
-            ) as cursor:
-                rows = await cursor.fetchall()
-                return [{
-                    'id': row[0],
-                    'user_id': row[1],
-                    'thread_id': row[2],
-                    'title': row[3],
-                    'os': row[4],
-                    'programming_language': row[5],
-                    'error_message': row[6],
-                    'purpose': row[7],
-                    'code_snippet': row[8],
-                    'log_files': row[9],
-                    'screenshot_url': row[10],
-                    'attempted_solutions': row[11],
-                    'status': row[12],
-                    'created_at': row[13],
-                    'updated_at': row[14]
-                } for row in rows]
+        result = await self._execute_write('''
+            INSERT INTO answers (question_id, admin_id, answer_text, is_solution)
+            VALUES (?, ?, ?, ?)
+        ''', (question_id, admin_id, answer_text, is_solution))
+        self.response_tracker.first_response(question_id, admin_id)
+        return result.lastrowid
+    
+    async def get_user_questions(self, user_id: int, limit: int = None, shape: str = FULL) -> List[QuestionRecord]:
+        """Get a user's questions, newest first (all of them unless limit is given)"""
+        columns = ', '.join(QuestionRecord.columns(shape))
+        return await self._fetch_all(
+            QuestionRecord,
+            f'SELECT {columns} FROM questions WHERE user_id = ? ORDER BY created_at DESC LIMIT ?',
+            (user_id, -1 if limit is None else limit)
+        )
+    
+    async def count_user_questions(self, user_id: int) -> int:
+        """Count a user's questions"""
+        async with self.pool.reader() as db:
+            async with db.execute('SELECT COUNT(*) FROM questions WHERE user_id = ?', (user_id,)) as cursor:
+                return (await cursor.fetchone())[0]
+    
+    async def search_questions(self, query: str, search_type: str = 'all', limit: int = 20) -> List[QuestionRecord]:
+        """Search questions for any word of a query, most matching words first (summary shape)"""
+        terms = search_terms(query)
+        if not terms:
+            return []
+        
+        score, params = like_score(QUESTION_SEARCH_COLUMNS[search_type], terms)
+        columns = ', '.join(QuestionRecord.columns(SUMMARY))
+        return await self._fetch_all(QuestionRecord, f'''
+            SELECT {columns} FROM (SELECT questions.*, {score} AS score FROM questions)
+            WHERE score > 0
+            ORDER BY score DESC, created_at DESC
+            LIMIT ?
+        ''', (*params, limit))
     
     async def close(self):
         """Close database connection"""
-        # For aiosqlite, connections are automatically managed
-        pass
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
+        self.faq_fts_enabled = False
+        self.thread_index = ThreadIndex()
+        
+        # Flush buffered counters and let queued writes commit before the connections go away
+        await self.stats_aggregator.stop()
+        await self.response_tracker.stop()
+        await self.response_time_sketches.stop()
+        await self.write_actor.stop()
+        
+        try:
+            async with self.pool.writer() as db:
+                await db.execute('PRAGMA optimize')
+        except Exception as e:
+            self.logger.error(f"PRAGMA optimize on close failed: {e}")
+        await self.pool.close()
+    
+    async def lookup_question_thread(self, thread_id: int) -> Optional[QuestionThread]:
+        """Get the question id / author of a thread, from the thread index when loaded"""
+        if self.thread_index.loaded:
+            return self.thread_index.lookup(thread_id)
+        question = await self.get_question_by_thread(thread_id)
+        return QuestionThread(question['id'], question['user_id']) if question else None
+    
+    def awaiting_first_response(self, thread_id: int) -> Optional[QuestionThread]:
+        """Question of a thread still waiting for its first response, else None (no I/O)"""
+        if not self.thread_index.loaded or thread_id not in self.thread_index:
+            return None
+        question = self.thread_index.lookup(thread_id)
+        return question if self.response_tracker.is_awaiting_response(question.question_id) else None
+    
+    def record_first_response(self, question_id: int, admin_id: int, at: datetime = None) -> bool:
+        """Note an admin's first response to a question (written behind, once per question)"""
+        return self.response_tracker.first_response(question_id, admin_id, at)
+    
+    def get_response_tracker_metrics(self) -> Dict:
+        """Get first-response / solution tracking counters"""
+        return self.response_tracker.get_metrics()
+    
+    def get_thread_index_metrics(self) -> Dict:
+        """Get thread index size and hit/miss counters"""
+        return self.thread_index.get_metrics()
+    
+    def get_pool_metrics(self) -> Dict:
+        """Get connection pool size and checkout timing metrics"""
+        return self.pool.get_metrics()
+    
+    def get_write_metrics(self) -> Dict:
+        """Get write actor batch and group commit metrics"""
+        return self.write_actor.get_metrics()
     
     # FAQ related methods
     async def add_faq(self, question: str, answer: str, keywords: str = None, created_by: int = None) -> int:
         """Add a new FAQ"""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute('''
-                INSERT INTO faq (question, answer, keywords, created_by)
-                VALUES (?, ?, ?, ?)
-            ''', (question, answer, keywords, created_by))
-            await db.commit()
-            return cursor.lastrowid
-    
-    async def search_faq(self, keyword: str) -> List[Dict]:
+        result = await self._execute_write('''
+            INSERT INTO faq (question, answer, keywords, created_by)
+            VALUES (?, ?, ?, ?)
+        ''', (question, answer, keywords, created_by))
+        return result.lastrowid
+    
+    async def search_faq(self, keyword: str) -> List[FaqRecord]:
         """Search FAQ by keyword"""
-        async with aiosqlite.connect(self.db_path) as db:
-            # Search in question, answer, and keywords
-            search_term = f'%{keyword}%'
-            async with db.execute('''
-                SELECT * FROM faq 
-                WHERE question LIKE ? OR answer LIKE ? OR keywords LIKE ?
-                ORDER BY created_at DESC
-            ''', (search_term, search_term, search_term)) as cursor:
-                rows = await cursor.fetchall()
-                return [{
-                    'id': row[0],
-                    'question': row[1],
-                    'answer': row[2],
-                    'keywords': row[3],
-                    'created_by': row[4],
-                    'created_at': row[5]
-                } for row in rows]
-    
-    async def get_all_faq(self) -> List[Dict]:
+        # Search in question, answer, and keywords
+        search_term = f'%{keyword}%'
+        return await self._fetch_all(FaqRecord, '''
+            SELECT * FROM faq 
+            WHERE question LIKE ? OR answer LIKE ? OR keywords LIKE ?
+            ORDER BY created_at DESC
+        ''', (search_term, search_term, search_term))
+    
+    async def search_faq_ranked(self, query: str, limit: int = 5) -> List[FaqRecord]:
+        """Search FAQ for any word of a free-text query, best matches first"""
+        terms = search_terms(query)
+        if not terms:
+            return []
+        
+        if self.faq_fts_enabled:
+            # bm25 column weights: question, answer, keywords
+            return await self._fetch_all(FaqRecord, '''
+                SELECT faq.* FROM faq_fts
+                JOIN faq ON faq.id = faq_fts.rowid
+                WHERE faq_fts MATCH ?
+                ORDER BY bm25(faq_fts, 5.0, 1.0, 3.0)
+                LIMIT ?
+            ''', (fts5_match_query(terms), limit))
+        
+        # No FTS5: one scan scoring every term, question / keyword hits weigh more
+        score, params = like_score(FAQ_SEARCH_COLUMNS, terms)
+        return await self._fetch_all(FaqRecord, f'''
+            SELECT * FROM (SELECT faq.*, {score} AS score FROM faq)
+            WHERE score > 0
+            ORDER BY score DESC, created_at DESC
+            LIMIT ?
+        ''', (*params, limit))
+    
+    async def get_all_faq(self) -> List[FaqRecord]:
         """Get all FAQs"""
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                'SELECT * FROM faq ORDER BY created_at DESC'
-            ) as cursor:
-                rows = await cursor.fetchall()
-                return [{
-                    'id': row[0],
-                    'question': row[1],
-                    'answer': row[2],
-                    'keywords': row[3],
-                    'created_by': row[4],
-                    'created_at': row[5]
-                } for row in rows]
-    
-    async def get_faq_by_id(self, faq_id: int) -> Optional[Dict]:
+        return await self._fetch_all(FaqRecord, 'SELECT * FROM faq ORDER BY created_at DESC')
+    
+    async def get_faq_by_id(self, faq_id: int) -> Optional[FaqRecord]:
         """Get FAQ by ID"""
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                'SELECT * FROM faq WHERE id = ?', (faq_id,)
-            ) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    return {
-                        'id': row[0],
-                        'question': row[1],
-                        'answer': row[2],
-                        'keywords': row[3],
-                        'created_by': row[4],
-                        'created_at': row[5]
-                    }
-                return None
+        return await self._fetch_one(FaqRecord, 'SELECT * FROM faq WHERE id = ?', (faq_id,))
     
     async def delete_faq(self, faq_id: int):
         """Delete FAQ by ID"""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute('DELETE FROM faq WHERE id = ?', (faq_id,))
-            await db.commit()
+        await self._execute_write('DELETE FROM faq WHERE id = ?', (faq_id,))
     
     async def update_faq(self, faq_id: int, question: str = None, answer: str = None, keywords: str = None):
         """Update FAQ"""
@@ -362,38 +395,118 @@ class DatabaseManager:
         if fields:
             values.append(faq_id)
             query = f'UPDATE faq SET {", ".join(fields)} WHERE id = ?'
-            
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute(query, values)
-                await db.commit()
+            await self._execute_write(query, tuple(values))
     
     # Statistics tracking methods
     async def update_daily_stats(self, stat_type: str, increment: int = 1):
-        """Update daily statistics"""
-        today = datetime.now().date().isoformat()
+        """Update daily statistics (buffered, flushed periodically)"""
+        self.stats_aggregator.increment(stat_type, increment)
+    
+    async def _apply_daily_stats_deltas(self, deltas: Dict[str, Dict[str, int]]):
+        """Apply coalesced daily stats deltas in a single upsert"""
+        columns = ', '.join(DAILY_STAT_COLUMNS)
+        placeholders = ', '.join(['(' + ', '.join(['?'] * (len(DAILY_STAT_COLUMNS) + 1)) + ')'] * len(deltas))
+        updates = ', '.join(f'{column} = {column} + excluded.{column}' for column in DAILY_STAT_COLUMNS)
+        
+        params = []
+        for date, counters in deltas.items():
+            params.append(date)
+            params.extend(counters.get(column, 0) for column in DAILY_STAT_COLUMNS)
         
-        async with aiosqlite.connect(self.db_path) as db:
-            # Insert or update today's stats
-            await db.execute(f'''
-                INSERT INTO daily_stats (date, {stat_type}) 
-                VALUES (?, ?)
-                ON CONFLICT(date) DO UPDATE SET 
-                {stat_type} = {stat_type} + ?
-            ''', (today, increment, increment))
-            await db.commit()
-    
-    async def record_response_time(self, question_id: int, minutes: int):
+        await self._execute_write(f'''
+            INSERT INTO daily_stats (date, {columns})
+            VALUES {placeholders}
+            ON CONFLICT(date) DO UPDATE SET {updates}
+        ''', tuple(params))
+    
+    def get_stats_metrics(self) -> Dict:
+        """Get daily stats aggregator metrics"""
+        return self.stats_aggregator.get_metrics()
+    
+    async def record_response_time(self, question_id: int, minutes: int, admin_id: int = None):
         """Record response time for a question"""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute('''
-                INSERT INTO response_times (question_id, response_time_minutes)
-                VALUES (?, ?)
-            ''', (question_id, minutes))
-            await db.commit()
+        await self._execute_write('''
+            INSERT INTO response_times (question_id, response_time_minutes, admin_id)
+            VALUES (?, ?, ?)
+        ''', (question_id, minutes, admin_id))
+        self.response_time_sketches.add(minutes, admin_id)
+    
+    async def _write_response_events(self, events: List[ResponseEvent]):
+        """Fill first_response_at / solved_at, recording a response time the first time only
+        
+        Errors propagate, so the tracker keeps the batch and retries it.
+        """
+        async def write(event: ResponseEvent):
+            at = format_utc(event.at)
+            if event.kind != FIRST_RESPONSE:
+                await self._execute_write(
+                    'UPDATE questions SET solved_at = ? WHERE id = ? AND solved_at IS NULL',
+                    (at, event.question_id)
+                )
+                return
+            
+            # The response time is inserted only while first_response_at is still empty,
+            # in the same savepoint that fills it, so a retry never records it twice
+            inserted, _ = await self._execute_atomic([
+                ('''
+                    INSERT INTO response_times (question_id, response_time_minutes, admin_id)
+                    SELECT id, ?, ? FROM questions WHERE id = ? AND first_response_at IS NULL
+                ''', (event.minutes, event.admin_id, event.question_id)),
+                ('UPDATE questions SET first_response_at = ? WHERE id = ? AND first_response_at IS NULL',
+                 (at, event.question_id)),
+            ])
+            if inserted.rowcount:
+                self.response_time_sketches.add(event.minutes, event.admin_id)
+        
+        # Concurrent submits share the write actor's group commits
+        await asyncio.gather(*(write(event) for event in events))
+    
+    async def _merge_response_time_sketches(self, pending: Dict[tuple, TDigest]):
+        """Merge flushed digests into the stored (day, admin_id) sketches"""
+        days = sorted({day for day, _ in pending})
+        async with self.pool.reader() as db:
+            async with db.execute(f'''
+                SELECT day, admin_id, sketch FROM response_time_sketches
+                WHERE day IN ({', '.join('?' * len(days))})
+            ''', days) as cursor:
+                stored = {(day, admin_id): sketch for day, admin_id, sketch in await cursor.fetchall()}
+        
+        writes = []
+        for key, digest in pending.items():
+            # Merge into a copy, a failed flush puts the pending digests back as they were
+            merged = TDigest.from_json(stored[key]) if key in stored else TDigest()
+            merged.merge(digest)
+            writes.append(self._execute_write('''
+                INSERT INTO response_time_sketches (day, admin_id, sketch) VALUES (?, ?, ?)
+                ON CONFLICT(day, admin_id) DO UPDATE SET sketch = excluded.sketch
+            ''', (*key, merged.to_json())))
+        await asyncio.gather(*writes)
+    
+    async def _load_response_time_sketches(self, days: Optional[int], admin_id: int = None) -> List[tuple]:
+        """(admin_id, digest) pairs of the last `days` days, including unflushed ones"""
+        start = period_start(days)
+        query = 'SELECT admin_id, sketch FROM response_time_sketches WHERE day >= ?'
+        params = [start]
+        if admin_id is not None:
+            query += ' AND admin_id = ?'
+            params.append(admin_id)
+        async with self.pool.reader() as db:
+            async with db.execute(query, params) as cursor:
+                sketches = [(admin, TDigest.from_json(sketch)) for admin, sketch in await cursor.fetchall()]
+        return sketches + self.response_time_sketches.pending(start, admin_id)
+    
+    async def get_response_time_percentiles(self, days: Optional[int] = 30, admin_id: int = None) -> Dict:
+        """Response time count / min / max / p50 / p90 / p99 (minutes) from the daily sketches"""
+        sketches = await self._load_response_time_sketches(days, admin_id)
+        return response_time_summary(digest for _, digest in sketches)
+    
+    async def get_admin_response_percentiles(self, days: Optional[int] = 30) -> List[tuple]:
+        """(admin_id, percentile summary) per admin, busiest first"""
+        return admin_response_summaries(await self._load_response_time_sketches(days))
     
     async def get_statistics_data(self, days: int = 30) -> Dict:
         """Get comprehensive statistics data"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.reader() as db:
             stats = {}
             
             # Daily stats for the period
@@ -435,4 +548,149 @@ class DatabaseManager:
             ''') as cursor:
                 stats['status_distribution'] = await cursor.fetchall()
             
-            return stats
\ No newline at end of file
+            return stats
+    
+    # Statistics queries behind the statistics cog
+    async def get_overview_stats(self) -> Dict:
+        """Question, user, answer and FAQ totals plus the last week's activity
+        
+        Two statements instead of one COUNT(*) per counter: a single covering
+        scan of questions grouped by (status, language) gives the totals and the
+        language ranking, and one row of subqueries gives everything else, with
+        the time-window counters answered by index range seeks.
+        """
+        week, month = period_start(7), period_start(30)
+        async with self.pool.reader() as db:
+            async with db.execute('''
+                SELECT status, programming_language, COUNT(*)
+                FROM questions
+                GROUP BY status, programming_language
+            ''') as cursor:
+                stats = overview_totals(await cursor.fetchall())
+            
+            async with db.execute('''
+                SELECT
+                    (SELECT COUNT(*) FROM questions WHERE created_at >= :week) AS recent_questions,
+                    (SELECT COUNT(*) FROM questions WHERE status = 'solved' AND updated_at >= :week) AS recent_solved,
+                    (SELECT COUNT(DISTINCT user_id) FROM questions WHERE created_at >= :month) AS active_users,
+                    (SELECT COUNT(*) FROM users) AS total_users,
+                    (SELECT COUNT(*) FROM users WHERE created_at >= :week) AS new_users_week,
+                    (SELECT COUNT(*) FROM answers) AS total_answers,
+                    (SELECT COUNT(*) FROM answers WHERE created_at >= :week) AS recent_answers,
+                    rt.avg_response_time,
+                    rt.fastest_response,
+                    (SELECT COUNT(*) FROM faq) AS total_faq,
+                    (SELECT COALESCE(SUM(faq_searches), 0) FROM daily_stats WHERE date >= :week) AS faq_searches_week
+                FROM (
+                    SELECT AVG(response_time_minutes) AS avg_response_time,
+                           MIN(response_time_minutes) AS fastest_response
+                    FROM response_times
+                    WHERE created_at >= :month
+                ) rt
+            ''', {'week': week, 'month': month}) as cursor:
+                row = await cursor.fetchone()
+                stats.update(zip((column[0] for column in cursor.description), row))
+            return stats
+    
+    async def get_period_stats(self, days: Optional[int] = 30) -> Dict:
+        """Per-day question / solved counts and top languages of the last `days` days (None = all)"""
+        start = period_start(days)
+        async with self.pool.reader() as db:
+            async with db.execute('''
+                SELECT date(created_at) AS day, COUNT(*), SUM(status = 'solved')
+                FROM questions
+                WHERE created_at >= ?
+                GROUP BY day
+                ORDER BY day
+            ''', (start,)) as cursor:
+                daily = [tuple(row) for row in await cursor.fetchall()]
+            
+            async with db.execute('''
+                SELECT programming_language, COUNT(*) AS count
+                FROM questions
+                WHERE created_at >= ?
+                GROUP BY programming_language
+                ORDER BY count DESC
+                LIMIT 10
+            ''', (start,)) as cursor:
+                languages = [tuple(row) for row in await cursor.fetchall()]
+        
+        return {
+            'days': days,
+            'total_questions': sum(count for _, count, _ in daily),
+            'solved_questions': sum(solved for _, _, solved in daily),
+            'daily_questions': daily,
+            'top_languages': languages,
+        }
+    
+    async def get_user_stats(self, user_id: int) -> Dict:
+        """Question counts, favourite languages, first / last question and average response time of a user"""
+        async with self.pool.reader() as db:
+            async with db.execute(f'''
+                SELECT {', '.join(USER_STATS_COLUMNS)} FROM user_stats WHERE user_id = ?
+            ''', (user_id,)) as cursor:
+                row = await cursor.fetchone()
+        return user_stats_summary(dict(zip(USER_STATS_COLUMNS, row)) if row else None)
+    
+    # Rollups (pre-aggregated activity kept current by triggers)
+    async def rebuild_rollups(self):
+        """Recompute the rollup tables, user summaries and response time sketches from raw history"""
+        async with self.pool.writer() as db:
+            await rebuild_sqlite_rollups(db)
+            await rebuild_sqlite_user_stats(db)
+        await self.response_time_sketches.rebuild(self._rebuild_response_time_sketches)
+    
+    async def _rebuild_response_time_sketches(self):
+        """Recompute the stored sketches from response_times (flushes held off by the caller)"""
+        async with self.pool.writer() as db:
+            await rebuild_sqlite_sketches(db)
+    
+    async def get_rollup_series(self, days: Optional[int] = 30, granularity: str = 'day') -> List[tuple]:
+        """Rollup rows (bucket, *ROLLUP_COLUMNS) of the last `days` days, oldest first"""
+        table = {'day': 'daily_rollups', 'hour': 'hourly_rollups'}[granularity]
+        async with self.pool.reader() as db:
+            async with db.execute(f'''
+                SELECT bucket, {', '.join(ROLLUP_COLUMNS)}
+                FROM {table}
+                WHERE bucket >= ?
+                ORDER BY bucket
+            ''', (period_start(days),)) as cursor:
+                return [tuple(row) for row in await cursor.fetchall()]
+    
+    async def get_trend_stats(self, days: Optional[int] = 30) -> Dict:
+        """Moving average, week-over-week change, anomalies and next week's forecast from the daily rollups"""
+        history = None if days is None else max(days, TREND_HISTORY_DAYS)
+        return compute_trends(await self.get_rollup_series(history, 'day'), days)
+    
+    async def get_dashboard_stats(self) -> Dict:
+        """Today / this week / current state counters for /대시보드, from the rollup tables"""
+        week_start = period_start(6)
+        async with self.pool.reader() as db:
+            async with db.execute(f'''
+                SELECT bucket, {', '.join(ROLLUP_COLUMNS)}
+                FROM daily_rollups
+                WHERE bucket >= ?
+            ''', (week_start,)) as cursor:
+                days = await cursor.fetchall()
+            
+            async with db.execute('SELECT status, questions FROM status_rollups') as cursor:
+                statuses = await cursor.fetchall()
+            
+            async with db.execute('''
+                SELECT programming_language, SUM(questions) AS count
+                FROM daily_language_rollups
+                WHERE day >= ?
+                GROUP BY programming_language
+                ORDER BY count DESC
+                LIMIT 3
+            ''', (week_start,)) as cursor:
+                languages = [tuple(row) for row in await cursor.fetchall()]
+            
+            async with db.execute('''
+                SELECT (SELECT COUNT(*) FROM users), (SELECT COUNT(*) FROM faq)
+            ''') as cursor:
+                total_users, total_faq = await cursor.fetchone()
+        
+        stats = dashboard_totals(days, statuses)
+        stats.update(total_users=total_users, total_faq=total_faq, popular_languages_week=languages)
+        return stats
@@ -0,0 +1,74 @@
+-- Initial schema
+
+-- Users table
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL,
+    display_name TEXT,
+    is_admin BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Questions table
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    thread_id INTEGER UNIQUE,
+    title TEXT NOT NULL,
+    os TEXT NOT NULL,
+    programming_language TEXT NOT NULL,
+    error_message TEXT NOT NULL,
+    purpose TEXT NOT NULL,
+    code_snippet TEXT,
+    log_files TEXT,
+    screenshot_url TEXT,
+    attempted_solutions TEXT,
+    status TEXT DEFAULT 'open',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (user_id)
+);
+
+-- Answers table
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    question_id INTEGER NOT NULL,
+    admin_id INTEGER NOT NULL,
+    answer_text TEXT NOT NULL,
+    is_solution BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (question_id) REFERENCES questions (id),
+    FOREIGN KEY (admin_id) REFERENCES users (user_id)
+);
+
+-- FAQ table
+CREATE TABLE IF NOT EXISTS faq (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    keywords TEXT,
+    created_by INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (created_by) REFERENCES users (user_id)
+);
+
+-- Statistics tracking table
+CREATE TABLE IF NOT EXISTS daily_stats (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date DATE UNIQUE,
+    questions_created INTEGER DEFAULT 0,
+    questions_solved INTEGER DEFAULT 0,
+    answers_given INTEGER DEFAULT 0,
+    new_users INTEGER DEFAULT 0,
+    faq_searches INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Response time tracking
+CREATE TABLE IF NOT EXISTS response_times (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    question_id INTEGER,
+    response_time_minutes INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (question_id) REFERENCES questions (id)
+);
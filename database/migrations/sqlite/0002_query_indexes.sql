@@ -0,0 +1,20 @@
+-- Secondary indexes for the per-user, status and time-window queries
+
+-- get_user_questions: WHERE user_id = ? ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_questions_user_created ON questions (user_id, created_at);
+
+-- Status counts and status filters within a time window
+CREATE INDEX IF NOT EXISTS idx_questions_status_created ON questions (status, created_at);
+
+-- Time-window statistics (created_at >= date('now', '-N days'))
+CREATE INDEX IF NOT EXISTS idx_questions_created ON questions (created_at);
+
+-- Answers of a question
+CREATE INDEX IF NOT EXISTS idx_answers_question ON answers (question_id);
+
+-- Recent answers / response times
+CREATE INDEX IF NOT EXISTS idx_answers_created ON answers (created_at);
+CREATE INDEX IF NOT EXISTS idx_response_times_created ON response_times (created_at);
+
+-- New users within a time window
+CREATE INDEX IF NOT EXISTS idx_users_created ON users (created_at);
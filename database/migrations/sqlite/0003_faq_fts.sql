@@ -0,0 +1,31 @@
+-- requires: fts5
+-- Full-text index over faq (question, answer, keywords), ranked with bm25.
+-- External content table: the text lives only in faq, triggers keep the index in sync.
+CREATE VIRTUAL TABLE IF NOT EXISTS faq_fts USING fts5(
+    question,
+    answer,
+    keywords,
+    content='faq',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS faq_fts_after_insert AFTER INSERT ON faq BEGIN
+    INSERT INTO faq_fts (rowid, question, answer, keywords)
+    VALUES (new.id, new.question, new.answer, new.keywords);
+END;
+
+CREATE TRIGGER IF NOT EXISTS faq_fts_after_delete AFTER DELETE ON faq BEGIN
+    INSERT INTO faq_fts (faq_fts, rowid, question, answer, keywords)
+    VALUES ('delete', old.id, old.question, old.answer, old.keywords);
+END;
+
+CREATE TRIGGER IF NOT EXISTS faq_fts_after_update AFTER UPDATE ON faq BEGIN
+    INSERT INTO faq_fts (faq_fts, rowid, question, answer, keywords)
+    VALUES ('delete', old.id, old.question, old.answer, old.keywords);
+    INSERT INTO faq_fts (rowid, question, answer, keywords)
+    VALUES (new.id, new.question, new.answer, new.keywords);
+END;
+
+-- Index the FAQs that existed before this migration
+INSERT INTO faq_fts (faq_fts) VALUES ('rebuild');
@@ -0,0 +1,7 @@
+-- Indexes for get_overview_stats
+
+-- Every question counter and the language ranking from one covering scan grouped by (status, language)
+CREATE INDEX IF NOT EXISTS idx_questions_status_language ON questions (status, programming_language);
+
+-- Questions solved within a time window (status = 'solved' AND updated_at >= ?)
+CREATE INDEX IF NOT EXISTS idx_questions_status_updated ON questions (status, updated_at);
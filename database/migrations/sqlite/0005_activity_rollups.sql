@@ -0,0 +1,111 @@
+-- Pre-aggregated activity for the dashboard, kept current by triggers on the raw tables.
+-- Buckets are UTC, like CURRENT_TIMESTAMP. Existing history is backfilled by
+-- database.rollups.fill_sqlite_rollups() in this migration's transaction.
+
+-- Per-hour counters ('YYYY-MM-DD HH:00:00')
+CREATE TABLE IF NOT EXISTS hourly_rollups (
+    bucket TEXT PRIMARY KEY,
+    questions_created INTEGER NOT NULL DEFAULT 0,
+    questions_solved INTEGER NOT NULL DEFAULT 0,
+    answers_given INTEGER NOT NULL DEFAULT 0,
+    new_users INTEGER NOT NULL DEFAULT 0,
+    response_time_sum INTEGER NOT NULL DEFAULT 0,
+    response_time_count INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+-- Per-day counters ('YYYY-MM-DD')
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    bucket TEXT PRIMARY KEY,
+    questions_created INTEGER NOT NULL DEFAULT 0,
+    questions_solved INTEGER NOT NULL DEFAULT 0,
+    answers_given INTEGER NOT NULL DEFAULT 0,
+    new_users INTEGER NOT NULL DEFAULT 0,
+    response_time_sum INTEGER NOT NULL DEFAULT 0,
+    response_time_count INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+-- Questions asked per day and language
+CREATE TABLE IF NOT EXISTS daily_language_rollups (
+    day TEXT NOT NULL,
+    programming_language TEXT NOT NULL,
+    questions INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, programming_language)
+) WITHOUT ROWID;
+
+-- Current number of questions in each status
+CREATE TABLE IF NOT EXISTS status_rollups (
+    status TEXT PRIMARY KEY,
+    questions INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS rollups_after_question_insert AFTER INSERT ON questions BEGIN
+    INSERT INTO hourly_rollups (bucket, questions_created)
+    VALUES (strftime('%Y-%m-%d %H:00:00', new.created_at), 1)
+    ON CONFLICT(bucket) DO UPDATE SET questions_created = questions_created + 1;
+    INSERT INTO daily_rollups (bucket, questions_created)
+    VALUES (date(new.created_at), 1)
+    ON CONFLICT(bucket) DO UPDATE SET questions_created = questions_created + 1;
+    INSERT INTO daily_language_rollups (day, programming_language, questions)
+    VALUES (date(new.created_at), new.programming_language, 1)
+    ON CONFLICT(day, programming_language) DO UPDATE SET questions = questions + 1;
+    INSERT INTO status_rollups (status, questions)
+    VALUES (COALESCE(new.status, 'open'), 1)
+    ON CONFLICT(status) DO UPDATE SET questions = questions + 1;
+END;
+
+-- A question counts as solved in the bucket of the update that solved it, and stops
+-- counting there when it is reopened, so the counters match a rebuild from history
+CREATE TRIGGER IF NOT EXISTS rollups_after_question_status AFTER UPDATE OF status ON questions
+WHEN COALESCE(old.status, 'open') IS NOT COALESCE(new.status, 'open') BEGIN
+    UPDATE status_rollups SET questions = questions - 1 WHERE status = COALESCE(old.status, 'open');
+    INSERT INTO status_rollups (status, questions)
+    VALUES (COALESCE(new.status, 'open'), 1)
+    ON CONFLICT(status) DO UPDATE SET questions = questions + 1;
+
+    UPDATE hourly_rollups SET questions_solved = questions_solved - 1
+    WHERE old.status = 'solved' AND bucket = strftime('%Y-%m-%d %H:00:00', old.updated_at);
+    UPDATE daily_rollups SET questions_solved = questions_solved - 1
+    WHERE old.status = 'solved' AND bucket = date(old.updated_at);
+
+    INSERT INTO hourly_rollups (bucket, questions_solved)
+    SELECT strftime('%Y-%m-%d %H:00:00', new.updated_at), 1 WHERE new.status = 'solved'
+    ON CONFLICT(bucket) DO UPDATE SET questions_solved = questions_solved + 1;
+    INSERT INTO daily_rollups (bucket, questions_solved)
+    SELECT date(new.updated_at), 1 WHERE new.status = 'solved'
+    ON CONFLICT(bucket) DO UPDATE SET questions_solved = questions_solved + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS rollups_after_question_delete AFTER DELETE ON questions BEGIN
+    UPDATE status_rollups SET questions = questions - 1 WHERE status = COALESCE(old.status, 'open');
+END;
+
+CREATE TRIGGER IF NOT EXISTS rollups_after_answer_insert AFTER INSERT ON answers BEGIN
+    INSERT INTO hourly_rollups (bucket, answers_given)
+    VALUES (strftime('%Y-%m-%d %H:00:00', new.created_at), 1)
+    ON CONFLICT(bucket) DO UPDATE SET answers_given = answers_given + 1;
+    INSERT INTO daily_rollups (bucket, answers_given)
+    VALUES (date(new.created_at), 1)
+    ON CONFLICT(bucket) DO UPDATE SET answers_given = answers_given + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS rollups_after_user_insert AFTER INSERT ON users BEGIN
+    INSERT INTO hourly_rollups (bucket, new_users)
+    VALUES (strftime('%Y-%m-%d %H:00:00', new.created_at), 1)
+    ON CONFLICT(bucket) DO UPDATE SET new_users = new_users + 1;
+    INSERT INTO daily_rollups (bucket, new_users)
+    VALUES (date(new.created_at), 1)
+    ON CONFLICT(bucket) DO UPDATE SET new_users = new_users + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS rollups_after_response_time_insert AFTER INSERT ON response_times BEGIN
+    INSERT INTO hourly_rollups (bucket, response_time_sum, response_time_count)
+    VALUES (strftime('%Y-%m-%d %H:00:00', new.created_at), COALESCE(new.response_time_minutes, 0), 1)
+    ON CONFLICT(bucket) DO UPDATE SET
+        response_time_sum = response_time_sum + excluded.response_time_sum,
+        response_time_count = response_time_count + 1;
+    INSERT INTO daily_rollups (bucket, response_time_sum, response_time_count)
+    VALUES (date(new.created_at), COALESCE(new.response_time_minutes, 0), 1)
+    ON CONFLICT(bucket) DO UPDATE SET
+        response_time_sum = response_time_sum + excluded.response_time_sum,
+        response_time_count = response_time_count + 1;
+END;
@@ -0,0 +1,13 @@
+-- Response-time percentiles without scanning response_times: one mergeable
+-- t-digest (database.quantiles.TDigest, JSON) per UTC day and admin.
+-- admin_id 0 holds response times recorded without an admin. Existing history
+-- is backfilled by database.rollups.fill_sqlite_sketches() in this migration's transaction.
+
+ALTER TABLE response_times ADD COLUMN admin_id INTEGER;
+
+CREATE TABLE IF NOT EXISTS response_time_sketches (
+    day TEXT NOT NULL,
+    admin_id INTEGER NOT NULL DEFAULT 0,
+    sketch TEXT NOT NULL,
+    PRIMARY KEY (day, admin_id)
+) WITHOUT ROWID;
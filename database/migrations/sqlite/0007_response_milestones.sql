@@ -0,0 +1,12 @@
+-- When each question got its first admin response and was first solved (UTC).
+-- Written once per question by database.response_tracker.ResponseTracker.
+
+ALTER TABLE questions ADD COLUMN first_response_at TIMESTAMP;
+ALTER TABLE questions ADD COLUMN solved_at TIMESTAMP;
+
+-- Existing history: the earliest answer is the first response, a solved
+-- question was solved at its last status change
+UPDATE questions SET first_response_at = (
+    SELECT MIN(created_at) FROM answers WHERE answers.question_id = questions.id
+);
+UPDATE questions SET solved_at = updated_at WHERE status = 'solved';
@@ -0,0 +1,93 @@
+-- Per-user question summary for /사용자통계, kept current by triggers on questions and
+-- response_times so user statistics are one primary key lookup. Existing history is
+-- backfilled by database.rollups.fill_sqlite_user_stats() in this migration's transaction.
+--
+-- languages is a Space-Saving top-k ({language: count}, at most 8 entries): exact while a
+-- user has asked about 8 languages or fewer, afterwards a new language replaces the least
+-- asked one and inherits its count, so frequent languages are never dropped.
+CREATE TABLE IF NOT EXISTS user_stats (
+    user_id INTEGER PRIMARY KEY,
+    total_questions INTEGER NOT NULL DEFAULT 0,
+    open_questions INTEGER NOT NULL DEFAULT 0,
+    in_progress_questions INTEGER NOT NULL DEFAULT 0,
+    solved_questions INTEGER NOT NULL DEFAULT 0,
+    closed_questions INTEGER NOT NULL DEFAULT 0,
+    first_question_at TIMESTAMP,
+    last_question_at TIMESTAMP,
+    languages TEXT NOT NULL DEFAULT '{}',
+    response_time_sum INTEGER NOT NULL DEFAULT 0,
+    response_time_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS user_stats_after_question_insert AFTER INSERT ON questions BEGIN
+    INSERT INTO user_stats (user_id, total_questions, open_questions, in_progress_questions,
+                            solved_questions, closed_questions, first_question_at, last_question_at, languages)
+    VALUES (
+        new.user_id, 1,
+        COALESCE(new.status, 'open') = 'open',
+        COALESCE(new.status, 'open') = 'in_progress',
+        COALESCE(new.status, 'open') = 'solved',
+        COALESCE(new.status, 'open') = 'closed',
+        new.created_at, new.created_at,
+        json_object(new.programming_language, 1)
+    )
+    ON CONFLICT(user_id) DO UPDATE SET
+        total_questions = total_questions + 1,
+        open_questions = open_questions + excluded.open_questions,
+        in_progress_questions = in_progress_questions + excluded.in_progress_questions,
+        solved_questions = solved_questions + excluded.solved_questions,
+        closed_questions = closed_questions + excluded.closed_questions,
+        first_question_at = COALESCE(min(first_question_at, excluded.first_question_at), excluded.first_question_at),
+        last_question_at = COALESCE(max(last_question_at, excluded.last_question_at), excluded.last_question_at),
+        languages = (
+            SELECT json_group_object(key, value) FROM (
+                SELECT key, value + (key = new.programming_language) AS value
+                FROM json_each(user_stats.languages)
+                UNION ALL
+                SELECT new.programming_language,
+                       (SELECT CASE WHEN COUNT(*) >= 8 THEN MIN(value) ELSE 0 END FROM json_each(user_stats.languages)) + 1
+                WHERE NOT EXISTS (SELECT 1 FROM json_each(user_stats.languages) WHERE key = new.programming_language)
+                ORDER BY value DESC
+                LIMIT 8
+            )
+        );
+END;
+
+CREATE TRIGGER IF NOT EXISTS user_stats_after_question_status AFTER UPDATE OF status ON questions
+WHEN COALESCE(old.status, 'open') IS NOT COALESCE(new.status, 'open') BEGIN
+    UPDATE user_stats SET
+        open_questions = open_questions
+            - (COALESCE(old.status, 'open') = 'open') + (COALESCE(new.status, 'open') = 'open'),
+        in_progress_questions = in_progress_questions
+            - (COALESCE(old.status, 'open') = 'in_progress') + (COALESCE(new.status, 'open') = 'in_progress'),
+        solved_questions = solved_questions
+            - (COALESCE(old.status, 'open') = 'solved') + (COALESCE(new.status, 'open') = 'solved'),
+        closed_questions = closed_questions
+            - (COALESCE(old.status, 'open') = 'closed') + (COALESCE(new.status, 'open') = 'closed')
+    WHERE user_id = new.user_id;
+END;
+
+-- First / last question dates are not narrowed on delete; a rebuild recomputes them
+CREATE TRIGGER IF NOT EXISTS user_stats_after_question_delete AFTER DELETE ON questions BEGIN
+    UPDATE user_stats SET
+        total_questions = total_questions - 1,
+        open_questions = open_questions - (COALESCE(old.status, 'open') = 'open'),
+        in_progress_questions = in_progress_questions - (COALESCE(old.status, 'open') = 'in_progress'),
+        solved_questions = solved_questions - (COALESCE(old.status, 'open') = 'solved'),
+        closed_questions = closed_questions - (COALESCE(old.status, 'open') = 'closed'),
+        languages = COALESCE((
+            SELECT json_group_object(key, value) FROM (
+                SELECT key, value - (key = old.programming_language) AS value
+                FROM json_each(user_stats.languages)
+            )
+            WHERE value > 0
+        ), '{}')
+    WHERE user_id = old.user_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS user_stats_after_response_time_insert AFTER INSERT ON response_times BEGIN
+    UPDATE user_stats SET
+        response_time_sum = response_time_sum + COALESCE(new.response_time_minutes, 0),
+        response_time_count = response_time_count + 1
+    WHERE user_id = (SELECT user_id FROM questions WHERE id = new.question_id);
+END;
@@ -0,0 +1,69 @@
+-- Initial schema (mirrors the SQLite tables)
+
+-- Users table
+create table if not exists users (
+    user_id bigint primary key,
+    username text not null,
+    display_name text,
+    is_admin boolean default false,
+    created_at timestamptz default now()
+);
+
+-- Questions table
+create table if not exists questions (
+    id bigint generated by default as identity primary key,
+    user_id bigint not null references users (user_id),
+    thread_id bigint unique,
+    title text not null,
+    os text not null,
+    programming_language text not null,
+    error_message text not null,
+    purpose text not null,
+    code_snippet text,
+    log_files text,
+    screenshot_url text,
+    attempted_solutions text,
+    status text default 'open',
+    created_at timestamptz default now(),
+    updated_at timestamptz default now()
+);
+
+-- Answers table
+create table if not exists answers (
+    id bigint generated by default as identity primary key,
+    question_id bigint not null references questions (id),
+    admin_id bigint not null references users (user_id),
+    answer_text text not null,
+    is_solution boolean default false,
+    created_at timestamptz default now()
+);
+
+-- FAQ table
+create table if not exists faq (
+    id bigint generated by default as identity primary key,
+    question text not null,
+    answer text not null,
+    keywords text,
+    created_by bigint references users (user_id),
+    created_at timestamptz default now()
+);
+
+-- Statistics tracking table
+create table if not exists daily_stats (
+    id bigint generated by default as identity primary key,
+    date date unique,
+    questions_created integer default 0,
+    questions_solved integer default 0,
+    answers_given integer default 0,
+    new_users integer default 0,
+    faq_searches integer default 0,
+    created_at timestamptz default now()
+);
+
+-- Response time tracking
+create table if not exists response_times (
+    id bigint generated by default as identity primary key,
+    question_id bigint references questions (id),
+    response_time_minutes integer,
+    created_at timestamptz default now()
+);
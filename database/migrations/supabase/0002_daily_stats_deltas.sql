@@ -0,0 +1,22 @@
+-- Apply coalesced daily_stats deltas atomically in one statement.
+-- deltas: [{"date": "2024-01-01", "questions_created": 3, "new_users": 1}, ...]
+create or replace function apply_daily_stats_deltas(deltas jsonb)
+returns void
+language sql
+as $$
+    insert into daily_stats (date, questions_created, questions_solved, answers_given, new_users, faq_searches)
+    select
+        (d ->> 'date')::date,
+        coalesce((d ->> 'questions_created')::integer, 0),
+        coalesce((d ->> 'questions_solved')::integer, 0),
+        coalesce((d ->> 'answers_given')::integer, 0),
+        coalesce((d ->> 'new_users')::integer, 0),
+        coalesce((d ->> 'faq_searches')::integer, 0)
+    from jsonb_array_elements(deltas) as d
+    on conflict (date) do update set
+        questions_created = daily_stats.questions_created + excluded.questions_created,
+        questions_solved = daily_stats.questions_solved + excluded.questions_solved,
+        answers_given = daily_stats.answers_given + excluded.answers_given,
+        new_users = daily_stats.new_users + excluded.new_users,
+        faq_searches = daily_stats.faq_searches + excluded.faq_searches;
+$$;
@@ -0,0 +1,20 @@
+-- Secondary indexes for the per-user, status and time-window queries
+
+-- get_user_questions: user_id = ? order by created_at desc
+create index if not exists idx_questions_user_created on questions (user_id, created_at);
+
+-- Status counts and status filters within a time window
+create index if not exists idx_questions_status_created on questions (status, created_at);
+
+-- Time-window statistics
+create index if not exists idx_questions_created on questions (created_at);
+
+-- Answers of a question
+create index if not exists idx_answers_question on answers (question_id);
+
+-- Recent answers / response times
+create index if not exists idx_answers_created on answers (created_at);
+create index if not exists idx_response_times_created on response_times (created_at);
+
+-- New users within a time window
+create index if not exists idx_users_created on users (created_at);
@@ -0,0 +1,27 @@
+-- Full-text search over faq (question, answer, keywords), ranked with ts_rank_cd.
+-- The 'simple' configuration does no stemming, which suits mixed Korean / English text.
+alter table faq add column if not exists search_vector tsvector
+    generated always as (
+        setweight(to_tsvector('simple', coalesce(question, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(keywords, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(answer, '')), 'C')
+    ) stored;
+
+create index if not exists idx_faq_search_vector on faq using gin (search_vector);
+
+-- terms: already split search words, any of them may match (prefix match)
+create or replace function search_faq_ranked(terms text[], max_results integer default 5)
+returns setof faq
+language sql
+stable
+as $$
+    select f.*
+    from faq f,
+         to_tsquery('simple', (
+             select string_agg(quote_literal(t) || ':*', ' | ')
+             from unnest(terms) as t
+         )) as q
+    where f.search_vector @@ q
+    order by ts_rank_cd(f.search_vector, q) desc, f.created_at desc
+    limit max_results;
+$$;
@@ -0,0 +1,37 @@
+-- Aggregations behind /통계, computed in Postgres so only the final numbers cross the wire.
+-- Returns {"avg_response_time": 12.5,
+--          "top_languages": [{"programming_language": "Python", "count": 3}, ...],
+--          "status_distribution": [{"status": "open", "count": 2}, ...]}
+create or replace function get_statistics_summary(start_date date)
+returns jsonb
+language sql
+stable
+as $$
+    select jsonb_build_object(
+        'avg_response_time', (
+            select coalesce(avg(response_time_minutes), 0)
+            from response_times
+            where created_at >= start_date
+        ),
+        'top_languages', coalesce((
+            select jsonb_agg(l)
+            from (
+                select programming_language, count(*) as count
+                from questions
+                where created_at >= start_date
+                group by programming_language
+                order by count desc
+                limit 10
+            ) l
+        ), '[]'::jsonb),
+        'status_distribution', coalesce((
+            select jsonb_agg(s)
+            from (
+                select status, count(*) as count
+                from questions
+                where created_at >= start_date
+                group by status
+            ) s
+        ), '[]'::jsonb)
+    );
+$$;
@@ -0,0 +1,36 @@
+-- Insert or update a user in one statement; returns true when the user is new.
+-- xmax = 0 only holds for a freshly inserted row version.
+create or replace function upsert_user(
+    p_user_id bigint,
+    p_username text,
+    p_display_name text default null,
+    p_is_admin boolean default false
+)
+returns boolean
+language sql
+as $$
+    insert into users (user_id, username, display_name, is_admin)
+    values (p_user_id, p_username, p_display_name, p_is_admin)
+    on conflict (user_id) do update set
+        username = excluded.username,
+        display_name = excluded.display_name,
+        is_admin = excluded.is_admin
+    returning (xmax = 0);
+$$;
+
+-- Atomically add amount to one daily_stats counter, creating the day's row if needed.
+create or replace function increment_daily_stat(stat_date date, stat_name text, amount integer default 1)
+returns void
+language plpgsql
+as $$
+begin
+    if stat_name not in ('questions_created', 'questions_solved', 'answers_given', 'new_users', 'faq_searches') then
+        raise exception 'unknown daily stat: %', stat_name;
+    end if;
+    execute format(
+        'insert into daily_stats (date, %1$I) values ($1, $2) '
+        'on conflict (date) do update set %1$I = daily_stats.%1$I + excluded.%1$I',
+        stat_name
+    ) using stat_date, amount;
+end;
+$$;
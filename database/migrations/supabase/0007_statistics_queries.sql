@@ -0,0 +1,118 @@
+-- Aggregations behind the statistics cog (/통계, /상세통계, /사용자통계), one round-trip each.
+
+-- Overview: {"status_counts": {"open": 2, ...}, "total_users": 5, ..., "popular_languages": [...]}
+create or replace function get_overview_stats()
+returns jsonb
+language sql
+stable
+as $$
+    select jsonb_build_object(
+        'status_counts', coalesce((
+            select jsonb_object_agg(coalesce(status, 'open'), count)
+            from (select status, count(*) as count from questions group by status) s
+        ), '{}'::jsonb),
+        'total_users', (select count(*) from users),
+        'active_users', (
+            select count(distinct user_id) from questions
+            where created_at >= current_date - 30
+        ),
+        'new_users_week', (select count(*) from users where created_at >= current_date - 7),
+        'total_answers', (select count(*) from answers),
+        'avg_response_time', (
+            select avg(response_time_minutes) from response_times
+            where created_at >= current_date - 30
+        ),
+        'fastest_response', (
+            select min(response_time_minutes) from response_times
+            where created_at >= current_date - 30
+        ),
+        'popular_languages', coalesce((
+            select jsonb_agg(l)
+            from (
+                select programming_language, count(*) as count
+                from questions
+                group by programming_language
+                order by count desc
+                limit 5
+            ) l
+        ), '[]'::jsonb),
+        'recent_questions', (select count(*) from questions where created_at >= current_date - 7),
+        'recent_answers', (select count(*) from answers where created_at >= current_date - 7),
+        'recent_solved', (
+            select count(*) from questions
+            where status = 'solved' and updated_at >= current_date - 7
+        ),
+        'total_faq', (select count(*) from faq),
+        'faq_searches_week', (
+            select coalesce(sum(faq_searches), 0) from daily_stats
+            where date >= current_date - 7
+        )
+    );
+$$;
+
+-- Period: {"daily_questions": [{"day": "2024-01-01", "questions": 3, "solved": 1}, ...],
+--          "top_languages": [{"programming_language": "Python", "count": 3}, ...]}
+create or replace function get_period_stats(start_date date)
+returns jsonb
+language sql
+stable
+as $$
+    select jsonb_build_object(
+        'daily_questions', coalesce((
+            select jsonb_agg(d order by d.day)
+            from (
+                select created_at::date as day,
+                       count(*) as questions,
+                       count(*) filter (where status = 'solved') as solved
+                from questions
+                where created_at >= start_date
+                group by day
+            ) d
+        ), '[]'::jsonb),
+        'top_languages', coalesce((
+            select jsonb_agg(l)
+            from (
+                select programming_language, count(*) as count
+                from questions
+                where created_at >= start_date
+                group by programming_language
+                order by count desc
+                limit 10
+            ) l
+        ), '[]'::jsonb)
+    );
+$$;
+
+-- One user: counts by state, first / last question, favourite languages, average response time
+create or replace function get_user_stats(p_user_id bigint)
+returns jsonb
+language sql
+stable
+as $$
+    select jsonb_build_object(
+        'total_questions', count(*),
+        'solved_questions', count(*) filter (where status = 'solved'),
+        'active_questions', count(*) filter (where status in ('open', 'in_progress')),
+        'first_question_at', min(created_at),
+        'last_question_at', max(created_at),
+        'favorite_languages', coalesce((
+            select jsonb_agg(l.programming_language)
+            from (
+                select programming_language, count(*) as count
+                from questions
+                where user_id = p_user_id
+                group by programming_language
+                order by count desc
+                limit 3
+            ) l
+        ), '[]'::jsonb),
+        'avg_response_time', (
+            select avg(rt.response_time_minutes)
+            from response_times rt
+            join questions rq on rq.id = rt.question_id
+            where rq.user_id = p_user_id
+        )
+    )
+    from questions
+    where user_id = p_user_id;
+$$;
@@ -0,0 +1,75 @@
+-- get_overview_stats with one scan per table: FILTER aggregates instead of a count(*) per counter.
+
+-- Covering index for the (status, language) grouping, and solved-within-a-window lookups
+create index if not exists idx_questions_status_language on questions (status, programming_language);
+create index if not exists idx_questions_status_updated on questions (status, updated_at);
+
+-- Returns {"total_questions": 10, "solved_questions": 4, ..., "popular_languages": [...], "active_users": 3, ...}
+create or replace function get_overview_stats()
+returns jsonb
+language sql
+stable
+as $$
+    with groups as (
+        select programming_language,
+               coalesce(status, 'open') as status,
+               count(*) as total,
+               count(*) filter (where created_at >= current_date - 7) as recent,
+               count(*) filter (where updated_at >= current_date - 7) as recent_updated
+        from questions
+        group by status, programming_language
+    ), by_language as (
+        select programming_language,
+               sum(total) as total,
+               sum(total) filter (where status = 'solved') as solved,
+               sum(total) filter (where status = 'in_progress') as in_progress,
+               sum(total) filter (where status = 'open') as open,
+               sum(recent) as recent,
+               sum(recent_updated) filter (where status = 'solved') as recent_solved
+        from groups
+        group by programming_language
+    ), q as (
+        select coalesce(sum(total), 0) as total_questions,
+               coalesce(sum(solved), 0) as solved_questions,
+               coalesce(sum(in_progress), 0) as in_progress_questions,
+               coalesce(sum(open), 0) as open_questions,
+               coalesce(sum(recent), 0) as recent_questions,
+               coalesce(sum(recent_solved), 0) as recent_solved,
+               coalesce((
+                   select jsonb_agg(l)
+                   from (
+                       select programming_language, total as count
+                       from by_language
+                       order by total desc
+                       limit 5
+                   ) l
+               ), '[]'::jsonb) as popular_languages
+        from by_language
+    ), active as (
+        select count(distinct user_id) as active_users
+        from questions
+        where created_at >= current_date - 30
+    ), u as (
+        select count(*) as total_users,
+               count(*) filter (where created_at >= current_date - 7) as new_users_week
+        from users
+    ), a as (
+        select count(*) as total_answers,
+               count(*) filter (where created_at >= current_date - 7) as recent_answers
+        from answers
+    ), rt as (
+        select avg(response_time_minutes) as avg_response_time,
+               min(response_time_minutes) as fastest_response
+        from response_times
+        where created_at >= current_date - 30
+    ), f as (
+        select count(*) as total_faq from faq
+    ), ds as (
+        select coalesce(sum(faq_searches), 0) as faq_searches_week
+        from daily_stats
+        where date >= current_date - 7
+    )
+    select to_jsonb(q) || to_jsonb(active) || to_jsonb(u) || to_jsonb(a)
+           || to_jsonb(rt) || to_jsonb(f) || to_jsonb(ds)
+    from q, active, u, a, rt, f, ds;
+$$;
@@ -0,0 +1,246 @@
+-- Pre-aggregated activity for the dashboard, kept current by triggers on the raw tables.
+-- Buckets are UTC. rebuild_activity_rollups() recomputes everything from raw history.
+
+create table if not exists hourly_rollups (
+    bucket timestamp primary key,
+    questions_created integer not null default 0,
+    questions_solved integer not null default 0,
+    answers_given integer not null default 0,
+    new_users integer not null default 0,
+    response_time_sum bigint not null default 0,
+    response_time_count integer not null default 0
+);
+
+create table if not exists daily_rollups (
+    bucket date primary key,
+    questions_created integer not null default 0,
+    questions_solved integer not null default 0,
+    answers_given integer not null default 0,
+    new_users integer not null default 0,
+    response_time_sum bigint not null default 0,
+    response_time_count integer not null default 0
+);
+
+create table if not exists daily_language_rollups (
+    day date not null,
+    programming_language text not null,
+    questions integer not null default 0,
+    primary key (day, programming_language)
+);
+
+create table if not exists status_rollups (
+    status text primary key,
+    questions integer not null default 0
+);
+
+-- Add amounts to the hourly and daily rollup rows of a timestamp
+create or replace function bump_activity_rollups(
+    at timestamptz,
+    p_questions_created integer default 0,
+    p_questions_solved integer default 0,
+    p_answers_given integer default 0,
+    p_new_users integer default 0,
+    p_response_time_sum bigint default 0,
+    p_response_time_count integer default 0
+)
+returns void
+language sql
+as $$
+    insert into hourly_rollups as r (bucket, questions_created, questions_solved, answers_given,
+                                     new_users, response_time_sum, response_time_count)
+    values (date_trunc('hour', at at time zone 'utc'), p_questions_created, p_questions_solved, p_answers_given,
+            p_new_users, p_response_time_sum, p_response_time_count)
+    on conflict (bucket) do update set
+        questions_created = r.questions_created + excluded.questions_created,
+        questions_solved = r.questions_solved + excluded.questions_solved,
+        answers_given = r.answers_given + excluded.answers_given,
+        new_users = r.new_users + excluded.new_users,
+        response_time_sum = r.response_time_sum + excluded.response_time_sum,
+        response_time_count = r.response_time_count + excluded.response_time_count;
+    insert into daily_rollups as r (bucket, questions_created, questions_solved, answers_given,
+                                    new_users, response_time_sum, response_time_count)
+    values ((at at time zone 'utc')::date, p_questions_created, p_questions_solved, p_answers_given,
+            p_new_users, p_response_time_sum, p_response_time_count)
+    on conflict (bucket) do update set
+        questions_created = r.questions_created + excluded.questions_created,
+        questions_solved = r.questions_solved + excluded.questions_solved,
+        answers_given = r.answers_given + excluded.answers_given,
+        new_users = r.new_users + excluded.new_users,
+        response_time_sum = r.response_time_sum + excluded.response_time_sum,
+        response_time_count = r.response_time_count + excluded.response_time_count;
+$$;
+
+create or replace function rollups_on_question()
+returns trigger
+language plpgsql
+as $$
+begin
+    if tg_op = 'INSERT' then
+        perform bump_activity_rollups(new.created_at, p_questions_created => 1);
+        insert into daily_language_rollups as r (day, programming_language, questions)
+        values ((new.created_at at time zone 'utc')::date, new.programming_language, 1)
+        on conflict (day, programming_language) do update set questions = r.questions + 1;
+        insert into status_rollups as r (status, questions)
+        values (coalesce(new.status, 'open'), 1)
+        on conflict (status) do update set questions = r.questions + 1;
+        return new;
+    end if;
+
+    if tg_op = 'DELETE' then
+        update status_rollups set questions = questions - 1 where status = coalesce(old.status, 'open');
+        return old;
+    end if;
+
+    if coalesce(old.status, 'open') is distinct from coalesce(new.status, 'open') then
+        update status_rollups set questions = questions - 1 where status = coalesce(old.status, 'open');
+        insert into status_rollups as r (status, questions)
+        values (coalesce(new.status, 'open'), 1)
+        on conflict (status) do update set questions = r.questions + 1;
+        -- Solved counts in the bucket of the update that solved it, until reopened
+        if old.status = 'solved' then
+            perform bump_activity_rollups(old.updated_at, p_questions_solved => -1);
+        end if;
+        if new.status = 'solved' then
+            perform bump_activity_rollups(new.updated_at, p_questions_solved => 1);
+        end if;
+    end if;
+    return new;
+end;
+$$;
+
+create or replace function rollups_on_answer()
+returns trigger
+language plpgsql
+as $$
+begin
+    perform bump_activity_rollups(new.created_at, p_answers_given => 1);
+    return new;
+end;
+$$;
+
+create or replace function rollups_on_user()
+returns trigger
+language plpgsql
+as $$
+begin
+    perform bump_activity_rollups(new.created_at, p_new_users => 1);
+    return new;
+end;
+$$;
+
+create or replace function rollups_on_response_time()
+returns trigger
+language plpgsql
+as $$
+begin
+    perform bump_activity_rollups(
+        new.created_at,
+        p_response_time_sum => coalesce(new.response_time_minutes, 0),
+        p_response_time_count => 1
+    );
+    return new;
+end;
+$$;
+
+drop trigger if exists rollups_after_question on questions;
+create trigger rollups_after_question
+    after insert or delete or update of status on questions
+    for each row execute function rollups_on_question();
+
+drop trigger if exists rollups_after_answer on answers;
+create trigger rollups_after_answer
+    after insert on answers
+    for each row execute function rollups_on_answer();
+
+drop trigger if exists rollups_after_user on users;
+create trigger rollups_after_user
+    after insert on users
+    for each row execute function rollups_on_user();
+
+drop trigger if exists rollups_after_response_time on response_times;
+create trigger rollups_after_response_time
+    after insert on response_times
+    for each row execute function rollups_on_response_time();
+
+-- Recompute every rollup table from raw history, one scan per raw table
+create or replace function rebuild_activity_rollups()
+returns void
+language sql
+as $$
+    -- "where true": pg_safeupdate rejects a bare delete coming through PostgREST
+    delete from hourly_rollups where true;
+    delete from daily_rollups where true;
+    delete from daily_language_rollups where true;
+    delete from status_rollups where true;
+
+    insert into hourly_rollups (bucket, questions_created, questions_solved, answers_given,
+                                new_users, response_time_sum, response_time_count)
+    select bucket, sum(qc), sum(qs), sum(ag), sum(nu), sum(rs), sum(rc)
+    from (
+        select date_trunc('hour', created_at at time zone 'utc') as bucket, 1 as qc, 0 as qs, 0 as ag, 0 as nu, 0 as rs, 0 as rc
+        from questions
+        union all
+        select date_trunc('hour', updated_at at time zone 'utc'), 0, 1, 0, 0, 0, 0 from questions where status = 'solved'
+        union all
+        select date_trunc('hour', created_at at time zone 'utc'), 0, 0, 1, 0, 0, 0 from answers
+        union all
+        select date_trunc('hour', created_at at time zone 'utc'), 0, 0, 0, 1, 0, 0 from users
+        union all
+        select date_trunc('hour', created_at at time zone 'utc'), 0, 0, 0, 0, coalesce(response_time_minutes, 0), 1
+        from response_times
+    ) events
+    where bucket is not null
+    group by bucket;
+
+    insert into daily_rollups (bucket, questions_created, questions_solved, answers_given,
+                               new_users, response_time_sum, response_time_count)
+    select bucket::date, sum(questions_created), sum(questions_solved), sum(answers_given),
+           sum(new_users), sum(response_time_sum), sum(response_time_count)
+    from hourly_rollups
+    group by bucket::date;
+
+    insert into daily_language_rollups (day, programming_language, questions)
+    select (created_at at time zone 'utc')::date, programming_language, count(*)
+    from questions
+    where created_at is not null
+    group by 1, 2;
+
+    insert into status_rollups (status, questions)
+    select coalesce(status, 'open'), count(*) from questions group by 1;
+$$;
+
+-- /대시보드 counters from the rollup tables:
+-- {"days": [{"bucket": "2024-01-01", "questions_created": 3, ...}, ...],
+--  "statuses": [{"status": "open", "questions": 2}, ...],
+--  "popular_languages_week": [{"programming_language": "Python", "count": 3}, ...],
+--  "total_users": 5, "total_faq": 2}
+create or replace function get_dashboard_stats()
+returns jsonb
+language sql
+stable
+as $$
+    select jsonb_build_object(
+        'days', coalesce((
+            select jsonb_agg(d order by d.bucket)
+            from daily_rollups d
+            where d.bucket >= (now() at time zone 'utc')::date - 6
+        ), '[]'::jsonb),
+        'statuses', coalesce((select jsonb_agg(s) from status_rollups s), '[]'::jsonb),
+        'popular_languages_week', coalesce((
+            select jsonb_agg(l)
+            from (
+                select programming_language, sum(questions) as count
+                from daily_language_rollups
+                where day >= (now() at time zone 'utc')::date - 6
+                group by programming_language
+                order by count desc
+                limit 3
+            ) l
+        ), '[]'::jsonb),
+        'total_users', (select count(*) from users),
+        'total_faq', (select count(*) from faq)
+    );
+$$;
+
+-- Backfill the history recorded before the triggers existed
+select rebuild_activity_rollups();
@@ -0,0 +1,13 @@
+-- Response-time percentiles without scanning response_times: one mergeable
+-- t-digest (database.quantiles.TDigest) per UTC day and admin, written by the bot.
+-- admin_id 0 holds response times recorded without an admin.
+-- Backfill existing history afterwards with: python -m database.rollups
+
+alter table response_times add column if not exists admin_id bigint;
+
+create table if not exists response_time_sketches (
+    day date not null,
+    admin_id bigint not null default 0,
+    sketch jsonb not null,
+    primary key (day, admin_id)
+);
@@ -0,0 +1,12 @@
+-- When each question got its first admin response and was first solved.
+-- Written once per question by database.response_tracker.ResponseTracker.
+
+alter table questions add column if not exists first_response_at timestamptz;
+alter table questions add column if not exists solved_at timestamptz;
+
+-- Existing history: the earliest answer is the first response, a solved
+-- question was solved at its last status change
+update questions q set first_response_at = a.first_answer
+from (select question_id, min(created_at) as first_answer from answers group by question_id) a
+where a.question_id = q.id and q.first_response_at is null;
+update questions set solved_at = updated_at where status = 'solved' and solved_at is null;
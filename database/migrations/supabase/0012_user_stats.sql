@@ -0,0 +1,165 @@
+-- Per-user question summary for /사용자통계, kept current by triggers on questions and
+-- response_times so user statistics are one primary key lookup.
+-- languages is a Space-Saving top-k ({language: count}, at most 8 entries): exact while a
+-- user has asked about 8 languages or fewer, afterwards a new language replaces the least
+-- asked one and inherits its count. rebuild_user_stats() recomputes everything from history.
+
+create table if not exists user_stats (
+    user_id bigint primary key,
+    total_questions integer not null default 0,
+    open_questions integer not null default 0,
+    in_progress_questions integer not null default 0,
+    solved_questions integer not null default 0,
+    closed_questions integer not null default 0,
+    first_question_at timestamptz,
+    last_question_at timestamptz,
+    languages jsonb not null default '{}'::jsonb,
+    response_time_sum bigint not null default 0,
+    response_time_count integer not null default 0
+);
+
+-- Count one more question in a language map, evicting the least asked entry when it is full
+create or replace function bump_user_language(p_languages jsonb, p_language text)
+returns jsonb
+language sql
+immutable
+as $$
+    select coalesce(jsonb_object_agg(key, value), '{}'::jsonb)
+    from (
+        select key, value::int + (key = p_language)::int as value
+        from jsonb_each_text(p_languages)
+        union all
+        select p_language, (
+            select case when count(*) >= 8 then min(value::int) else 0 end from jsonb_each_text(p_languages)
+        ) + 1
+        where not p_languages ? p_language
+        order by value desc
+        limit 8
+    ) l;
+$$;
+
+-- +1 / -1 for the status count columns of user_stats
+create or replace function bump_user_status(
+    p_user_id bigint, p_status text, p_amount integer, p_total integer default 0
+)
+returns void
+language sql
+as $$
+    update user_stats set
+        total_questions = total_questions + p_total,
+        open_questions = open_questions + case when p_status = 'open' then p_amount else 0 end,
+        in_progress_questions = in_progress_questions + case when p_status = 'in_progress' then p_amount else 0 end,
+        solved_questions = solved_questions + case when p_status = 'solved' then p_amount else 0 end,
+        closed_questions = closed_questions + case when p_status = 'closed' then p_amount else 0 end
+    where user_id = p_user_id;
+$$;
+
+create or replace function user_stats_on_question()
+returns trigger
+language plpgsql
+as $$
+begin
+    if tg_op = 'INSERT' then
+        insert into user_stats as s (user_id, first_question_at, last_question_at, languages)
+        values (new.user_id, new.created_at, new.created_at, jsonb_build_object(new.programming_language, 1))
+        on conflict (user_id) do update set
+            first_question_at = least(s.first_question_at, excluded.first_question_at),
+            last_question_at = greatest(s.last_question_at, excluded.last_question_at),
+            languages = bump_user_language(s.languages, new.programming_language);
+        perform bump_user_status(new.user_id, coalesce(new.status, 'open'), 1, 1);
+        return new;
+    end if;
+
+    -- First / last question dates are not narrowed on delete; a rebuild recomputes them
+    if tg_op = 'DELETE' then
+        perform bump_user_status(old.user_id, coalesce(old.status, 'open'), -1, -1);
+        update user_stats set languages = coalesce((
+            select jsonb_object_agg(key, value)
+            from (
+                select key, value::int - (key = old.programming_language)::int as value
+                from jsonb_each_text(languages)
+            ) l
+            where value > 0
+        ), '{}'::jsonb)
+        where user_id = old.user_id;
+        return old;
+    end if;
+
+    if coalesce(old.status, 'open') is distinct from coalesce(new.status, 'open') then
+        perform bump_user_status(new.user_id, coalesce(old.status, 'open'), -1);
+        perform bump_user_status(new.user_id, coalesce(new.status, 'open'), 1);
+    end if;
+    return new;
+end;
+$$;
+
+create or replace function user_stats_on_response_time()
+returns trigger
+language plpgsql
+as $$
+begin
+    update user_stats set
+        response_time_sum = response_time_sum + coalesce(new.response_time_minutes, 0),
+        response_time_count = response_time_count + 1
+    where user_id = (select user_id from questions where id = new.question_id);
+    return new;
+end;
+$$;
+
+drop trigger if exists user_stats_after_question on questions;
+create trigger user_stats_after_question
+    after insert or delete or update of status on questions
+    for each row execute function user_stats_on_question();
+
+drop trigger if exists user_stats_after_response_time on response_times;
+create trigger user_stats_after_response_time
+    after insert on response_times
+    for each row execute function user_stats_on_response_time();
+
+-- Recompute user_stats from raw history, one grouped scan per table
+create or replace function rebuild_user_stats()
+returns void
+language sql
+as $$
+    -- "where true": pg_safeupdate rejects a bare delete coming through PostgREST
+    delete from user_stats where true;
+
+    insert into user_stats (user_id, total_questions, open_questions, in_progress_questions, solved_questions,
+                            closed_questions, first_question_at, last_question_at, languages,
+                            response_time_sum, response_time_count)
+    select q.user_id, q.total, q.open, q.in_progress, q.solved, q.closed, q.first_at, q.last_at,
+           coalesce(l.languages, '{}'::jsonb), coalesce(r.total, 0), coalesce(r.count, 0)
+    from (
+        select user_id, count(*) as total,
+               count(*) filter (where coalesce(status, 'open') = 'open') as open,
+               count(*) filter (where status = 'in_progress') as in_progress,
+               count(*) filter (where status = 'solved') as solved,
+               count(*) filter (where status = 'closed') as closed,
+               min(created_at) as first_at, max(created_at) as last_at
+        from questions
+        group by user_id
+    ) q
+    left join (
+        select user_id, jsonb_object_agg(programming_language, questions) as languages
+        from (
+            select user_id, programming_language, count(*) as questions,
+                   row_number() over (partition by user_id order by count(*) desc, programming_language) as rank
+            from questions
+            group by user_id, programming_language
+        ) ranked
+        where rank <= 8
+        group by user_id
+    ) l on l.user_id = q.user_id
+    left join (
+        select rq.user_id, sum(coalesce(rt.response_time_minutes, 0)) as total, count(*) as count
+        from response_times rt
+        join questions rq on rq.id = rt.question_id
+        group by rq.user_id
+    ) r on r.user_id = q.user_id;
+$$;
+
+-- get_user_stats() now reads user_stats directly
+drop function if exists get_user_stats(bigint);
+
+-- Backfill the history recorded before the triggers existed
+select rebuild_user_stats();
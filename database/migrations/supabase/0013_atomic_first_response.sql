@@ -0,0 +1,24 @@
+-- Fill first_response_at and record the response time in one transaction, so a failed
+-- write can be retried without losing or duplicating the response time.
+-- Returns whether this call recorded the first response.
+create or replace function record_first_response(
+    p_question_id bigint,
+    p_at timestamptz,
+    p_minutes integer,
+    p_admin_id bigint default null
+)
+returns boolean
+language plpgsql
+as $$
+begin
+    update questions set first_response_at = p_at
+    where id = p_question_id and first_response_at is null;
+    if not found then
+        return false;
+    end if;
+
+    insert into response_times (question_id, response_time_minutes, admin_id)
+    values (p_question_id, p_minutes, p_admin_id);
+    return true;
+end;
+$$;
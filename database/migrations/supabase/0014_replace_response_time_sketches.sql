@@ -0,0 +1,14 @@
+-- Swap in rebuilt response time sketches in one transaction, so a failed rebuild
+-- keeps the old ones instead of leaving the table empty or half filled.
+-- p_sketches: [{"day": "2024-01-01", "admin_id": 0, "sketch": {...}}, ...]
+create or replace function replace_response_time_sketches(p_sketches jsonb)
+returns void
+language sql
+as $$
+    -- "where true": pg_safeupdate rejects a bare delete coming through PostgREST
+    delete from response_time_sketches where true;
+
+    insert into response_time_sketches (day, admin_id, sketch)
+    select (s->>'day')::date, (s->>'admin_id')::bigint, s->'sketch'
+    from jsonb_array_elements(p_sketches) s;
+$$;
@@ -0,0 +1,150 @@
+import json
+import math
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# Percentiles reported for response times
+RESPONSE_TIME_QUANTILES = (0.5, 0.9, 0.99)
+
+class TDigest:
+    """Mergeable streaming quantile sketch (merging t-digest)
+    
+    Keeps at most ~compression centroids; accuracy is best near the tails,
+    where the k1 scale function keeps centroids small.
+    """
+    
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._means: List[float] = []
+        self._weights: List[float] = []
+        self._buffer: List[tuple] = []
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def add(self, value: float, weight: int = 1):
+        """Add a value (no sorting until the buffer fills up)"""
+        self._buffer.append((float(value), weight))
+        self.count += weight
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if len(self._buffer) >= self.compression * 5:
+            self._compress()
+    
+    def merge(self, other: 'TDigest'):
+        """Fold another digest into this one"""
+        if not other.count:
+            return
+        other._compress()
+        self._buffer.extend(zip(other._means, other._weights))
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress()
+    
+    @classmethod
+    def merged(cls, digests: Iterable['TDigest'], compression: int = 100) -> 'TDigest':
+        """Merge any number of digests into a new one"""
+        result = cls(compression)
+        for digest in digests:
+            result.merge(digest)
+        return result
+    
+    def _k(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+    
+    def _q_limit(self, q: float) -> float:
+        k = self._k(q) + 1
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(2 * math.pi * k / self.compression) + 1) / 2
+    
+    def _compress(self):
+        """Sort the buffer into the centroids and merge neighbours within the size bound"""
+        if not self._buffer:
+            return
+        items = sorted(list(zip(self._means, self._weights)) + self._buffer)
+        self._buffer = []
+        total = self.count
+        
+        means, weights = [], []
+        mean, weight = items[0]
+        cumulative = 0
+        q_limit = self._q_limit(0.0)
+        for next_mean, next_weight in items[1:]:
+            if (cumulative + weight + next_weight) / total <= q_limit:
+                weight += next_weight
+                mean += (next_mean - mean) * next_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                cumulative += weight
+                q_limit = self._q_limit(cumulative / total)
+                mean, weight = next_mean, next_weight
+        means.append(mean)
+        weights.append(weight)
+        self._means, self._weights = means, weights
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile q (0..1), None when empty"""
+        if not self.count:
+            return None
+        self._compress()
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        
+        target = q * self.count
+        # Interpolate between centroid centres, anchored at min and max
+        previous_value, previous_position = self.min, 0.0
+        cumulative = 0.0
+        for mean, weight in zip(self._means, self._weights):
+            position = cumulative + weight / 2
+            if target < position:
+                span = position - previous_position
+                fraction = (target - previous_position) / span if span else 0.0
+                return previous_value + (mean - previous_value) * fraction
+            previous_value, previous_position = mean, position
+            cumulative += weight
+        span = self.count - previous_position
+        fraction = (target - previous_position) / span if span else 0.0
+        return previous_value + (self.max - previous_value) * fraction
+    
+    def summary(self, quantiles: Sequence[float] = RESPONSE_TIME_QUANTILES) -> Dict:
+        """{'count', 'min', 'max', 'p50', 'p90', 'p99'} for the requested quantiles"""
+        summary = {'count': self.count, 'min': self.min, 'max': self.max}
+        for q in quantiles:
+            summary[f'p{q * 100:g}'] = self.quantile(q)
+        return summary
+    
+    def to_dict(self) -> Dict:
+        """Plain dict for storage (jsonb on Supabase)"""
+        self._compress()
+        return {
+            'compression': self.compression,
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+            'means': [round(mean, 4) for mean in self._means],
+            'weights': self._weights,
+        }
+    
+    def to_json(self) -> str:
+        """Compact JSON for storage (TEXT on SQLite)"""
+        return json.dumps(self.to_dict(), separators=(',', ':'))
+    
+    @classmethod
+    def from_json(cls, data) -> 'TDigest':
+        """Load a digest stored by to_json or to_dict"""
+        if isinstance(data, str):
+            data = json.loads(data)
+        digest = cls(data.get('compression', 100))
+        digest.count = data['count']
+        digest.min = data['min']
+        digest.max = data['max']
+        digest._means = list(data['means'])
+        digest._weights = list(data['weights'])
+        return digest
@@ -0,0 +1,301 @@
+import functools
+import inspect
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+# Tag builders: (bound arguments, result) -> tags of a cached read
+def _faq_list_tags(args: Dict, result) -> List[str]:
+    return ['faq:list']
+
+def _user_questions_tags(args: Dict, result) -> List[str]:
+    tags = [f"user_questions:{args['user_id']}"]
+    if isinstance(result, list):
+        tags.extend(f"question:{question['id']}" for question in result)
+    return tags
+
+def _question_tags(args: Dict, result) -> List[str]:
+    tags = []
+    if 'question_id' in args:
+        tags.append(f"question:{args['question_id']}")
+    if 'thread_id' in args:
+        tags.append(f"thread:{args['thread_id']}")
+    if result is not None:
+        tags.append(f"question:{result['id']}")
+    return tags
+
+# Reads served from the cache, with the tags their entries carry. Writes made through
+# the proxy invalidate them (INVALIDATED_TAGS), and so do batches the manager writes
+# behind (FLUSH_INVALIDATED_TAGS); anything else is bounded by the TTL.
+CACHED_METHODS: Dict[str, Callable[[Dict, Any], List[str]]] = {
+    'get_user': lambda args, result: [f"user:{args['user_id']}"],
+    'get_question': _question_tags,
+    'get_question_by_thread': _question_tags,
+    'get_user_questions': _user_questions_tags,
+    'count_user_questions': _user_questions_tags,
+    'get_all_faq': _faq_list_tags,
+    'get_faq_by_id': lambda args, result: [f"faq:{args['faq_id']}"],
+    'search_faq': _faq_list_tags,
+    'search_faq_ranked': _faq_list_tags,
+    # Recomputed only after a write that moves the rollup counters
+    'get_trend_stats': lambda args, result: ['rollups'],
+}
+
+# Reads that always go to storage and leave the cache untouched
+UNCACHED_READS = frozenset({
+    'lookup_question_thread',
+    'search_questions',
+    'get_statistics_data',
+    'get_overview_stats',
+    'get_period_stats',
+    'get_user_stats',
+    'get_dashboard_stats',
+    'get_rollup_series',
+    'get_response_time_percentiles',
+    'get_admin_response_percentiles',
+})
+
+# Writes and the tags they invalidate; a trailing '*' matches a tag prefix
+INVALIDATED_TAGS: Dict[str, Callable[[Dict], List[str]]] = {
+    'add_user': lambda args: [f"user:{args['user_id']}"],
+    'create_question': lambda args: [f"user_questions:{args['user_id']}", f"thread:{args['thread_id']}", 'rollups'],
+    'update_question_status': lambda args: [f"question:{args['question_id']}", 'rollups'],
+    'add_faq': lambda args: ['faq:*'],
+    'update_faq': lambda args: [f"faq:{args['faq_id']}", 'faq:list'],
+    'delete_faq': lambda args: [f"faq:{args['faq_id']}", 'faq:list'],
+    'add_answer': lambda args: ['rollups'],
+    'record_response_time': lambda args: ['rollups'],
+    'rebuild_rollups': lambda args: ['rollups'],
+    # Writes no cached read depends on
+    'update_daily_stats': lambda args: [],
+    'initialize': lambda args: [],
+    'close': lambda args: [],
+}
+
+# Write-behind buffers of the manager that write without going through the proxy,
+# and the tags each flushed batch invalidates
+FLUSH_INVALIDATED_TAGS: Dict[str, Callable[[List], List[str]]] = {
+    # First responses insert response times, which move the rollup counters
+    'response_tracker': lambda events: ['rollups'],
+}
+
+class _Entry:
+    __slots__ = ('value', 'expires_at', 'tags')
+    
+    def __init__(self, value, expires_at: float, tags: tuple):
+        self.value = value
+        self.expires_at = expires_at
+        self.tags = tags
+
+class TTLCache:
+    """Bounded LRU cache with per-entry TTL and tag invalidation"""
+    
+    def __init__(self, max_entries: int = 1024, ttl: float = 60, clock: Callable[[], float] = time.monotonic):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: 'OrderedDict[Hashable, _Entry]' = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[Hashable]] = defaultdict(set)
+        # Bumped by every invalidation, lets callers drop results fetched before one
+        self.generation = 0
+        self._metrics = {
+            'hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0,
+        }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Hashable):
+        """Return (True, value) for a live entry, (False, None) otherwise"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._metrics['misses'] += 1
+            return False, None
+        if entry.expires_at <= self._clock():
+            self._remove(key)
+            self._metrics['expirations'] += 1
+            self._metrics['misses'] += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self._metrics['hits'] += 1
+        return True, entry.value
+    
+    def set(self, key: Hashable, value, tags: Iterable[str] = (), ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entries past max_entries"""
+        if key in self._entries:
+            self._remove(key)
+        tags = tuple(tags)
+        self._entries[key] = _Entry(value, self._clock() + (self.ttl if ttl is None else ttl), tags)
+        for tag in tags:
+            self._keys_by_tag[tag].add(key)
+        self._metrics['stores'] += 1
+        
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._metrics['evictions'] += 1
+    
+    def invalidate(self, *tags: str) -> int:
+        """Drop every entry carrying one of the tags ('faq:*' matches by prefix)"""
+        self.generation += 1
+        keys = set()
+        for tag in tags:
+            if tag.endswith('*'):
+                prefix = tag[:-1]
+                for known, tagged in self._keys_by_tag.items():
+                    if known.startswith(prefix):
+                        keys |= tagged
+            else:
+                keys |= self._keys_by_tag.get(tag, set())
+        for key in keys:
+            self._remove(key)
+        self._metrics['invalidations'] += len(keys)
+        return len(keys)
+    
+    def clear(self):
+        """Drop every entry"""
+        self.generation += 1
+        self._metrics['invalidations'] += len(self._entries)
+        self._entries.clear()
+        self._keys_by_tag.clear()
+    
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+    
+    def get_metrics(self) -> Dict:
+        """Get hit / miss / eviction counters and the hit ratio"""
+        metrics = dict(self._metrics)
+        lookups = metrics['hits'] + metrics['misses']
+        metrics['hit_ratio'] = metrics['hits'] / lookups if lookups else 0.0
+        metrics['size'] = len(self._entries)
+        metrics['max_entries'] = self.max_entries
+        return metrics
+
+class CachedManager:
+    """Database manager proxy serving hot reads from a TTLCache
+    
+    Cached reads return the same records to every caller, so results must be
+    treated as read-only (lists are copied). UNCACHED_READS pass straight
+    through. Writes listed in INVALIDATED_TAGS drop the entries tagged with
+    what they touch; any other coroutine method clears the whole cache. A read that overlaps an invalidation is returned
+    but not stored, so the cache never keeps a result fetched before a write.
+    Flushes of the manager's write-behind buffers (FLUSH_INVALIDATED_TAGS) invalidate
+    through a listener registered on the buffer.
+    """
+    
+    def __init__(self, manager, cache: TTLCache = None,
+                 methods: Dict[str, Callable] = CACHED_METHODS,
+                 invalidations: Dict[str, Callable] = INVALIDATED_TAGS,
+                 uncached: frozenset = UNCACHED_READS,
+                 flush_invalidations: Dict[str, Callable] = FLUSH_INVALIDATED_TAGS):
+        self._manager = manager
+        self._cache = cache if cache is not None else TTLCache()
+        self._methods = methods
+        self._invalidations = invalidations
+        self._uncached = uncached
+        self._reads_by_name: Dict[str, Dict[str, int]] = defaultdict(lambda: {'hits': 0, 'misses': 0})
+        
+        for attribute, tags_for in flush_invalidations.items():
+            buffer = getattr(manager, attribute, None)
+            if buffer is not None:
+                buffer.add_flush_listener(functools.partial(self._invalidate_flushed, tags_for))
+    
+    @property
+    def manager(self):
+        return self._manager
+    
+    @property
+    def cache(self) -> TTLCache:
+        return self._cache
+    
+    def __getattr__(self, name: str):
+        attribute = getattr(self._manager, name)
+        if not inspect.iscoroutinefunction(attribute):
+            return attribute
+        
+        if name in self._methods:
+            wrapper = self._cached(name, attribute, self._methods[name])
+        elif name in self._uncached:
+            wrapper = attribute
+        else:
+            wrapper = self._invalidating(attribute, self._invalidations.get(name))
+        # Cache the wrapper, later lookups no longer reach __getattr__
+        setattr(self, name, wrapper)
+        return wrapper
+    
+    def _cached(self, name: str, method, tags_for: Callable):
+        signature = inspect.signature(method)
+        
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (name, tuple(bound.arguments.items()))
+            try:
+                hash(key)
+            except TypeError:
+                # Unhashable arguments, always read through
+                return await method(*args, **kwargs)
+            
+            found, value = self._cache.get(key)
+            counters = self._reads_by_name[name]
+            if found:
+                counters['hits'] += 1
+                return list(value) if isinstance(value, list) else value
+            counters['misses'] += 1
+            
+            generation = self._cache.generation
+            value = await method(*args, **kwargs)
+            if self._cache.generation == generation:
+                self._cache.set(key, value, tags_for(bound.arguments, value))
+            return list(value) if isinstance(value, list) else value
+        return call
+    
+    def _invalidating(self, method, tags_for: Optional[Callable]):
+        signature = inspect.signature(method)
+        
+        def invalidate(args, kwargs):
+            if tags_for is None:
+                self._cache.clear()
+                return
+            bound = signature.bind(*args, **kwargs)
+            tags = tags_for(bound.arguments)
+            if tags:
+                self._cache.invalidate(*tags)
+        
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            # Before, so reads racing the write are not stored, and after, for reads started meanwhile
+            invalidate(args, kwargs)
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                invalidate(args, kwargs)
+        return call
+    
+    def _invalidate_flushed(self, tags_for: Callable, batch: List):
+        tags = tags_for(batch)
+        if tags:
+            self._cache.invalidate(*tags)
+    
+    def get_cache_metrics(self) -> Dict:
+        """Get cache counters, overall and per cached method"""
+        metrics = self._cache.get_metrics()
+        metrics['reads_by_method'] = {
+            name: dict(counters, hit_ratio=counters['hits'] / (counters['hits'] + counters['misses']))
+            for name, counters in self._reads_by_name.items()
+        }
+        return metrics
@@ -0,0 +1,144 @@
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# Record shapes: every column, or only what list views display
+FULL = 'full'
+SUMMARY = 'summary'
+
+class Record(Mapping):
+    """Base for slotted row records with read-only dict-style access
+    
+    Cogs keep using record['field'] / record.get('field'), while each row
+    costs one slotted object instead of a per-row dict.
+    """
+    __slots__ = ()
+    
+    # Filled in by @record
+    _fields: tuple = ()
+    _converters: Dict[str, Any] = {}
+    # Columns of the summary shape, empty when the type has no slimmer shape
+    _summary_fields: tuple = ()
+    
+    def __getitem__(self, key: str):
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self):
+        return iter(self._fields)
+    
+    def __len__(self) -> int:
+        return len(self._fields)
+    
+    @classmethod
+    def columns(cls, shape: str = FULL) -> tuple:
+        """Columns to fetch for a record shape ('full' or 'summary')"""
+        if shape == SUMMARY:
+            return cls._summary_fields or cls._fields
+        if shape != FULL:
+            raise ValueError(f"Unknown record shape: {shape}")
+        return cls._fields
+    
+    @classmethod
+    def from_values(cls, names: Sequence[str], values: Sequence):
+        """Build a record from column names and row values (missing columns are None)"""
+        return cls._builder(tuple(names))(values)
+    
+    @classmethod
+    def _builder(cls, names: tuple):
+        """Resolve a column list to a function turning a row into a record"""
+        if names == cls._fields and not cls._converters:
+            return lambda values: cls(*values)
+        
+        columns = [(index, name, cls._converters.get(name)) for index, name in enumerate(names) if name in cls._fields]
+        
+        def build(values):
+            data = {}
+            for index, name, convert in columns:
+                value = values[index]
+                data[name] = convert(value) if convert is not None and value is not None else value
+            return cls(**data)
+        return build
+    
+    @classmethod
+    def from_mapping(cls, data: Dict):
+        """Build a record from a dict row (e.g. a PostgREST response)"""
+        return cls.from_values(tuple(data.keys()), tuple(data.values()))
+
+def record(cls):
+    """Turn a class into a frozen, slotted record type"""
+    cls = dataclass(frozen=True, slots=True)(cls)
+    cls._fields = tuple(f.name for f in fields(cls))
+    return cls
+
+@record
+class UserRecord(Record):
+    user_id: int = None
+    username: str = None
+    display_name: Optional[str] = None
+    is_admin: bool = None
+    created_at: str = None
+    
+    _converters = {'is_admin': bool}
+
+@record
+class QuestionRecord(Record):
+    id: int = None
+    user_id: int = None
+    thread_id: int = None
+    title: str = None
+    os: str = None
+    programming_language: str = None
+    error_message: str = None
+    purpose: str = None
+    code_snippet: Optional[str] = None
+    log_files: Optional[str] = None
+    screenshot_url: Optional[str] = None
+    attempted_solutions: Optional[str] = None
+    status: str = None
+    created_at: str = None
+    updated_at: str = None
+    
+    # Without code_snippet / log_files / error_message / attempted_solutions
+    _summary_fields = ('id', 'user_id', 'thread_id', 'title', 'programming_language', 'status', 'created_at')
+
+@record
+class AnswerRecord(Record):
+    id: int = None
+    question_id: int = None
+    admin_id: int = None
+    answer_text: str = None
+    is_solution: bool = None
+    created_at: str = None
+    
+    _converters = {'is_solution': bool}
+
+@record
+class FaqRecord(Record):
+    id: int = None
+    question: str = None
+    answer: str = None
+    keywords: Optional[str] = None
+    created_by: Optional[int] = None
+    created_at: str = None
+
+@lru_cache(maxsize=None)
+def row_factory(record_cls):
+    """sqlite3/aiosqlite cursor row_factory producing record_cls instances"""
+    # The column list is fixed per cursor, so resolve it once per description
+    last = [None, None]
+    
+    def factory(cursor, row):
+        description = cursor.description
+        if description is not last[0]:
+            last[0] = description
+            last[1] = record_cls._builder(tuple(column[0] for column in description))
+        return last[1](row)
+    
+    return factory
+
+def records_from_dicts(record_cls, rows: Optional[Iterable[Dict]]) -> List:
+    """Convert dict rows (PostgREST responses) into records"""
+    return [record_cls.from_mapping(row) for row in rows or []]
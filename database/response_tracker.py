@@ -0,0 +1,159 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from utils.logger import setup_logger
+
+# Milestones recorded once per question
+FIRST_RESPONSE = 'first_response'
+SOLVED = 'solved'
+
+class ResponseEvent(NamedTuple):
+    """A question milestone waiting to be written"""
+    kind: str
+    question_id: int
+    at: datetime
+    minutes: int
+    admin_id: Optional[int] = None
+
+def as_utc(value) -> Optional[datetime]:
+    """Parse a DB timestamp (SQLite UTC text, ISO with offset, or datetime) as an aware UTC datetime"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        # CURRENT_TIMESTAMP is UTC without an offset
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def format_utc(value: datetime) -> str:
+    """UTC timestamp in the CURRENT_TIMESTAMP format"""
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+class ResponseTracker:
+    """First-response / solution tracking for open questions, written behind in batches
+    
+    Questions still waiting for a milestone live in memory, so checking a
+    thread message costs two dict lookups and no I/O.
+    """
+    
+    def __init__(self, flush_callback: Callable[[List[ResponseEvent]], Awaitable[None]],
+                 flush_interval: float = 5.0):
+        self.flush_callback = flush_callback
+        self.flush_interval = flush_interval
+        self.logger = setup_logger()
+        
+        # {question_id: created_at} of questions without a first response / solution yet
+        self._awaiting_response: Dict[int, datetime] = {}
+        self._awaiting_solution: Dict[int, datetime] = {}
+        self._pending: List[ResponseEvent] = []
+        self._flush_listeners: List[Callable[[List[ResponseEvent]], None]] = []
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        
+        self._metrics = {
+            'first_responses': 0,
+            'solutions': 0,
+            'flushes': 0,
+            'failed_flushes': 0,
+        }
+    
+    def load(self, rows: Iterable[Tuple[int, object, bool, bool]]):
+        """Bulk load (question_id, created_at, awaiting_response, awaiting_solution) rows"""
+        self._awaiting_response = {}
+        self._awaiting_solution = {}
+        for question_id, created_at, awaiting_response, awaiting_solution in rows:
+            created_at = as_utc(created_at)
+            if created_at is None:
+                continue
+            if awaiting_response:
+                self._awaiting_response[question_id] = created_at
+            if awaiting_solution:
+                self._awaiting_solution[question_id] = created_at
+    
+    def track(self, question_id: int, created_at: datetime = None):
+        """Start tracking a newly created question"""
+        created_at = as_utc(created_at) or datetime.now(timezone.utc)
+        self._awaiting_response[question_id] = created_at
+        self._awaiting_solution[question_id] = created_at
+    
+    def is_awaiting_response(self, question_id: int) -> bool:
+        """Whether a question has not had its first response yet"""
+        return question_id in self._awaiting_response
+    
+    def first_response(self, question_id: int, admin_id: int, at: datetime = None) -> bool:
+        """Record the first response to a question; later calls are no-ops"""
+        created_at = self._awaiting_response.pop(question_id, None)
+        if created_at is None:
+            return False
+        at = as_utc(at) or datetime.now(timezone.utc)
+        minutes = max(0, int((at - created_at).total_seconds() // 60))
+        self._pending.append(ResponseEvent(FIRST_RESPONSE, question_id, at, minutes, admin_id))
+        self._metrics['first_responses'] += 1
+        return True
+    
+    def solved(self, question_id: int, at: datetime = None) -> bool:
+        """Record when a question was first solved; later calls are no-ops"""
+        created_at = self._awaiting_solution.pop(question_id, None)
+        if created_at is None:
+            return False
+        at = as_utc(at) or datetime.now(timezone.utc)
+        minutes = max(0, int((at - created_at).total_seconds() // 60))
+        self._pending.append(ResponseEvent(SOLVED, question_id, at, minutes))
+        self._metrics['solutions'] += 1
+        return True
+    
+    def add_flush_listener(self, listener: Callable[[List[ResponseEvent]], None]):
+        """Call listener(events) after every batch written, e.g. to drop cached reads it changed"""
+        self._flush_listeners.append(listener)
+    
+    async def start(self):
+        """Start the periodic flush task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name='response-tracker-flush')
+    
+    async def stop(self):
+        """Stop the flush task and write out everything still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+    
+    async def _run(self):
+        """Flush pending milestones every flush_interval seconds"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+    
+    async def flush(self):
+        """Write pending milestones to the backend in one batch"""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            
+            events = self._pending
+            self._pending = []
+            try:
+                await self.flush_callback(events)
+                self._metrics['flushes'] += 1
+            except Exception as e:
+                # Writes only fill empty columns, so the whole batch can be retried
+                self._metrics['failed_flushes'] += 1
+                self.logger.error(f"Error flushing response milestones: {e}")
+                self._pending = events + self._pending
+                return
+            
+            for listener in self._flush_listeners:
+                listener(events)
+    
+    def get_metrics(self) -> Dict:
+        """Get milestone and flush counters"""
+        metrics = dict(self._metrics)
+        metrics['awaiting_response'] = len(self._awaiting_response)
+        metrics['awaiting_solution'] = len(self._awaiting_solution)
+        metrics['pending'] = len(self._pending)
+        return metrics
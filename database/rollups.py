@@ -0,0 +1,205 @@
+"""Rebuild the dashboard rollup tables, user summaries and response time sketches from raw history
+
+Triggers keep the rollups and user summaries current and the bot keeps the sketches current; a
+rebuild is only needed after editing raw rows by hand, restoring a backup or
+applying the Supabase sketch migration. Stop the bot first, its unflushed
+sketches would otherwise be counted twice.
+
+Usage: python -m database.rollups
+"""
+import asyncio
+from typing import Dict, Tuple
+from database.statistics import ROLLUP_COLUMNS
+from database.quantiles import TDigest
+from database.stats_aggregator import UNKNOWN_ADMIN
+
+# Schema versions creating the rollup / sketch tables, backfilled right after they are applied
+SQLITE_ROLLUPS_MIGRATION = 5
+SQLITE_SKETCHES_MIGRATION = 6
+SQLITE_USER_STATS_MIGRATION = 8
+
+# Languages kept per user in user_stats (the LIMIT in the user_stats triggers)
+USER_TOP_LANGUAGES = 8
+
+# One scan of questions grouped by (hour, language) feeds both the hourly question
+# counts and the per-day language counts; every other table is read once.
+SQLITE_REBUILD_STATEMENTS = (
+    'DELETE FROM hourly_rollups',
+    'DELETE FROM daily_rollups',
+    'DELETE FROM daily_language_rollups',
+    'DELETE FROM status_rollups',
+    '''
+    CREATE TEMP TABLE question_hours AS
+    SELECT strftime('%Y-%m-%d %H:00:00', created_at) AS bucket, programming_language, COUNT(*) AS questions
+    FROM questions
+    WHERE created_at IS NOT NULL
+    GROUP BY bucket, programming_language
+    ''',
+    f'''
+    INSERT INTO hourly_rollups (bucket, {', '.join(ROLLUP_COLUMNS)})
+    SELECT bucket, SUM(qc), SUM(qs), SUM(ag), SUM(nu), SUM(rs), SUM(rc) FROM (
+        SELECT bucket, questions AS qc, 0 AS qs, 0 AS ag, 0 AS nu, 0 AS rs, 0 AS rc FROM temp.question_hours
+        UNION ALL
+        SELECT strftime('%Y-%m-%d %H:00:00', updated_at), 0, 1, 0, 0, 0, 0 FROM questions WHERE status = 'solved'
+        UNION ALL
+        SELECT strftime('%Y-%m-%d %H:00:00', created_at), 0, 0, 1, 0, 0, 0 FROM answers
+        UNION ALL
+        SELECT strftime('%Y-%m-%d %H:00:00', created_at), 0, 0, 0, 1, 0, 0 FROM users
+        UNION ALL
+        SELECT strftime('%Y-%m-%d %H:00:00', created_at), 0, 0, 0, 0, COALESCE(response_time_minutes, 0), 1
+        FROM response_times
+    )
+    WHERE bucket IS NOT NULL
+    GROUP BY bucket
+    ''',
+    f'''
+    INSERT INTO daily_rollups (bucket, {', '.join(ROLLUP_COLUMNS)})
+    SELECT substr(bucket, 1, 10), {', '.join(f'SUM({column})' for column in ROLLUP_COLUMNS)}
+    FROM hourly_rollups
+    GROUP BY substr(bucket, 1, 10)
+    ''',
+    '''
+    INSERT INTO daily_language_rollups (day, programming_language, questions)
+    SELECT substr(bucket, 1, 10), programming_language, SUM(questions)
+    FROM temp.question_hours
+    GROUP BY substr(bucket, 1, 10), programming_language
+    ''',
+    '''
+    INSERT INTO status_rollups (status, questions)
+    SELECT COALESCE(status, 'open'), COUNT(*) FROM questions GROUP BY COALESCE(status, 'open')
+    ''',
+    'DROP TABLE temp.question_hours',
+)
+
+async def _in_transaction(db, fill):
+    """Run fill(db) as one transaction on an autocommit (isolation_level=None) connection"""
+    await db.execute('BEGIN')
+    try:
+        await fill(db)
+        await db.execute('COMMIT')
+    except Exception:
+        await db.rollback()
+        raise
+
+async def fill_sqlite_rollups(db):
+    """Recompute every SQLite rollup table inside the caller's transaction"""
+    for statement in SQLITE_REBUILD_STATEMENTS:
+        await db.execute(statement)
+
+async def rebuild_sqlite_rollups(db):
+    """Recompute every SQLite rollup table in one transaction
+    
+    db must be an autocommit (isolation_level=None) aiosqlite connection.
+    """
+    await _in_transaction(db, fill_sqlite_rollups)
+
+# Status counts, date range and average response time in one grouped scan per table;
+# languages keep each user's most asked USER_TOP_LANGUAGES, like the triggers.
+SQLITE_USER_STATS_REBUILD_STATEMENTS = (
+    'DELETE FROM user_stats',
+    f'''
+    INSERT INTO user_stats (user_id, total_questions, open_questions, in_progress_questions, solved_questions,
+                            closed_questions, first_question_at, last_question_at, languages,
+                            response_time_sum, response_time_count)
+    SELECT q.user_id, q.total, q.open, q.in_progress, q.solved, q.closed, q.first_at, q.last_at,
+           COALESCE(l.languages, '{{}}'), COALESCE(r.total, 0), COALESCE(r.count, 0)
+    FROM (
+        SELECT user_id, COUNT(*) AS total,
+               SUM(COALESCE(status, 'open') = 'open') AS open,
+               SUM(COALESCE(status, 'open') = 'in_progress') AS in_progress,
+               SUM(COALESCE(status, 'open') = 'solved') AS solved,
+               SUM(COALESCE(status, 'open') = 'closed') AS closed,
+               MIN(created_at) AS first_at, MAX(created_at) AS last_at
+        FROM questions
+        GROUP BY user_id
+    ) q
+    LEFT JOIN (
+        SELECT user_id, json_group_object(programming_language, questions) AS languages
+        FROM (
+            SELECT user_id, programming_language, COUNT(*) AS questions,
+                   ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY COUNT(*) DESC, programming_language) AS rank
+            FROM questions
+            GROUP BY user_id, programming_language
+        )
+        WHERE rank <= {USER_TOP_LANGUAGES}
+        GROUP BY user_id
+    ) l ON l.user_id = q.user_id
+    LEFT JOIN (
+        SELECT q.user_id, SUM(COALESCE(rt.response_time_minutes, 0)) AS total, COUNT(*) AS count
+        FROM response_times rt
+        JOIN questions q ON q.id = rt.question_id
+        GROUP BY q.user_id
+    ) r ON r.user_id = q.user_id
+    ''',
+)
+
+async def fill_sqlite_user_stats(db):
+    """Recompute the user_stats summaries inside the caller's transaction"""
+    for statement in SQLITE_USER_STATS_REBUILD_STATEMENTS:
+        await db.execute(statement)
+
+async def rebuild_sqlite_user_stats(db):
+    """Recompute the user_stats summaries in one transaction
+    
+    db must be an autocommit (isolation_level=None) aiosqlite connection.
+    """
+    await _in_transaction(db, fill_sqlite_user_stats)
+
+def fold_sketch(sketches: Dict[Tuple[str, int], TDigest], day: str, admin_id: int, minutes: float):
+    """Add one response_times row to the digest of its (day, admin_id)"""
+    if day is None or minutes is None:
+        return
+    key = (day, admin_id or UNKNOWN_ADMIN)
+    digest = sketches.get(key)
+    if digest is None:
+        digest = sketches[key] = TDigest()
+    digest.add(minutes)
+
+async def fill_sqlite_sketches(db):
+    """Recompute the response time sketches with one scan of response_times, inside the caller's transaction"""
+    sketches = {}
+    async with db.execute('''
+        SELECT date(created_at), admin_id, response_time_minutes FROM response_times
+    ''') as cursor:
+        async for day, admin_id, minutes in cursor:
+            fold_sketch(sketches, day, admin_id, minutes)
+    
+    await db.execute('DELETE FROM response_time_sketches')
+    await db.executemany(
+        'INSERT INTO response_time_sketches (day, admin_id, sketch) VALUES (?, ?, ?)',
+        [(day, admin_id, digest.to_json()) for (day, admin_id), digest in sketches.items()]
+    )
+
+async def rebuild_sqlite_sketches(db):
+    """Recompute the response time sketches in one transaction
+    
+    db must be an autocommit (isolation_level=None) aiosqlite connection.
+    """
+    await _in_transaction(db, fill_sqlite_sketches)
+
+# Backfills run by apply_sqlite_migrations in the transaction of the migration creating the tables
+SQLITE_BACKFILLS = {
+    SQLITE_ROLLUPS_MIGRATION: fill_sqlite_rollups,
+    SQLITE_SKETCHES_MIGRATION: fill_sqlite_sketches,
+    SQLITE_USER_STATS_MIGRATION: fill_sqlite_user_stats,
+}
+
+async def main():
+    from config.config import Config
+    
+    if Config.DATABASE_TYPE == 'supabase':
+        from database.supabase_manager import SupabaseManager
+        manager = SupabaseManager()
+    else:
+        from database.database_manager import DatabaseManager
+        manager = DatabaseManager()
+    
+    await manager.initialize()
+    try:
+        await manager.rebuild_rollups()
+        print(f"Rebuilt the {Config.DATABASE_TYPE} rollup tables, user summaries and response time sketches")
+    finally:
+        await manager.close()
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,143 @@
+import os
+import re
+import sys
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Set
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+# Migration files are named NNNN_description.sql
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d{4})_(\w+)\.sql$')
+
+# Optional first-line header naming SQLite features a migration needs, e.g. "-- requires: fts5"
+REQUIRES_PATTERN = re.compile(r'^--\s*requires:\s*([\w, ]+)$', re.MULTILINE)
+
+# Statements that only succeed when the SQLite build has a feature
+SQLITE_FEATURE_PROBES = {
+    'fts5': 'CREATE VIRTUAL TABLE temp.feature_probe_fts5 USING fts5(x)',
+}
+
+SQLITE_SCHEMA_VERSION_TABLE = '''
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+SUPABASE_SCHEMA_VERSION_TABLE = '''create table if not exists schema_version (
+    version integer primary key,
+    name text not null,
+    applied_at timestamptz default now()
+);'''
+
+class Migration(NamedTuple):
+    """A single ordered schema migration step"""
+    version: int
+    name: str
+    sql: str
+    requires: tuple = ()
+
+def load_migrations(backend: str) -> List[Migration]:
+    """Load the ordered migration steps for a backend ('sqlite' or 'supabase')"""
+    directory = os.path.join(MIGRATIONS_DIR, backend)
+    migrations = []
+    for filename in os.listdir(directory):
+        match = MIGRATION_FILE_PATTERN.match(filename)
+        if not match:
+            continue
+        with open(os.path.join(directory, filename), encoding='utf-8') as f:
+            sql = f.read()
+        requires = REQUIRES_PATTERN.match(sql)
+        features = tuple(name.strip() for name in requires.group(1).split(',') if name.strip()) if requires else ()
+        migrations.append(Migration(int(match.group(1)), match.group(2), sql, features))
+    
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+async def get_applied_versions(db) -> Set[int]:
+    """Get the versions already applied to a SQLite database"""
+    await db.execute(SQLITE_SCHEMA_VERSION_TABLE)
+    async with db.execute('SELECT version FROM schema_version') as cursor:
+        return {row[0] for row in await cursor.fetchall()}
+
+async def sqlite_supports(db, feature: str) -> bool:
+    """Check whether the SQLite build behind db has an optional feature"""
+    probe = SQLITE_FEATURE_PROBES.get(feature)
+    if probe is None:
+        raise ValueError(f"Unknown SQLite feature: {feature}")
+    try:
+        await db.execute(probe)
+    except Exception:
+        return False
+    await db.execute('DROP TABLE IF EXISTS temp.feature_probe_' + feature)
+    return True
+
+async def apply_sqlite_migrations(db, logger,
+                                  backfills: Dict[int, Callable[[object], Awaitable[None]]] = None) -> List[int]:
+    """Apply pending SQLite migrations in order, one transaction each
+    
+    db must be an autocommit (isolation_level=None) aiosqlite connection.
+    Migrations needing a feature the SQLite build lacks are skipped without
+    being recorded, so they apply once the build supports them.
+    backfills maps a version to a coroutine filling its new tables from existing
+    rows; it runs in the migration's transaction, before the version is recorded.
+    """
+    backfills = backfills or {}
+    applied = await get_applied_versions(db)
+    newly_applied = []
+    supported = {}
+    
+    for migration in load_migrations('sqlite'):
+        if migration.version in applied:
+            continue
+        
+        missing = []
+        for feature in migration.requires:
+            if feature not in supported:
+                supported[feature] = await sqlite_supports(db, feature)
+            if not supported[feature]:
+                missing.append(feature)
+        if missing:
+            logger.warning(
+                f"Skipping migration {migration.version:04d}_{migration.name}: "
+                f"SQLite build lacks {', '.join(missing)}"
+            )
+            continue
+        
+        logger.info(f"Applying migration {migration.version:04d}_{migration.name}")
+        try:
+            # executescript leaves the transaction open for the backfill and the version row
+            await db.executescript(f'BEGIN;\n{migration.sql}\n')
+            if migration.version in backfills:
+                await backfills[migration.version](db)
+            await db.execute(
+                'INSERT INTO schema_version (version, name) VALUES (?, ?)', (migration.version, migration.name)
+            )
+            await db.execute('COMMIT')
+        except Exception:
+            await db.rollback()
+            raise
+        newly_applied.append(migration.version)
+    
+    return newly_applied
+
+def render_supabase_sql(after_version: int = 0) -> str:
+    """Render pending Supabase migrations as one script for the SQL editor"""
+    parts = [SUPABASE_SCHEMA_VERSION_TABLE]
+    for migration in load_migrations('supabase'):
+        if migration.version <= after_version:
+            continue
+        parts.append(
+            f'-- {migration.version:04d}_{migration.name}\n'
+            f'{migration.sql.strip()}\n'
+            f"insert into schema_version (version, name) values ({migration.version}, '{migration.name}') "
+            'on conflict (version) do nothing;'
+        )
+    return '\n\n'.join(parts) + '\n'
+
+if __name__ == '__main__':
+    # python -m database.schema_migrations [after_version] > migration.sql
+    print(render_supabase_sql(int(sys.argv[1]) if len(sys.argv) > 1 else 0))
@@ -0,0 +1,132 @@
+import asyncio
+import functools
+import inspect
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Hashable
+
+# Read methods shared by concurrent identical calls (same name and arguments)
+COALESCED_METHODS = frozenset({
+    'get_user',
+    'get_question',
+    'get_question_by_thread',
+    'lookup_question_thread',
+    'get_user_questions',
+    'count_user_questions',
+    'search_questions',
+    'search_faq',
+    'search_faq_ranked',
+    'get_all_faq',
+    'get_faq_by_id',
+    'get_statistics_data',
+    'get_overview_stats',
+    'get_period_stats',
+    'get_user_stats',
+    'get_dashboard_stats',
+    'get_rollup_series',
+    'get_trend_stats',
+    'get_response_time_percentiles',
+    'get_admin_response_percentiles',
+})
+
+class SingleFlight:
+    """Runs at most one call per key at a time, concurrent callers share its result"""
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self._metrics = {
+            'calls': 0,
+            'executions': 0,
+            'deduplicated': 0,
+        }
+        self._deduplicated_by_name: Dict[str, int] = defaultdict(int)
+    
+    async def do(self, key: Hashable, func: Callable[[], Awaitable]):
+        """Await func(), or the identical call already in flight for key"""
+        self._metrics['calls'] += 1
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._calls[key] = future
+            future.add_done_callback(functools.partial(self._discard, key))
+            self._metrics['executions'] += 1
+        else:
+            self._metrics['deduplicated'] += 1
+            self._deduplicated_by_name[key[0]] += 1
+        
+        # Shielded, one caller being cancelled must not cancel the others
+        return await asyncio.shield(future)
+    
+    def _discard(self, key: Hashable, future: asyncio.Future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            # Mark the exception retrieved even if every caller was cancelled
+            future.exception()
+    
+    def forget(self):
+        """Let later calls start fresh instead of joining calls already in flight"""
+        self._calls.clear()
+    
+    def get_metrics(self) -> Dict:
+        """Get call / execution / deduplication counters"""
+        metrics = dict(self._metrics)
+        metrics['in_flight'] = len(self._calls)
+        metrics['deduplicated_by_method'] = dict(self._deduplicated_by_name)
+        return metrics
+
+class SingleFlightManager:
+    """Database manager proxy coalescing concurrent identical reads
+    
+    Coalesced reads return the same object to every caller sharing the call, so
+    results must be treated as read-only. Any other coroutine method (writes) makes
+    later reads start a new call, before and after it runs, so a read issued after
+    a write never receives a result fetched before it.
+    """
+    
+    def __init__(self, manager, methods: frozenset = COALESCED_METHODS):
+        self._manager = manager
+        self._methods = methods
+        self._flight = SingleFlight()
+    
+    @property
+    def manager(self):
+        return self._manager
+    
+    def __getattr__(self, name: str):
+        attribute = getattr(self._manager, name)
+        if not inspect.iscoroutinefunction(attribute):
+            return attribute
+        
+        if name in self._methods:
+            wrapper = self._coalesced(name, attribute)
+        else:
+            wrapper = self._invalidating(attribute)
+        # Cache the wrapper, later lookups no longer reach __getattr__
+        setattr(self, name, wrapper)
+        return wrapper
+    
+    def _coalesced(self, name: str, method):
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                # Unhashable arguments, run the call on its own
+                return await method(*args, **kwargs)
+            return await self._flight.do(key, lambda: method(*args, **kwargs))
+        return call
+    
+    def _invalidating(self, method):
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            self._flight.forget()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                self._flight.forget()
+        return call
+    
+    def get_single_flight_metrics(self) -> Dict:
+        """Get read coalescing counters"""
+        return self._flight.get_metrics()
@@ -0,0 +1,146 @@
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from database.quantiles import TDigest
+
+# Statistics periods and their length in days (None = all history)
+PERIOD_DAYS = {
+    'week': 7,
+    'month': 30,
+    'quarter': 90,
+    'all': None,
+}
+
+# Question states still waiting for a solution
+ACTIVE_STATUSES = ('open', 'in_progress')
+
+def period_start(days: Optional[int]) -> str:
+    """First UTC date (ISO) inside a window of the last `days` days, or the epoch for all history"""
+    if days is None:
+        return '1970-01-01'
+    return (datetime.now(timezone.utc).date() - timedelta(days=days)).isoformat()
+
+# Rollup table counters, in column order
+ROLLUP_COLUMNS = (
+    'questions_created',
+    'questions_solved',
+    'answers_given',
+    'new_users',
+    'response_time_sum',
+    'response_time_count',
+)
+
+# Every integer counter of get_overview_stats()
+OVERVIEW_COUNTERS = (
+    'total_questions',
+    'solved_questions',
+    'in_progress_questions',
+    'open_questions',
+    'recent_questions',
+    'recent_solved',
+    'active_users',
+    'total_users',
+    'new_users_week',
+    'total_answers',
+    'recent_answers',
+    'total_faq',
+    'faq_searches_week',
+)
+
+def overview_totals(group_rows: Iterable[Sequence], top: int = 5) -> Dict:
+    """Question totals by status and the most asked languages from (status, language, count) groups"""
+    totals = {'total_questions': 0, 'solved_questions': 0, 'in_progress_questions': 0, 'open_questions': 0}
+    languages: Dict[str, int] = {}
+    for status, language, count in group_rows:
+        status = status or 'open'
+        totals['total_questions'] += count
+        if f'{status}_questions' in totals:
+            totals[f'{status}_questions'] += count
+        languages[language] = languages.get(language, 0) + count
+    totals['popular_languages'] = sorted(languages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return totals
+
+def language_counts(rows: Iterable[Dict]) -> List[Tuple[str, int]]:
+    """[(language, count)] from RPC rows of {'programming_language', 'count'}"""
+    return [(row['programming_language'], row['count']) for row in rows or []]
+
+# user_stats columns read for get_user_stats()
+USER_STATS_COLUMNS = (
+    'total_questions',
+    'open_questions',
+    'in_progress_questions',
+    'solved_questions',
+    'closed_questions',
+    'first_question_at',
+    'last_question_at',
+    'languages',
+    'response_time_sum',
+    'response_time_count',
+)
+
+def top_languages(languages, top: int = 3) -> List[str]:
+    """Most asked languages of a user_stats languages map (JSON text on SQLite, jsonb on Supabase)"""
+    if isinstance(languages, str):
+        languages = json.loads(languages)
+    ranked = sorted((languages or {}).items(), key=lambda item: item[1], reverse=True)
+    return [language for language, _ in ranked[:top]]
+
+def user_stats_summary(row: Optional[Dict]) -> Dict:
+    """get_user_stats() result from a user_stats row (None for a user without questions)"""
+    row = row or {}
+    response_count = row.get('response_time_count') or 0
+    return {
+        'total_questions': row.get('total_questions') or 0,
+        'solved_questions': row.get('solved_questions') or 0,
+        'active_questions': sum(row.get(f'{status}_questions') or 0 for status in ACTIVE_STATUSES),
+        'favorite_languages': top_languages(row.get('languages')),
+        'first_question_at': row.get('first_question_at'),
+        'last_question_at': row.get('last_question_at'),
+        'avg_response_time': row['response_time_sum'] / response_count if response_count else None,
+    }
+
+def dashboard_totals(day_rows: Iterable[Sequence], status_rows: Iterable[Sequence]) -> Dict:
+    """Today / this week counters from daily rollup rows (bucket, *ROLLUP_COLUMNS) and status counts"""
+    today = datetime.now(timezone.utc).date().isoformat()
+    week = dict.fromkeys(ROLLUP_COLUMNS, 0)
+    stats = {'today_questions': 0, 'today_answers': 0, 'today_solved': 0, 'today_new_users': 0}
+    for bucket, *counters in day_rows:
+        counters = dict(zip(week, counters))
+        for name, value in counters.items():
+            week[name] += value
+        if str(bucket)[:10] == today:
+            stats.update(
+                today_questions=counters['questions_created'],
+                today_answers=counters['answers_given'],
+                today_solved=counters['questions_solved'],
+                today_new_users=counters['new_users'],
+            )
+    
+    stats.update(
+        week_questions=week['questions_created'],
+        week_solved=week['questions_solved'],
+        week_answers=week['answers_given'],
+        avg_response_time=(week['response_time_sum'] / week['response_time_count']
+                           if week['response_time_count'] else None),
+    )
+    
+    statuses = {status or 'open': count for status, count in status_rows}
+    stats.update(
+        total_questions=sum(statuses.values()),
+        solved_questions=statuses.get('solved', 0),
+        in_progress_questions=statuses.get('in_progress', 0),
+        open_questions=statuses.get('open', 0),
+    )
+    return stats
+
+def response_time_summary(sketches: Iterable[TDigest]) -> Dict:
+    """count / min / max / p50 / p90 / p99 of response times merged from per-day digests"""
+    return TDigest.merged(sketches).summary()
+
+def admin_response_summaries(sketches: Iterable[Tuple[int, TDigest]]) -> List[Tuple[int, Dict]]:
+    """Per-admin response time summaries from (admin_id, digest) pairs, busiest admin first"""
+    by_admin: Dict[int, TDigest] = {}
+    for admin_id, digest in sketches:
+        by_admin.setdefault(admin_id, TDigest()).merge(digest)
+    summaries = [(admin_id, digest.summary()) for admin_id, digest in by_admin.items()]
+    return sorted(summaries, key=lambda item: item[1]['count'], reverse=True)
@@ -0,0 +1,203 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from utils.logger import setup_logger
+from database.quantiles import TDigest
+
+# Counter columns of the daily_stats table
+DAILY_STAT_COLUMNS = (
+    'questions_created',
+    'questions_solved',
+    'answers_given',
+    'new_users',
+    'faq_searches',
+)
+
+# admin_id of response times recorded without one
+UNKNOWN_ADMIN = 0
+
+class DailyStatsAggregator:
+    """Write-behind aggregator for daily_stats counters"""
+    
+    def __init__(self, flush_callback: Callable[[Dict[str, Dict[str, int]]], Awaitable[None]],
+                 flush_interval: float = 5.0):
+        self.flush_callback = flush_callback
+        self.flush_interval = flush_interval
+        self.logger = setup_logger()
+        
+        # {date: {column: delta}}
+        self._pending: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        
+        self._metrics = {
+            'increments': 0,
+            'flushes': 0,
+            'failed_flushes': 0,
+        }
+    
+    def increment(self, stat_type: str, amount: int = 1):
+        """Add to today's (UTC) counter (no I/O)"""
+        if stat_type not in DAILY_STAT_COLUMNS:
+            raise ValueError(f"Unknown daily stat: {stat_type}")
+        
+        # UTC days, like the rollup buckets and response time sketches
+        today = datetime.now(timezone.utc).date().isoformat()
+        self._pending[today][stat_type] += amount
+        self._metrics['increments'] += 1
+    
+    async def start(self):
+        """Start the periodic flush task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name='daily-stats-flush')
+    
+    async def stop(self):
+        """Stop the flush task and write out everything still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+    
+    async def _run(self):
+        """Flush coalesced deltas every flush_interval seconds"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+    
+    async def flush(self):
+        """Write pending deltas to the backend"""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            
+            # Swap out the buffer so increments during the flush are kept
+            pending = self._pending
+            self._pending = defaultdict(lambda: defaultdict(int))
+            deltas = {
+                date: {column: value for column, value in counters.items() if value}
+                for date, counters in pending.items()
+            }
+            deltas = {date: counters for date, counters in deltas.items() if counters}
+            if not deltas:
+                return
+            
+            try:
+                await self.flush_callback(deltas)
+                self._metrics['flushes'] += 1
+            except Exception as e:
+                # Merge the deltas back so nothing is lost, retry on next flush
+                self._metrics['failed_flushes'] += 1
+                self.logger.error(f"Error flushing daily stats: {e}")
+                for date, counters in deltas.items():
+                    for column, value in counters.items():
+                        self._pending[date][column] += value
+    
+    def get_metrics(self) -> Dict:
+        """Get increment and flush counters"""
+        metrics = dict(self._metrics)
+        metrics['pending_dates'] = len(self._pending)
+        return metrics
+
+class ResponseTimeSketches:
+    """Write-behind per-day, per-admin response time digests"""
+    
+    def __init__(self, flush_callback: Callable[[Dict[Tuple[str, int], TDigest]], Awaitable[None]],
+                 flush_interval: float = 5.0):
+        self.flush_callback = flush_callback
+        self.flush_interval = flush_interval
+        self.logger = setup_logger()
+        
+        # {(day, admin_id): digest of values not yet merged into storage}
+        self._pending: Dict[Tuple[str, int], TDigest] = {}
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        
+        self._metrics = {
+            'values': 0,
+            'flushes': 0,
+            'failed_flushes': 0,
+        }
+    
+    def add(self, minutes: float, admin_id: Optional[int] = None):
+        """Add a response time to today's (UTC) digest (no I/O)"""
+        key = (datetime.now(timezone.utc).date().isoformat(), admin_id or UNKNOWN_ADMIN)
+        digest = self._pending.get(key)
+        if digest is None:
+            digest = self._pending[key] = TDigest()
+        digest.add(minutes)
+        self._metrics['values'] += 1
+    
+    def pending(self, start_day: str, admin_id: Optional[int] = None) -> List[Tuple[int, TDigest]]:
+        """Unflushed (admin_id, digest) pairs from start_day on, so reads include them"""
+        return [
+            (admin, digest) for (day, admin), digest in self._pending.items()
+            if day >= start_day and (admin_id is None or admin == admin_id)
+        ]
+    
+    async def start(self):
+        """Start the periodic flush task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name='response-time-sketch-flush')
+    
+    async def stop(self):
+        """Stop the flush task and write out everything still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+    
+    async def _run(self):
+        """Flush pending digests every flush_interval seconds"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+    
+    async def flush(self):
+        """Merge pending digests into the stored ones"""
+        async with self._flush_lock:
+            await self._flush_pending()
+    
+    async def _flush_pending(self):
+        if not self._pending:
+            return
+        
+        pending = self._pending
+        self._pending = {}
+        try:
+            await self.flush_callback(pending)
+            self._metrics['flushes'] += 1
+        except Exception as e:
+            # Merge the digests back so nothing is lost, retry on next flush
+            self._metrics['failed_flushes'] += 1
+            self.logger.error(f"Error flushing response time sketches: {e}")
+            for key, digest in pending.items():
+                if key in self._pending:
+                    digest.merge(self._pending[key])
+                self._pending[key] = digest
+    
+    async def rebuild(self, rebuild_callback: Callable[[], Awaitable[None]]):
+        """Replace the stored digests by a rebuild from raw history
+        
+        Pending digests are written first and no flush runs until the rebuild is
+        done, so a flush can neither be wiped by it nor land on top of it.
+        """
+        async with self._flush_lock:
+            await self._flush_pending()
+            if self._pending:
+                raise RuntimeError("Pending response time sketches could not be flushed")
+            await rebuild_callback()
+    
+    def get_metrics(self) -> Dict:
+        """Get value and flush counters"""
+        metrics = dict(self._metrics)
+        metrics['pending_sketches'] = len(self._pending)
+        return metrics
@@ -1,83 +1,309 @@
+import asyncio
 import os
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from typing import Optional, Dict, List
 from utils.logger import setup_logger
-from supabase import create_client, Client
+from supabase import create_client
+from database.stats_aggregator import DailyStatsAggregator, ResponseTimeSketches, DAILY_STAT_COLUMNS
+from database.schema_migrations import load_migrations
+from database.records import UserRecord, QuestionRecord, FaqRecord, records_from_dicts, FULL, SUMMARY
+from database.thread_index import ThreadIndex, QuestionThread
+from database.text_search import search_terms, contains_score, FAQ_SEARCH_COLUMNS, QUESTION_SEARCH_COLUMNS
+from database.statistics import (
+    ACTIVE_STATUSES, OVERVIEW_COUNTERS, ROLLUP_COLUMNS, USER_STATS_COLUMNS, admin_response_summaries,
+    dashboard_totals, language_counts, overview_totals, period_start, response_time_summary, user_stats_summary
+)
+from database.quantiles import TDigest
+from database.response_tracker import ResponseTracker, ResponseEvent, FIRST_RESPONSE
+from database.trends import TREND_HISTORY_DAYS, compute_trends
+from database.rollups import fold_sketch
+
+# PostgREST returns at most this many rows per request by default
+PAGE_SIZE = 1000
+
+# PostgREST error codes for a function missing from the schema cache
+MISSING_FUNCTION_CODES = ('PGRST202', 404, '404')
+
+class RpcUnavailable(Exception):
+    """The Postgres function is not part of the deployed schema"""
 
 class SupabaseManager:
     """Supabase client manager for InventOnBot"""
     
-    def __init__(self):
+    def __init__(self, use_async_client: bool = True):
         from config.config import Config
         self.supabase_url = Config.SUPABASE_URL
         self.supabase_key = Config.SUPABASE_ANON_KEY
+        self.timeout = Config.SUPABASE_TIMEOUT
+        self.max_connections = Config.SUPABASE_MAX_CONNECTIONS
+        self.executor_workers = Config.SUPABASE_EXECUTOR_WORKERS
+        self.use_async_client = use_async_client
         self.logger = setup_logger()
-        self.client: Client = None
+        self.client = None
+        self._http_client = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._missing_rpcs = set()
+        self._requests = 0
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._request_seconds = 0.0
+        self.thread_index = ThreadIndex()
+        self.stats_aggregator = DailyStatsAggregator(
+            self._apply_daily_stats_deltas,
+            flush_interval=Config.STATS_FLUSH_INTERVAL
+        )
+        self.response_time_sketches = ResponseTimeSketches(
+            self._merge_response_time_sketches,
+            flush_interval=Config.STATS_FLUSH_INTERVAL
+        )
+        self.response_tracker = ResponseTracker(
+            self._write_response_events,
+            flush_interval=Config.STATS_FLUSH_INTERVAL
+        )
         
     async def initialize(self):
         """Initialize Supabase client"""
         try:
             # Create Supabase client
-            self.client = create_client(self.supabase_url, self.supabase_key)
+            await self.connect()
             
             # Test connection and create tables if needed
             await self._create_tables()
+            await self._load_thread_index()
+            await self._load_response_tracker()
+            await self.stats_aggregator.start()
+            await self.response_time_sketches.start()
+            await self.response_tracker.start()
             self.logger.info("Supabase client initialized successfully")
             
         except Exception as e:
             self.logger.error(f"Supabase client initialization failed: {e}")
             raise
     
+    async def connect(self):
+        """Create the async client on a shared keep-alive connection pool, or a sync one behind an executor"""
+        if self.use_async_client:
+            try:
+                import httpx
+                from supabase import acreate_client, AsyncClientOptions
+            except ImportError:
+                self.logger.warning("Async Supabase client unavailable, using the sync client in worker threads")
+            else:
+                self._http_client = httpx.AsyncClient(
+                    timeout=httpx.Timeout(self.timeout),
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections
+                    )
+                )
+                try:
+                    options = AsyncClientOptions(
+                        httpx_client=self._http_client,
+                        postgrest_client_timeout=self.timeout
+                    )
+                except TypeError:
+                    # supabase-py releases without the httpx_client option
+                    self.logger.warning(
+                        "Installed supabase package cannot share an httpx client, "
+                        "using the sync client in worker threads"
+                    )
+                    await self._http_client.aclose()
+                    self._http_client = None
+                else:
+                    self.client = await acreate_client(self.supabase_url, self.supabase_key, options=options)
+                    return
+        
+        from supabase import ClientOptions
+        self._executor = ThreadPoolExecutor(max_workers=self.executor_workers, thread_name_prefix='supabase')
+        self.client = create_client(
+            self.supabase_url,
+            self.supabase_key,
+            options=ClientOptions(postgrest_client_timeout=self.timeout)
+        )
+    
+    async def _execute(self, builder):
+        """Run a PostgREST request without blocking the event loop"""
+        self._requests += 1
+        self._in_flight += 1
+        self._max_in_flight = max(self._max_in_flight, self._in_flight)
+        started = time.perf_counter()
+        try:
+            if self._executor is None:
+                return await builder.execute()
+            # Sync client: the blocking HTTP round-trip runs in a bounded worker pool
+            return await asyncio.get_running_loop().run_in_executor(self._executor, builder.execute)
+        finally:
+            self._in_flight -= 1
+            self._request_seconds += time.perf_counter() - started
+    
+    async def _rpc(self, function: str, params: Dict):
+        """Call a Postgres function, remembering functions the schema does not have
+        
+        Callers fall back to plain table requests on failure; once a function is
+        known to be missing the fallback runs without a wasted round-trip.
+        """
+        if function in self._missing_rpcs:
+            raise RpcUnavailable(function)
+        try:
+            return await self._execute(self.client.rpc(function, params))
+        except Exception as e:
+            if getattr(e, 'code', None) in MISSING_FUNCTION_CODES:
+                self._missing_rpcs.add(function)
+                self.logger.warning(f"Supabase function {function} is missing, apply the pending migrations")
+                raise RpcUnavailable(function) from e
+            raise
+    
+    async def _iter_pages(self, build_query):
+        """Yield the rows of a (stably ordered) query one PAGE_SIZE page at a time"""
+        start = 0
+        while True:
+            # Builders are single-use, so build_query() creates a fresh one per page
+            result = await self._execute(build_query().range(start, start + PAGE_SIZE - 1))
+            page = result.data or []
+            if page:
+                yield page
+            if len(page) < PAGE_SIZE:
+                break
+            start += PAGE_SIZE
+    
+    # Bulk table access (utils/migrate_to_supabase.py)
+    async def upsert_rows(self, table: str, rows: List[Dict], on_conflict: str):
+        """Upsert rows into a table without returning them"""
+        from postgrest.types import ReturnMethod
+        await self._execute(
+            self.client.table(table).upsert(rows, on_conflict=on_conflict, returning=ReturnMethod.minimal)
+        )
+    
+    async def count_rows(self, table: str, column: str = 'id') -> int:
+        """Exact row count of a table"""
+        result = await self._execute(self.client.table(table).select(column, count='exact', head=True))
+        return result.count or 0
+    
+    async def iter_rows(self, table: str, columns: List[str], order: str):
+        """Yield all rows of a table one page at a time, ordered by a unique column"""
+        async for page in self._iter_pages(
+            lambda: self.client.table(table).select(','.join(columns)).order(order)
+        ):
+            yield page
+    
+    def get_client_metrics(self) -> Dict:
+        """Get PostgREST request counters and latency"""
+        return {
+            'mode': 'executor' if self._executor is not None else 'async',
+            'requests': self._requests,
+            'in_flight': self._in_flight,
+            'max_in_flight': self._max_in_flight,
+            'avg_request_ms': self._request_seconds / self._requests * 1000 if self._requests else 0.0,
+        }
+    
     async def _create_tables(self):
-        """Create database tables using Supabase client"""
+        """Check that the schema exists and is up to date"""
         try:
-            # Note: In Supabase, tables are usually created via SQL editor or migrations
-            # This is a simplified approach for the bot
-            
-            # Check if tables exist by trying to select from them
-            # If they don't exist, we'll get an error and can create them
+            # Note: In Supabase, tables are created via the SQL editor, the anon key cannot run DDL
             try:
-                # Test if users table exists
-                self.client.table('users').select('*').limit(1).execute()
+                result = await self._execute(self.client.table('schema_version').select('version'))
+                applied = {row['version'] for row in result.data or []}
             except Exception:
-                # Table doesn't exist, create it via RPC or direct SQL
-                self.logger.info("Tables need to be created. Please create them manually in Supabase Dashboard.")
-                self.logger.info("Or use the SQL editor with the provided SQL schema.")
+                applied = set()
+            
+            pending = [m for m in load_migrations('supabase') if m.version not in applied]
+            if pending:
+                after_version = max(applied) if applied else 0
+                self.logger.warning(
+                    f"Supabase schema is missing migrations: "
+                    f"{', '.join(f'{m.version:04d}_{m.name}' for m in pending)}"
+                )
+                self.logger.warning(
+                    f"Run the output of 'python -m database.schema_migrations {after_version}' "
+                    f"in the Supabase SQL editor."
+                )
                 
         except Exception as e:
-            self.logger.error(f"Error checking/creating tables: {e}")
+            self.logger.error(f"Error checking schema version: {e}")
     
-    async def add_user(self, user_id: int, username: str, display_name: str = None, is_admin: bool = False):
-        """Add or update user"""
+    async def _load_thread_index(self):
+        """Bulk load the question thread index, one page at a time"""
         try:
-            # Check if user exists
-            existing_user = self.client.table('users').select('*').eq('user_id', user_id).execute()
+            rows = []
+            async for page in self._iter_pages(
+                lambda: self.client.table('questions').select('thread_id,id,user_id').not_.is_('thread_id', 'null')
+                .order('id')
+            ):
+                rows.extend((row['thread_id'], row['id'], row['user_id']) for row in page)
             
-            user_data = {
-                'user_id': user_id,
-                'username': username,
-                'display_name': display_name,
-                'is_admin': is_admin
-            }
+            self.thread_index.load(rows)
+            self.logger.info(f"Loaded {len(self.thread_index)} question threads into the thread index")
+        except Exception as e:
+            # Without the index every lookup falls back to the database
+            self.logger.error(f"Error loading thread index: {e}")
+    
+    async def _load_response_tracker(self):
+        """Load the open questions still waiting for a first response or a solution"""
+        try:
+            rows = []
+            async for page in self._iter_pages(
+                lambda: self.client.table('questions').select('id,created_at,first_response_at,solved_at')
+                .in_('status', list(ACTIVE_STATUSES)).order('id')
+            ):
+                rows.extend(
+                    (row['id'], row['created_at'], row['first_response_at'] is None, row['solved_at'] is None)
+                    for row in page
+                )
+            self.response_tracker.load(rows)
+        except Exception as e:
+            # Responses to questions asked before this start are then not tracked
+            self.logger.error(f"Error loading response tracker: {e}")
+    
+    async def add_user(self, user_id: int, username: str, display_name: str = None, is_admin: bool = False) -> bool:
+        """Add or update user, returns True when the user is new"""
+        try:
+            try:
+                # One atomic round-trip that also reports whether the row was inserted
+                result = await self._rpc('upsert_user', {
+                    'p_user_id': user_id,
+                    'p_username': username,
+                    'p_display_name': display_name,
+                    'p_is_admin': is_admin
+                })
+                inserted = bool(result.data)
+            except RpcUnavailable:
+                inserted = await self._insert_or_update_user(user_id, username, display_name, is_admin)
             
-            if existing_user.data:
-                # Update existing user
-                result = self.client.table('users').update(user_data).eq('user_id', user_id).execute()
-            else:
-                # Insert new user
-                result = self.client.table('users').insert(user_data).execute()
+            if inserted:
                 # Update daily stats for new user
                 await self.update_daily_stats('new_users')
+            return inserted
                 
         except Exception as e:
             self.logger.error(f"Error adding user {user_id}: {e}")
             raise
     
-    async def get_user(self, user_id: int) -> Optional[Dict]:
+    async def _insert_or_update_user(self, user_id: int, username: str, display_name: str, is_admin: bool) -> bool:
+        """Fallback for upsert_user: new users cost one round-trip, existing users two"""
+        user_data = {
+            'user_id': user_id,
+            'username': username,
+            'display_name': display_name,
+            'is_admin': is_admin
+        }
+        
+        # Duplicates are ignored and not returned, so empty data means the user exists
+        result = await self._execute(
+            self.client.table('users').upsert(user_data, on_conflict='user_id', ignore_duplicates=True)
+        )
+        if result.data:
+            return True
+        
+        await self._execute(self.client.table('users').update(user_data).eq('user_id', user_id))
+        return False
+    
+    async def get_user(self, user_id: int) -> Optional[UserRecord]:
         """Get user by ID"""
         try:
-            result = self.client.table('users').select('*').eq('user_id', user_id).execute()
-            return result.data[0] if result.data else None
+            result = await self._execute(self.client.table('users').select('*').eq('user_id', user_id))
+            return UserRecord.from_mapping(result.data[0]) if result.data else None
         except Exception as e:
             self.logger.error(f"Error getting user {user_id}: {e}")
             return None
@@ -103,8 +329,10 @@ class SupabaseManager:
                 'status': 'open'
             }
             
-            result = self.client.table('questions').insert(question_data).execute()
+            result = await self._execute(self.client.table('questions').insert(question_data))
             if result.data:
+                self.thread_index.add(thread_id, result.data[0]['id'], user_id)
+                self.response_tracker.track(result.data[0]['id'], result.data[0].get('created_at'))
                 return result.data[0]['id']
             raise Exception("Failed to create question")
             
@@ -112,20 +340,24 @@ class SupabaseManager:
             self.logger.error(f"Error creating question: {e}")
             raise
     
-    async def get_question(self, question_id: int) -> Optional[Dict]:
-        """Get question by ID"""
+    async def get_question(self, question_id: int, shape: str = FULL) -> Optional[QuestionRecord]:
+        """Get question by ID ('summary' shape skips the long text columns)"""
         try:
-            result = self.client.table('questions').select('*').eq('id', question_id).execute()
-            return result.data[0] if result.data else None
+            result = await self._execute(
+                self.client.table('questions').select(','.join(QuestionRecord.columns(shape))).eq('id', question_id)
+            )
+            return QuestionRecord.from_mapping(result.data[0]) if result.data else None
         except Exception as e:
             self.logger.error(f"Error getting question {question_id}: {e}")
             return None
     
-    async def get_question_by_thread(self, thread_id: int) -> Optional[Dict]:
+    async def get_question_by_thread(self, thread_id: int) -> Optional[QuestionRecord]:
         """Get question by thread ID"""
+        if self.thread_index.loaded and self.thread_index.lookup(thread_id) is None:
+            return None  # Not a question thread
         try:
-            result = self.client.table('questions').select('*').eq('thread_id', thread_id).execute()
-            return result.data[0] if result.data else None
+            result = await self._execute(self.client.table('questions').select('*').eq('thread_id', thread_id))
+            return QuestionRecord.from_mapping(result.data[0]) if result.data else None
         except Exception as e:
             self.logger.error(f"Error getting question by thread {thread_id}: {e}")
             return None
@@ -135,12 +367,14 @@ class SupabaseManager:
         try:
             update_data = {
                 'status': status,
-                'updated_at': datetime.now().isoformat()
+                'updated_at': datetime.now(timezone.utc).isoformat()
             }
             
-            result = self.client.table('questions').update(update_data).eq('id', question_id).execute()
+            result = await self._execute(self.client.table('questions').update(update_data).eq('id', question_id))
             if not result.data:
                 raise Exception(f"Question {question_id} not found")
+            if status == 'solved':
+                self.response_tracker.solved(question_id)
                 
         except Exception as e:
             self.logger.error(f"Error updating question status: {e}")
@@ -156,8 +390,9 @@ class SupabaseManager:
                 'is_solution': is_solution
             }
             
-            result = self.client.table('answers').insert(answer_data).execute()
+            result = await self._execute(self.client.table('answers').insert(answer_data))
             if result.data:
+                self.response_tracker.first_response(question_id, admin_id)
                 return result.data[0]['id']
             raise Exception("Failed to add answer")
             
@@ -165,15 +400,78 @@ class SupabaseManager:
             self.logger.error(f"Error adding answer: {e}")
             raise
     
-    async def get_user_questions(self, user_id: int) -> List[Dict]:
-        """Get all questions for a user"""
+    async def get_user_questions(self, user_id: int, limit: int = None, shape: str = FULL) -> List[QuestionRecord]:
+        """Get a user's questions, newest first (all of them unless limit is given)"""
         try:
-            result = self.client.table('questions').select('*').eq('user_id', user_id).order('created_at', desc=True).execute()
-            return result.data or []
+            query = self.client.table('questions').select(','.join(QuestionRecord.columns(shape))).eq(
+                'user_id', user_id
+            ).order('created_at', desc=True)
+            if limit is not None:
+                query = query.range(0, limit - 1)
+            result = await self._execute(query)
+            return records_from_dicts(QuestionRecord, result.data)
         except Exception as e:
             self.logger.error(f"Error getting user questions: {e}")
             return []
     
+    async def count_user_questions(self, user_id: int) -> int:
+        """Count a user's questions (HEAD request, no rows transferred)"""
+        try:
+            result = await self._execute(
+                self.client.table('questions').select('id', count='exact', head=True).eq('user_id', user_id)
+            )
+            return result.count or 0
+        except Exception as e:
+            self.logger.error(f"Error counting user questions: {e}")
+            return 0
+    
+    async def search_questions(self, query: str, search_type: str = 'all', limit: int = 20) -> List[QuestionRecord]:
+        """Search questions for any word of a query, most matching words first (summary shape)"""
+        terms = search_terms(query)
+        if not terms:
+            return []
+        
+        try:
+            columns = QUESTION_SEARCH_COLUMNS[search_type]
+            # Terms are \w+ only, so they are safe inside the or= filter
+            filters = ','.join(f'{column}.ilike.%{term}%' for term in terms for column in columns)
+            # The searched columns are needed for ranking, the rest of the row is not
+            selected = ','.join(dict.fromkeys(QuestionRecord.columns(SUMMARY) + tuple(columns)))
+            result = await self._execute(
+                self.client.table('questions').select(selected).or_(filters).order('created_at', desc=True).limit(PAGE_SIZE)
+            )
+            rows = sorted(result.data or [], key=lambda row: contains_score(row, columns, terms), reverse=True)
+            return records_from_dicts(QuestionRecord, rows[:limit])
+        except Exception as e:
+            self.logger.error(f"Error searching questions: {e}")
+            return []
+    
+    async def lookup_question_thread(self, thread_id: int) -> Optional[QuestionThread]:
+        """Get the question id / author of a thread, from the thread index when loaded"""
+        if self.thread_index.loaded:
+            return self.thread_index.lookup(thread_id)
+        question = await self.get_question_by_thread(thread_id)
+        return QuestionThread(question['id'], question['user_id']) if question else None
+    
+    def awaiting_first_response(self, thread_id: int) -> Optional[QuestionThread]:
+        """Question of a thread still waiting for its first response, else None (no I/O)"""
+        if not self.thread_index.loaded or thread_id not in self.thread_index:
+            return None
+        question = self.thread_index.lookup(thread_id)
+        return question if self.response_tracker.is_awaiting_response(question.question_id) else None
+    
+    def record_first_response(self, question_id: int, admin_id: int, at: datetime = None) -> bool:
+        """Note an admin's first response to a question (written behind, once per question)"""
+        return self.response_tracker.first_response(question_id, admin_id, at)
+    
+    def get_response_tracker_metrics(self) -> Dict:
+        """Get first-response / solution tracking counters"""
+        return self.response_tracker.get_metrics()
+    
+    def get_thread_index_metrics(self) -> Dict:
+        """Get thread index size and hit/miss counters"""
+        return self.thread_index.get_metrics()
+    
     # FAQ related methods
     async def add_faq(self, question: str, answer: str, keywords: str = None, created_by: int = None) -> int:
         """Add a new FAQ"""
@@ -185,7 +483,7 @@ class SupabaseManager:
                 'created_by': created_by
             }
             
-            result = self.client.table('faq').insert(faq_data).execute()
+            result = await self._execute(self.client.table('faq').insert(faq_data))
             if result.data:
                 return result.data[0]['id']
             raise Exception("Failed to add FAQ")
@@ -194,32 +492,58 @@ class SupabaseManager:
             self.logger.error(f"Error adding FAQ: {e}")
             raise
     
-    async def search_faq(self, keyword: str) -> List[Dict]:
+    async def search_faq(self, keyword: str) -> List[FaqRecord]:
         """Search FAQ by keyword"""
         try:
             # Supabase supports text search
-            result = self.client.table('faq').select('*').or_(
-                f'question.ilike.%{keyword}%,answer.ilike.%{keyword}%,keywords.ilike.%{keyword}%'
-            ).order('created_at', desc=True).execute()
-            return result.data or []
+            result = await self._execute(
+                self.client.table('faq').select('*').or_(
+                    f'question.ilike.%{keyword}%,answer.ilike.%{keyword}%,keywords.ilike.%{keyword}%'
+                ).order('created_at', desc=True)
+            )
+            return records_from_dicts(FaqRecord, result.data)
         except Exception as e:
             self.logger.error(f"Error searching FAQ: {e}")
             return []
     
-    async def get_all_faq(self) -> List[Dict]:
+    async def search_faq_ranked(self, query: str, limit: int = 5) -> List[FaqRecord]:
+        """Search FAQ for any word of a free-text query, best matches first"""
+        terms = search_terms(query)
+        if not terms:
+            return []
+        
+        try:
+            try:
+                result = await self._rpc('search_faq_ranked', {'terms': terms, 'max_results': limit})
+                return records_from_dicts(FaqRecord, result.data)
+            except RpcUnavailable:
+                pass
+            
+            # Terms are \w+ only, so they are safe inside the or= filter
+            filters = ','.join(f'{column}.ilike.%{term}%' for term in terms for column in FAQ_SEARCH_COLUMNS)
+            result = await self._execute(self.client.table('faq').select('*').or_(filters))
+            rows = sorted(
+                result.data or [], key=lambda row: contains_score(row, FAQ_SEARCH_COLUMNS, terms), reverse=True
+            )
+            return records_from_dicts(FaqRecord, rows[:limit])
+        except Exception as e:
+            self.logger.error(f"Error searching FAQ: {e}")
+            return []
+    
+    async def get_all_faq(self) -> List[FaqRecord]:
         """Get all FAQs"""
         try:
-            result = self.client.table('faq').select('*').order('created_at', desc=True).execute()
-            return result.data or []
+            result = await self._execute(self.client.table('faq').select('*').order('created_at', desc=True))
+            return records_from_dicts(FaqRecord, result.data)
         except Exception as e:
             self.logger.error(f"Error getting all FAQ: {e}")
             return []
     
-    async def get_faq_by_id(self, faq_id: int) -> Optional[Dict]:
+    async def get_faq_by_id(self, faq_id: int) -> Optional[FaqRecord]:
         """Get FAQ by ID"""
         try:
-            result = self.client.table('faq').select('*').eq('id', faq_id).execute()
-            return result.data[0] if result.data else None
+            result = await self._execute(self.client.table('faq').select('*').eq('id', faq_id))
+            return FaqRecord.from_mapping(result.data[0]) if result.data else None
         except Exception as e:
             self.logger.error(f"Error getting FAQ {faq_id}: {e}")
             return None
@@ -227,7 +551,7 @@ class SupabaseManager:
     async def delete_faq(self, faq_id: int):
         """Delete FAQ by ID"""
         try:
-            result = self.client.table('faq').delete().eq('id', faq_id).execute()
+            result = await self._execute(self.client.table('faq').delete().eq('id', faq_id))
             if not result.data:
                 raise Exception(f"FAQ {faq_id} not found")
         except Exception as e:
@@ -246,7 +570,7 @@ class SupabaseManager:
                 update_data['keywords'] = keywords
             
             if update_data:
-                result = self.client.table('faq').update(update_data).eq('id', faq_id).execute()
+                result = await self._execute(self.client.table('faq').update(update_data).eq('id', faq_id))
                 if not result.data:
                     raise Exception(f"FAQ {faq_id} not found")
         except Exception as e:
@@ -255,85 +579,152 @@ class SupabaseManager:
     
     # Statistics tracking methods
     async def update_daily_stats(self, stat_type: str, increment: int = 1):
-        """Update daily statistics"""
+        """Update daily statistics (buffered, flushed periodically)"""
+        self.stats_aggregator.increment(stat_type, increment)
+    
+    async def _apply_daily_stats_deltas(self, deltas: Dict[str, Dict[str, int]]):
+        """Apply coalesced daily stats deltas with one RPC call"""
+        payload = [{'date': date, **counters} for date, counters in deltas.items()]
         try:
-            today = datetime.now().date().isoformat()
-            
-            # Check if today's stats exist
-            existing = self.client.table('daily_stats').select('*').eq('date', today).execute()
+            await self._rpc('apply_daily_stats_deltas', {'deltas': payload})
+        except RpcUnavailable:
+            # Schemas without the batch function: one atomic increment per counter
+            for date, counters in deltas.items():
+                for column, value in counters.items():
+                    if value:
+                        await self._rpc('increment_daily_stat', {
+                            'stat_date': date,
+                            'stat_name': column,
+                            'amount': value
+                        })
+    
+    def get_stats_metrics(self) -> Dict:
+        """Get daily stats aggregator metrics"""
+        return self.stats_aggregator.get_metrics()
+    
+    async def record_response_time(self, question_id: int, minutes: int, admin_id: int = None):
+        """Record response time for a question"""
+        response_data = {
+            'question_id': question_id,
+            'response_time_minutes': minutes,
+            'admin_id': admin_id
+        }
+        
+        await self._execute(self.client.table('response_times').insert(response_data))
+        self.response_time_sketches.add(minutes, admin_id)
+    
+    async def _write_response_events(self, events: List[ResponseEvent]):
+        """Fill first_response_at / solved_at, recording a response time the first time only
+        
+        Errors propagate, so the tracker keeps the batch and retries it.
+        """
+        async def write(event: ResponseEvent):
+            if event.kind != FIRST_RESPONSE:
+                await self._execute(
+                    self.client.table('questions').update({'solved_at': event.at.isoformat()})
+                    .eq('id', event.question_id).is_('solved_at', 'null')
+                )
+                return
             
-            if existing.data:
-                # Update existing record
-                current_value = existing.data[0].get(stat_type, 0)
-                update_data = {stat_type: current_value + increment}
-                self.client.table('daily_stats').update(update_data).eq('date', today).execute()
-            else:
-                # Create new record
-                new_data = {
-                    'date': today,
-                    'questions_created': 1 if stat_type == 'questions_created' else 0,
-                    'questions_solved': 1 if stat_type == 'questions_solved' else 0,
-                    'answers_given': 1 if stat_type == 'answers_given' else 0,
-                    'new_users': 1 if stat_type == 'new_users' else 0,
-                    'faq_searches': 1 if stat_type == 'faq_searches' else 0
-                }
-                self.client.table('daily_stats').insert(new_data).execute()
-                
+            # One transaction fills first_response_at and inserts the response time
+            try:
+                recorded = (await self._rpc('record_first_response', {
+                    'p_question_id': event.question_id,
+                    'p_at': event.at.isoformat(),
+                    'p_minutes': event.minutes,
+                    'p_admin_id': event.admin_id,
+                })).data
+            except RpcUnavailable:
+                # Schemas without the function: the guarded update decides who records the time
+                updated = await self._execute(
+                    self.client.table('questions').update({'first_response_at': event.at.isoformat()})
+                    .eq('id', event.question_id).is_('first_response_at', 'null')
+                )
+                recorded = bool(updated.data)
+                if recorded:
+                    await self._execute(self.client.table('response_times').insert({
+                        'question_id': event.question_id,
+                        'response_time_minutes': event.minutes,
+                        'admin_id': event.admin_id
+                    }))
+            if recorded:
+                self.response_time_sketches.add(event.minutes, event.admin_id)
+        
+        await asyncio.gather(*(write(event) for event in events))
+    
+    async def _merge_response_time_sketches(self, pending: Dict[tuple, TDigest]):
+        """Merge flushed digests into the stored (day, admin_id) sketches with one read and one upsert"""
+        result = await self._execute(
+            self.client.table('response_time_sketches').select('day,admin_id,sketch')
+            .in_('day', sorted({day for day, _ in pending}))
+        )
+        stored = {(row['day'], row['admin_id']): row['sketch'] for row in result.data or []}
+        
+        rows = []
+        for (day, admin_id), digest in pending.items():
+            # Merge into a copy, a failed flush puts the pending digests back as they were
+            merged = TDigest.from_json(stored[(day, admin_id)]) if (day, admin_id) in stored else TDigest()
+            merged.merge(digest)
+            rows.append({'day': day, 'admin_id': admin_id, 'sketch': merged.to_dict()})
+        await self._execute(self.client.table('response_time_sketches').upsert(rows, on_conflict='day,admin_id'))
+    
+    async def _load_response_time_sketches(self, days: Optional[int], admin_id: int = None) -> List[tuple]:
+        """(admin_id, digest) pairs of the last `days` days, including unflushed ones"""
+        start = period_start(days)
+        
+        def build_query():
+            query = self.client.table('response_time_sketches').select('day,admin_id,sketch').gte('day', start)
+            if admin_id is not None:
+                query = query.eq('admin_id', admin_id)
+            return query.order('day').order('admin_id')
+        
+        sketches = []
+        async for page in self._iter_pages(build_query):
+            sketches.extend((row['admin_id'], TDigest.from_json(row['sketch'])) for row in page)
+        return sketches + self.response_time_sketches.pending(start, admin_id)
+    
+    async def get_response_time_percentiles(self, days: Optional[int] = 30, admin_id: int = None) -> Dict:
+        """Response time count / min / max / p50 / p90 / p99 (minutes) from the daily sketches"""
+        try:
+            sketches = await self._load_response_time_sketches(days, admin_id)
+            return response_time_summary(digest for _, digest in sketches)
         except Exception as e:
-            self.logger.error(f"Error updating daily stats: {e}")
+            self.logger.error(f"Error getting response time percentiles: {e}")
+            return {}
     
-    async def record_response_time(self, question_id: int, minutes: int):
-        """Record response time for a question"""
+    async def get_admin_response_percentiles(self, days: Optional[int] = 30) -> List[tuple]:
+        """(admin_id, percentile summary) per admin, busiest first"""
         try:
-            response_data = {
-                'question_id': question_id,
-                'response_time_minutes': minutes
-            }
-            
-            self.client.table('response_times').insert(response_data).execute()
+            return admin_response_summaries(await self._load_response_time_sketches(days))
         except Exception as e:
-            self.logger.error(f"Error recording response time: {e}")
+            self.logger.error(f"Error getting admin response percentiles: {e}")
+            return []
     
     async def get_statistics_data(self, days: int = 30) -> Dict:
         """Get comprehensive statistics data"""
         try:
             stats = {}
             
-            # Calculate date range
-            from datetime import date, timedelta
-            start_date = (date.today() - timedelta(days=days)).isoformat()
+            # Calculate date range (UTC days, like the daily_stats rows)
+            start_date = period_start(days)
             
             # Daily stats for the period
-            daily_result = self.client.table('daily_stats').select('*').gte('date', start_date).order('date').execute()
+            daily_result = await self._execute(
+                self.client.table('daily_stats').select('date,' + ','.join(DAILY_STAT_COLUMNS))
+                .gte('date', start_date).order('date')
+            )
             stats['daily_data'] = daily_result.data or []
             
-            # Average response time
-            response_result = self.client.table('response_times').select('response_time_minutes').gte('created_at', start_date).execute()
-            if response_result.data:
-                total_time = sum(item['response_time_minutes'] for item in response_result.data)
-                stats['avg_response_time'] = total_time / len(response_result.data)
-            else:
-                stats['avg_response_time'] = 0
-            
-            # Top languages
-            lang_result = self.client.table('questions').select('programming_language').gte('created_at', start_date).execute()
-            if lang_result.data:
-                from collections import Counter
-                lang_counts = Counter(item['programming_language'] for item in lang_result.data)
-                stats['top_languages'] = [{'programming_language': lang, 'count': count} 
-                                        for lang, count in lang_counts.most_common(10)]
-            else:
-                stats['top_languages'] = []
+            # Average response time, top languages and status distribution in one RPC
+            try:
+                summary = await self._rpc('get_statistics_summary', {'start_date': start_date})
+                summary = summary.data
+            except RpcUnavailable:
+                summary = await self._aggregate_statistics(start_date)
             
-            # Status distribution
-            status_result = self.client.table('questions').select('status').gte('created_at', start_date).execute()
-            if status_result.data:
-                from collections import Counter
-                status_counts = Counter(item['status'] for item in status_result.data)
-                stats['status_distribution'] = [{'status': status, 'count': count} 
-                                              for status, count in status_counts.items()]
-            else:
-                stats['status_distribution'] = []
+            stats['avg_response_time'] = float(summary.get('avg_response_time') or 0)
+            stats['top_languages'] = summary.get('top_languages') or []
+            stats['status_distribution'] = summary.get('status_distribution') or []
             
             return stats
             
@@ -341,6 +732,323 @@ class SupabaseManager:
             self.logger.error(f"Error getting statistics: {e}")
             return {}
     
+    async def _aggregate_statistics(self, start_date: str) -> Dict:
+        """Client-side fallback for get_statistics_summary, folding one page at a time"""
+        from collections import Counter
+        
+        total_time = 0
+        responses = 0
+        async for page in self._iter_pages(
+            lambda: self.client.table('response_times').select('id,response_time_minutes')
+            .gte('created_at', start_date).order('id')
+        ):
+            total_time += sum(row['response_time_minutes'] or 0 for row in page)
+            responses += len(page)
+        
+        lang_counts = Counter()
+        status_counts = Counter()
+        async for page in self._iter_pages(
+            lambda: self.client.table('questions').select('id,programming_language,status')
+            .gte('created_at', start_date).order('id')
+        ):
+            lang_counts.update(row['programming_language'] for row in page)
+            status_counts.update(row['status'] for row in page)
+        
+        return {
+            'avg_response_time': total_time / responses if responses else 0,
+            'top_languages': [{'programming_language': lang, 'count': count}
+                              for lang, count in lang_counts.most_common(10)],
+            'status_distribution': [{'status': status, 'count': count}
+                                    for status, count in status_counts.items()],
+        }
+    
+    # Statistics queries behind the statistics cog
+    async def get_overview_stats(self) -> Dict:
+        """Question, user, answer and FAQ totals plus the last week's activity (one RPC)"""
+        try:
+            try:
+                summary = (await self._rpc('get_overview_stats', {})).data
+            except RpcUnavailable:
+                summary = await self._aggregate_overview_stats()
+            
+            stats = {key: summary.get(key) or 0 for key in OVERVIEW_COUNTERS}
+            for key in ('avg_response_time', 'fastest_response'):
+                value = summary.get(key)
+                stats[key] = float(value) if value is not None else None
+            stats['popular_languages'] = language_counts(summary.get('popular_languages'))
+            return stats
+        except Exception as e:
+            self.logger.error(f"Error getting overview statistics: {e}")
+            return {}
+    
+    async def _aggregate_overview_stats(self) -> Dict:
+        """Client-side fallback for get_overview_stats: HEAD counts plus one paged pass over questions"""
+        from collections import Counter
+        
+        week_start = period_start(7)
+        month_start = period_start(30)
+        
+        async def count(build_query) -> int:
+            return (await self._execute(build_query())).count or 0
+        
+        async def fold_questions():
+            # (status, language) groups as the SQL version scans them, plus the window counters
+            groups = Counter()
+            active_users = set()
+            recent = recent_solved = 0
+            async for page in self._iter_pages(
+                lambda: self.client.table('questions').select('id,user_id,status,programming_language,created_at,updated_at')
+                .order('id')
+            ):
+                for row in page:
+                    groups[(row['status'], row['programming_language'])] += 1
+                    recent += row['created_at'] >= week_start
+                    recent_solved += row['status'] == 'solved' and (row['updated_at'] or '') >= week_start
+                    if row['created_at'] >= month_start:
+                        active_users.add(row['user_id'])
+            stats = overview_totals((*group, count) for group, count in groups.items())
+            stats.update(recent_questions=recent, recent_solved=recent_solved, active_users=len(active_users))
+            return stats
+        
+        async def fold_response_times():
+            minutes = []
+            async for page in self._iter_pages(
+                lambda: self.client.table('response_times').select('id,response_time_minutes')
+                .gte('created_at', month_start).order('id')
+            ):
+                minutes.extend(row['response_time_minutes'] for row in page if row['response_time_minutes'] is not None)
+            return minutes
+        
+        async def faq_searches() -> int:
+            result = await self._execute(
+                self.client.table('daily_stats').select('faq_searches').gte('date', week_start)
+            )
+            return sum(row['faq_searches'] or 0 for row in result.data or [])
+        
+        (
+            stats, minutes,
+            total_users, new_users, total_answers, recent_answers, total_faq, searches
+        ) = await asyncio.gather(
+            fold_questions(),
+            fold_response_times(),
+            count(lambda: self.client.table('users').select('user_id', count='exact', head=True)),
+            count(lambda: self.client.table('users').select('user_id', count='exact', head=True).gte('created_at', week_start)),
+            count(lambda: self.client.table('answers').select('id', count='exact', head=True)),
+            count(lambda: self.client.table('answers').select('id', count='exact', head=True).gte('created_at', week_start)),
+            count(lambda: self.client.table('faq').select('id', count='exact', head=True)),
+            faq_searches(),
+        )
+        
+        stats.update({
+            'total_users': total_users,
+            'new_users_week': new_users,
+            'total_answers': total_answers,
+            'recent_answers': recent_answers,
+            'avg_response_time': sum(minutes) / len(minutes) if minutes else None,
+            'fastest_response': min(minutes) if minutes else None,
+            'total_faq': total_faq,
+            'faq_searches_week': searches,
+        })
+        stats['popular_languages'] = [{'programming_language': lang, 'count': count}
+                                      for lang, count in stats['popular_languages']]
+        return stats
+    
+    async def get_period_stats(self, days: Optional[int] = 30) -> Dict:
+        """Per-day question / solved counts and top languages of the last `days` days (None = all)"""
+        start_date = period_start(days)
+        try:
+            try:
+                summary = (await self._rpc('get_period_stats', {'start_date': start_date})).data
+            except RpcUnavailable:
+                summary = await self._aggregate_period_stats(start_date)
+            
+            daily = [(row['day'], row['questions'], row['solved']) for row in summary.get('daily_questions') or []]
+            return {
+                'days': days,
+                'total_questions': sum(count for _, count, _ in daily),
+                'solved_questions': sum(solved for _, _, solved in daily),
+                'daily_questions': daily,
+                'top_languages': language_counts(summary.get('top_languages')),
+            }
+        except Exception as e:
+            self.logger.error(f"Error getting period statistics: {e}")
+            return {}
+    
+    async def _aggregate_period_stats(self, start_date: str) -> Dict:
+        """Client-side fallback for get_period_stats, folding one page at a time"""
+        from collections import Counter
+        
+        questions, solved, languages = Counter(), Counter(), Counter()
+        async for page in self._iter_pages(
+            lambda: self.client.table('questions').select('id,status,programming_language,created_at')
+            .gte('created_at', start_date).order('id')
+        ):
+            for row in page:
+                day = row['created_at'][:10]
+                questions[day] += 1
+                solved[day] += row['status'] == 'solved'
+                languages[row['programming_language']] += 1
+        
+        return {
+            'daily_questions': [{'day': day, 'questions': questions[day], 'solved': solved[day]}
+                                for day in sorted(questions)],
+            'top_languages': [{'programming_language': lang, 'count': count}
+                              for lang, count in languages.most_common(10)],
+        }
+    
+    async def get_user_stats(self, user_id: int) -> Dict:
+        """Question counts, favourite languages, first / last question and average response time of a user"""
+        try:
+            rows = (await self._execute(
+                self.client.table('user_stats').select(','.join(USER_STATS_COLUMNS)).eq('user_id', user_id)
+            )).data
+            return user_stats_summary(rows[0] if rows else None)
+        except Exception as e:
+            self.logger.error(f"Error getting user statistics: {e}")
+            return {}
+    
+    # Rollups (pre-aggregated activity kept current by triggers)
+    async def rebuild_rollups(self):
+        """Recompute the rollup tables, user summaries and response time sketches from raw history"""
+        await self._rpc('rebuild_activity_rollups', {})
+        await self._rpc('rebuild_user_stats', {})
+        await self.response_time_sketches.rebuild(self._rebuild_response_time_sketches)
+    
+    async def _rebuild_response_time_sketches(self):
+        """Fold response_times into sketches client-side, then swap them in with one RPC (one transaction)"""
+        sketches = {}
+        async for page in self._iter_pages(
+            lambda: self.client.table('response_times').select('id,created_at,admin_id,response_time_minutes')
+            .order('id')
+        ):
+            for row in page:
+                fold_sketch(sketches, (row['created_at'] or '')[:10] or None, row['admin_id'],
+                            row['response_time_minutes'])
+        
+        await self._rpc('replace_response_time_sketches', {
+            'p_sketches': [{'day': day, 'admin_id': admin_id, 'sketch': digest.to_dict()}
+                           for (day, admin_id), digest in sketches.items()]
+        })
+    
+    async def get_rollup_series(self, days: Optional[int] = 30, granularity: str = 'day') -> List[tuple]:
+        """Rollup rows (bucket, *ROLLUP_COLUMNS) of the last `days` days, oldest first"""
+        table = {'day': 'daily_rollups', 'hour': 'hourly_rollups'}[granularity]
+        try:
+            rows = []
+            async for page in self._iter_pages(
+                lambda: self.client.table(table).select('bucket,' + ','.join(ROLLUP_COLUMNS))
+                .gte('bucket', period_start(days)).order('bucket')
+            ):
+                rows.extend(tuple(row[column] for column in ('bucket',) + ROLLUP_COLUMNS) for row in page)
+            return rows
+        except Exception as e:
+            self.logger.error(f"Error getting rollup series: {e}")
+            return []
+    
+    async def get_trend_stats(self, days: Optional[int] = 30) -> Dict:
+        """Moving average, week-over-week change, anomalies and next week's forecast from the daily rollups"""
+        history = None if days is None else max(days, TREND_HISTORY_DAYS)
+        return compute_trends(await self.get_rollup_series(history, 'day'), days)
+    
+    async def get_dashboard_stats(self) -> Dict:
+        """Today / this week / current state counters for /대시보드, from the rollup tables (one RPC)"""
+        try:
+            try:
+                summary = (await self._rpc('get_dashboard_stats', {})).data
+            except RpcUnavailable:
+                summary = await self._aggregate_dashboard_stats()
+            
+            stats = dashboard_totals(
+                (tuple(row[column] for column in ('bucket',) + ROLLUP_COLUMNS) for row in summary.get('days') or []),
+                ((row['status'], row['questions']) for row in summary.get('statuses') or [])
+            )
+            stats.update(
+                total_users=summary.get('total_users') or 0,
+                total_faq=summary.get('total_faq') or 0,
+                popular_languages_week=language_counts(summary.get('popular_languages_week')),
+            )
+            return stats
+        except Exception as e:
+            self.logger.error(f"Error getting dashboard statistics: {e}")
+            return {}
+    
+    async def _aggregate_dashboard_stats(self) -> Dict:
+        """Client-side fallback for get_dashboard_stats: folds the raw rows of the last week"""
+        from collections import Counter, defaultdict
+        
+        week_start = period_start(6)
+        days = defaultdict(lambda: dict.fromkeys(ROLLUP_COLUMNS, 0))
+        
+        async def fold(table: str, columns: str, apply):
+            async for page in self._iter_pages(
+                lambda: self.client.table(table).select(columns).gte('created_at', week_start).order('id')
+            ):
+                for row in page:
+                    apply(row)
+        
+        async def count(build_query) -> int:
+            return (await self._execute(build_query())).count or 0
+        
+        languages = Counter()
+        
+        def question(row):
+            days[row['created_at'][:10]]['questions_created'] += 1
+            languages[row['programming_language']] += 1
+        
+        def answer(row):
+            days[row['created_at'][:10]]['answers_given'] += 1
+        
+        def response_time(row):
+            counters = days[row['created_at'][:10]]
+            counters['response_time_sum'] += row['response_time_minutes'] or 0
+            counters['response_time_count'] += 1
+        
+        async def fold_solved():
+            async for page in self._iter_pages(
+                lambda: self.client.table('questions').select('id,updated_at').eq('status', 'solved')
+                .gte('updated_at', week_start).order('id')
+            ):
+                for row in page:
+                    days[row['updated_at'][:10]]['questions_solved'] += 1
+        
+        async def fold_users():
+            result = await self._execute(
+                self.client.table('users').select('created_at').gte('created_at', week_start)
+            )
+            for row in result.data or []:
+                days[row['created_at'][:10]]['new_users'] += 1
+        
+        statuses = ('open', 'in_progress', 'solved', 'closed')
+        results = await asyncio.gather(
+            fold('questions', 'id,programming_language,created_at', question),
+            fold('answers', 'id,created_at', answer),
+            fold('response_times', 'id,response_time_minutes,created_at', response_time),
+            fold_solved(),
+            fold_users(),
+            count(lambda: self.client.table('users').select('user_id', count='exact', head=True)),
+            count(lambda: self.client.table('faq').select('id', count='exact', head=True)),
+            *(count(lambda status=status: self.client.table('questions').select('id', count='exact', head=True)
+                    .eq('status', status)) for status in statuses),
+        )
+        total_users, total_faq = results[5], results[6]
+        
+        return {
+            'days': [{'bucket': day, **counters} for day, counters in sorted(days.items())],
+            'statuses': [{'status': status, 'questions': questions}
+                         for status, questions in zip(statuses, results[7:])],
+            'popular_languages_week': [{'programming_language': lang, 'count': count}
+                                       for lang, count in languages.most_common(3)],
+            'total_users': total_users,
+            'total_faq': total_faq,
+        }
+    
     async def close(self):
-        """Close Supabase client (no-op as it's stateless)"""
+        """Flush buffered stats and close Supabase client"""
+        await self.stats_aggregator.stop()
+        await self.response_tracker.stop()
+        await self.response_time_sketches.stop()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
         self.logger.info("Supabase client closed")
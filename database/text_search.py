@@ -0,0 +1,39 @@
+from typing import Dict, List
+from utils.tokenizer import get_tokenizer, unique_terms
+
+MAX_TERMS = 8
+
+_tokenizer = get_tokenizer()
+
+def search_terms(text: str, max_terms: int = MAX_TERMS) -> List[str]:
+    """Split free text into distinct search words (particles stripped), in order of appearance"""
+    return unique_terms(_tokenizer.words(text), max_terms)
+
+def fts5_match_query(terms: List[str]) -> str:
+    """Build an FTS5 MATCH expression where any term may match as a prefix"""
+    # Quoting makes every term a plain string, so FTS5 operators in user text are inert
+    return ' OR '.join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+# FAQ columns with their score weight when FTS is unavailable
+FAQ_SEARCH_COLUMNS = {'question': 5, 'keywords': 3, 'answer': 1}
+
+# /질문검색 search_type -> searched question columns, with their score weight
+QUESTION_SEARCH_COLUMNS = {
+    'title': {'title': 1},
+    'error': {'error_message': 1},
+    'code': {'code_snippet': 1},
+    'all': {'title': 3, 'error_message': 2, 'code_snippet': 1, 'purpose': 1},
+}
+
+def like_score(columns: Dict[str, int], terms: List[str]):
+    """SQL expression (and params) scoring how many terms each weighted column contains"""
+    expression = ' + '.join(
+        f"(IFNULL({column}, '') LIKE ?) * {weight}" for _ in terms for column, weight in columns.items()
+    )
+    params = [f'%{term}%' for term in terms for _ in columns]
+    return expression, params
+
+def contains_score(row: Dict, columns: Dict[str, int], terms: List[str]) -> int:
+    """Client-side counterpart of like_score for rows fetched through PostgREST"""
+    values = {column: (row.get(column) or '').lower() for column in columns}
+    return sum(weight * (term in values[column]) for term in terms for column, weight in columns.items())
@@ -0,0 +1,55 @@
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+class QuestionThread(NamedTuple):
+    """Question owning a thread"""
+    question_id: int
+    user_id: int
+
+class ThreadIndex:
+    """In-memory index of question thread IDs -> question id / author id"""
+    
+    def __init__(self):
+        self._threads: Dict[int, QuestionThread] = {}
+        self.loaded = False
+        self.hits = 0
+        self.misses = 0
+    
+    def load(self, rows: Iterable[Tuple[int, int, int]]):
+        """Bulk load (thread_id, question_id, user_id) rows"""
+        self._threads = {
+            thread_id: QuestionThread(question_id, user_id)
+            for thread_id, question_id, user_id in rows
+            if thread_id is not None
+        }
+        self.loaded = True
+    
+    def add(self, thread_id: int, question_id: int, user_id: int):
+        """Register a newly created question thread"""
+        if thread_id is not None:
+            self._threads[thread_id] = QuestionThread(question_id, user_id)
+    
+    def lookup(self, thread_id: int) -> Optional[QuestionThread]:
+        """Get the question owning a thread, or None for non-question threads"""
+        entry = self._threads.get(thread_id)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+    
+    def __contains__(self, thread_id: int) -> bool:
+        return thread_id in self._threads
+    
+    def __len__(self) -> int:
+        return len(self._threads)
+    
+    def get_metrics(self) -> Dict:
+        """Get size and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            'threads': len(self._threads),
+            'loaded': self.loaded,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,122 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence
+import numpy as np
+from database.statistics import ROLLUP_COLUMNS
+
+# Days of history loaded at least, so short periods still get a week-over-week change and a forecast
+TREND_HISTORY_DAYS = 28
+
+# Moving average window and forecast horizon (days)
+MOVING_AVERAGE_DAYS = 7
+FORECAST_DAYS = 7
+
+# Daily volume this many standard deviations from the period mean is flagged as an anomaly
+ANOMALY_Z_SCORE = 2.5
+# Fewer days than this make the mean / deviation too noisy for anomaly flags
+ANOMALY_MIN_DAYS = 14
+
+_QUESTIONS = 1 + ROLLUP_COLUMNS.index('questions_created')
+_SOLVED = 1 + ROLLUP_COLUMNS.index('questions_solved')
+
+def daily_arrays(rows: Iterable[Sequence], end: date) -> tuple:
+    """Zero-filled (days, questions, solved) arrays from the first rollup day through `end`
+    
+    Days without activity have no rollup row, so the series is scattered onto a dense range.
+    """
+    rows = list(rows)
+    if not rows:
+        return np.array([], dtype='datetime64[D]'), np.zeros(0), np.zeros(0)
+    
+    buckets = np.array([str(row[0])[:10] for row in rows], dtype='datetime64[D]')
+    first = buckets.min()
+    days = np.arange(first, np.datetime64(end, 'D') + 1)
+    index = (buckets - first).astype(np.int64)
+    
+    questions = np.zeros(len(days))
+    solved = np.zeros(len(days))
+    inside = index < len(days)
+    np.add.at(questions, index[inside], np.array([row[_QUESTIONS] or 0 for row in rows], dtype=float)[inside])
+    np.add.at(solved, index[inside], np.array([row[_SOLVED] or 0 for row in rows], dtype=float)[inside])
+    return days, questions, solved
+
+def moving_average(values: np.ndarray, window: int = MOVING_AVERAGE_DAYS) -> np.ndarray:
+    """Trailing moving average; the first window-1 days average over the days available"""
+    if not len(values):
+        return values
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    positions = np.arange(len(values))
+    lower = np.maximum(positions + 1 - window, 0)
+    return (cumulative[positions + 1] - cumulative[lower]) / (positions + 1 - lower)
+
+def week_over_week(values: np.ndarray) -> Dict:
+    """Last 7 days against the 7 before them (change is None without a previous week)"""
+    this_week = float(values[-7:].sum())
+    previous = values[-14:-7]
+    last_week = float(previous.sum()) if len(previous) == 7 else None
+    change = None
+    if last_week:
+        change = (this_week - last_week) / last_week * 100
+    return {'this_week': this_week, 'last_week': last_week, 'change': change}
+
+def anomalies(days: np.ndarray, values: np.ndarray, threshold: float = ANOMALY_Z_SCORE) -> List[tuple]:
+    """(day, count, z-score) of days whose volume is far from the mean, most extreme first"""
+    if len(values) < ANOMALY_MIN_DAYS:
+        return []
+    deviation = values.std()
+    if deviation == 0:
+        return []
+    scores = (values - values.mean()) / deviation
+    flagged = np.flatnonzero(np.abs(scores) >= threshold)
+    flagged = flagged[np.argsort(-np.abs(scores[flagged]))]
+    return [(str(days[i]), int(values[i]), round(float(scores[i]), 2)) for i in flagged]
+
+def linear_forecast(values: np.ndarray, horizon: int = FORECAST_DAYS,
+                    history: int = TREND_HISTORY_DAYS) -> Optional[Dict]:
+    """Least-squares line over the last `history` days, extrapolated `horizon` days ahead"""
+    recent = values[-history:]
+    if len(recent) < MOVING_AVERAGE_DAYS:
+        return None
+    positions = np.arange(len(recent))
+    slope, intercept = np.polyfit(positions, recent, 1)
+    ahead = intercept + slope * np.arange(len(recent), len(recent) + horizon)
+    return {'total': float(np.clip(ahead, 0, None).sum()), 'slope': float(slope)}
+
+def compute_trends(rows: Iterable[Sequence], days: Optional[int], today: date = None) -> Dict:
+    """Trend analytics of daily rollup rows (bucket, *ROLLUP_COLUMNS)
+    
+    rows may cover more history than the period (see TREND_HISTORY_DAYS): averages
+    and anomalies use the last `days` days (all rows for None), the week-over-week
+    change and the forecast use everything loaded.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    all_days, questions, solved = daily_arrays(rows, today)
+    if not len(all_days):
+        return {
+            'days': 0,
+            'avg_daily_questions': 0.0,
+            'moving_average': 0.0,
+            'questions_week': week_over_week(questions),
+            'solved_week': week_over_week(solved),
+            'anomalies': [],
+            'forecast': None,
+        }
+    
+    # The period window, clipped to the history that actually exists
+    if days is not None:
+        start = np.datetime64(today - timedelta(days=days), 'D')
+        period = all_days >= start
+    else:
+        period = np.ones(len(all_days), dtype=bool)
+    period_days, period_questions = all_days[period], questions[period]
+    span = len(period_days)
+    
+    averages = moving_average(questions)
+    return {
+        'days': span,
+        'avg_daily_questions': float(period_questions.sum()) / span if span else 0.0,
+        'moving_average': float(averages[-1]),
+        'questions_week': week_over_week(questions),
+        'solved_week': week_over_week(solved),
+        'anomalies': anomalies(period_days, period_questions),
+        'forecast': linear_forecast(questions),
+    }
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from utils.logger import setup_logger
+
+class WriteResult(NamedTuple):
+    """Result of a single queued write"""
+    lastrowid: Optional[int]
+    rowcount: int
+
+class WriteActor:
+    """Single writer task that group-commits queued SQLite mutations"""
+    
+    def __init__(self, pool, max_batch: int = 64, max_latency: float = 0.005):
+        self.pool = pool
+        self.max_batch = max(1, max_batch)
+        self.max_latency = max(0.0, max_latency)
+        self.logger = setup_logger()
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        
+        self._metrics = {
+            'writes': 0,
+            'failed_writes': 0,
+            'batches': 0,
+            'max_batch_size': 0,
+        }
+    
+    async def start(self):
+        """Start the writer task"""
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run(), name='sqlite-write-actor')
+    
+    async def stop(self):
+        """Commit everything still queued, then stop the writer task"""
+        if self._task is None:
+            return
+        # A None sentinel tells the writer to finish after the current queue
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+    
+    async def submit(self, sql: str, params: Sequence = ()) -> WriteResult:
+        """Queue a statement and wait until its batch has been committed"""
+        if self._task is None:
+            raise RuntimeError("Write actor is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((sql, tuple(params), future))
+        return await future
+    
+    async def submit_atomic(self, statements: Sequence[Tuple[str, Sequence]]) -> List[WriteResult]:
+        """Queue statements that commit together or not at all (a savepoint inside the batch)"""
+        if self._task is None:
+            raise RuntimeError("Write actor is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(([(sql, tuple(params)) for sql, params in statements], None, future))
+        return await future
+    
+    async def _execute_atomic(self, db, statements: List[Tuple[str, tuple]]) -> List[WriteResult]:
+        """Run grouped statements under a savepoint, undoing all of them when one fails"""
+        await db.execute('SAVEPOINT write_group')
+        results = []
+        try:
+            for sql, params in statements:
+                cursor = await db.execute(sql, params)
+                results.append(WriteResult(cursor.lastrowid, cursor.rowcount))
+                await cursor.close()
+        except Exception:
+            if db.in_transaction:
+                await db.execute('ROLLBACK TO write_group')
+                await db.execute('RELEASE write_group')
+            raise
+        await db.execute('RELEASE write_group')
+        return results
+    
+    async def _run(self):
+        """Consume the queue, committing one transaction per batch"""
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            
+            batch = [item]
+            deadline = time.monotonic() + self.max_latency
+            while len(batch) < self.max_batch:
+                # Take whatever is already queued, then wait up to the deadline for more
+                try:
+                    if self._queue.empty():
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        item = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            await self._commit_batch(batch)
+    
+    async def _commit_batch(self, batch: List[Tuple]):
+        """Run a batch of statements inside a single transaction"""
+        results: Dict[int, object] = {}
+        errors: Dict[int, Exception] = {}
+        
+        try:
+            async with self.pool.writer() as db:
+                await db.execute('BEGIN IMMEDIATE')
+                for index, (sql, params, future) in enumerate(batch):
+                    # A constraint or SQL error rolls back only the failing statement,
+                    # the rest of the batch still commits
+                    try:
+                        if params is None:
+                            results[index] = await self._execute_atomic(db, sql)
+                        else:
+                            cursor = await db.execute(sql, params)
+                            results[index] = WriteResult(cursor.lastrowid, cursor.rowcount)
+                            await cursor.close()
+                    except Exception as e:
+                        errors[index] = e
+                        if not db.in_transaction:
+                            # SQLITE_FULL / IOERR / NOMEM or an interrupt rolled back the whole
+                            # transaction: nothing of the batch was kept, so all of it fails
+                            raise
+                await db.execute('COMMIT')
+        except Exception as e:
+            self.logger.error(f"Group commit of {len(batch)} writes failed: {e}")
+            self._metrics['failed_writes'] += len(batch)
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        self._metrics['batches'] += 1
+        self._metrics['writes'] += len(results)
+        self._metrics['failed_writes'] += len(errors)
+        self._metrics['max_batch_size'] = max(self._metrics['max_batch_size'], len(batch))
+        
+        for index, (_, _, future) in enumerate(batch):
+            if future.done():
+                continue  # Caller was cancelled
+            if index in errors:
+                future.set_exception(errors[index])
+            else:
+                future.set_result(results[index])
+    
+    def get_metrics(self) -> Dict:
+        """Get write and batch counters"""
+        metrics = dict(self._metrics)
+        metrics['queued'] = self._queue.qsize() if self._queue else 0
+        metrics['avg_batch_size'] = (metrics['writes'] + metrics['failed_writes']) / metrics['batches'] if metrics['batches'] else 0.0
+        return metrics
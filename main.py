@@ -47,13 +47,22 @@ class InventOnBot(commands.Bot):
                 
             await self.db_manager.initialize()
             
+            if Config.DATABASE_COALESCE_READS:
+                from database.single_flight import SingleFlightManager
+                self.db_manager = SingleFlightManager(self.db_manager)
+            
+            if Config.DATABASE_CACHE_ENABLED:
+                from database.read_cache import CachedManager, TTLCache
+                cache = TTLCache(Config.DATABASE_CACHE_MAX_ENTRIES, Config.DATABASE_CACHE_TTL)
+                self.db_manager = CachedManager(self.db_manager, cache)
+            
             # Load cogs/extensions
             await self.load_extension('bot.cogs.question_handler')
             await self.load_extension('bot.cogs.admin_commands')
             await self.load_extension('bot.cogs.image_handler')
             await self.load_extension('bot.cogs.faq_system')
             await self.load_extension('bot.cogs.welcome_system')
-            #await self.load_extension('bot.cogs.statistics_system')
+            await self.load_extension('bot.cogs.statistics_system')
             
             self.logger.info(f"Bot setup completed successfully with {Config.DATABASE_TYPE} database")
             
@@ -61,6 +70,12 @@ class InventOnBot(commands.Bot):
             self.logger.error(f"Error during bot setup: {e}")
             raise
     
+    async def close(self):
+        """Close database connections before shutting down"""
+        if self.db_manager:
+            await self.db_manager.close()
+        await super().close()
+    
     async def on_ready(self):
         """Called when bot is ready"""
         self.logger.info(f'{self.user} has connected to Discord!')
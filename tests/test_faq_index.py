@@ -0,0 +1,55 @@
+import pytest
+
+from database.records import FaqRecord
+from utils.faq_index import FaqIndex
+
+FAQS = [
+    (1, '파이썬 설치 방법', 'python.org 에서 설치 파일을 받고 PATH 추가를 체크하세요.', 'python,설치,install'),
+    (2, '디스코드 봇 토큰 오류', '개발자 포털에서 토큰을 재발급하고 .env 파일을 수정하세요.', 'discord,token,토큰'),
+    (3, 'ModuleNotFoundError 해결', '가상환경을 활성화한 뒤 pip install 로 모듈을 설치하세요.', 'pip,module,import'),
+    (4, '가상환경 만들기', 'python -m venv venv 로 만들고 activate 스크립트를 실행하세요.', 'venv,virtualenv'),
+    (5, '비동기 함수 호출', 'async 함수는 await 로 호출해야 결과를 받을 수 있습니다.', 'async,await,asyncio'),
+]
+
+@pytest.fixture
+def index():
+    index = FaqIndex()
+    index.build(FaqRecord(id=i, question=q, answer=a, keywords=k) for i, q, a, k in FAQS)
+    return index
+
+def ids(faqs):
+    return [faq['id'] for faq in faqs]
+
+@pytest.mark.parametrize('message', [
+    'to be or not?',
+    'is it in my code?',
+    'what is this? how do I do it?',
+    'any of you here?',
+    '이거 왜 안 돼요?',
+])
+def test_stopword_messages_suggest_nothing(index, message):
+    assert index.search(message, limit=2) == []
+
+def test_short_words_do_not_prefix_match(index):
+    assert 1 not in ids(index.search('에러가 나요 in my code?', limit=2))
+    assert 2 not in ids(index.search('how to fix?', limit=2))
+
+def test_korean_particles_and_identifiers_match(index):
+    assert ids(index.search('파이썬을 설치하는데 자꾸 실패해요?', limit=2))[0] == 1
+    assert ids(index.search('봇 토큰이 잘못됐다고 나와요', limit=2))[0] == 2
+    assert ids(index.search('ModuleNotFoundError: No module named requests', limit=2))[0] == 3
+
+def test_only_the_trailing_partial_word_is_expanded(index):
+    assert 4 in ids(index.search('pip virt', limit=2))
+    assert 4 not in ids(index.search('pip virt?', limit=2))
+    assert index.search('py', limit=2) == []
+
+def test_weak_matches_are_dropped(index):
+    assert index.search('파일', limit=2) == []
+    assert ids(index.search('파일', limit=2, min_score=0)) == [1, 2]
+
+def test_upsert_and_remove(index):
+    index.upsert(FaqRecord(id=6, question='깃 푸시 거부', answer='git pull 후 push 하세요.', keywords='git,push'))
+    assert ids(index.search('git push rejected', limit=1)) == [6]
+    index.remove(6)
+    assert index.search('git push rejected', limit=1) == []
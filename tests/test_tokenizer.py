@@ -0,0 +1,18 @@
+from utils.tokenizer import get_tokenizer
+
+def test_korean_words_lose_particles():
+    assert get_tokenizer().words('에러가 설치하는데') == ['에러', '설치']
+
+def test_short_latin_words_and_stopwords_are_dropped():
+    tokenizer = get_tokenizer()
+    assert tokenizer.words('to be or not?') == []
+    assert tokenizer.words('is it in my code?') == ['code']
+    assert tokenizer.index_terms('what is the way to do it') == ['way']
+
+def test_two_character_hangul_words_are_kept():
+    assert get_tokenizer().words('봇 토큰 에러 in go') == ['토큰', '에러']
+
+def test_identifier_parts_follow_the_latin_rules():
+    assert get_tokenizer().words('ModuleNotFoundError no_such_file') == [
+        'modulenotfounderror', 'module', 'found', 'error', 'no_such_file', 'such', 'file',
+    ]
@@ -0,0 +1,169 @@
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import pickle
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence, Tuple
+
+# Chart types the service can render
+CHART_TYPES = ('daily', 'weekly', 'language', 'status')
+
+# Korean-capable fonts first, matplotlib falls back along the list
+CHART_FONTS = ['Malgun Gothic', 'AppleGothic', 'NanumGothic', 'Noto Sans CJK KR', 'DejaVu Sans']
+
+def _pyplot():
+    """Import pyplot on first use (in the render worker), with the headless Agg backend"""
+    import warnings
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from matplotlib import font_manager
+    
+    # Only installed fonts, unknown families would log a warning on every text element
+    installed = {font.name for font in font_manager.fontManager.ttflist}
+    plt.rcParams['font.family'] = [name for name in CHART_FONTS if name in installed] or ['DejaVu Sans']
+    plt.rcParams['axes.unicode_minus'] = False
+    # Without a Korean font the labels render as boxes, once is enough to know
+    warnings.filterwarnings('ignore', message='Glyph .* missing from')
+    return plt
+
+def render_chart(chart_type: str, title: str, data: Tuple) -> bytes:
+    """Render one chart to PNG bytes
+    
+    Runs in a worker process, so it only takes and returns picklable values:
+    daily / weekly: ((label, questions, solved), ...)
+    language / status: ((label, count), ...)
+    """
+    plt = _pyplot()
+    figure, axis = plt.subplots(figsize=(10, 6))
+    try:
+        axis.set_title(title)
+        if not data:
+            axis.text(0.5, 0.5, "데이터 없음", ha='center', va='center', transform=axis.transAxes)
+            axis.set_axis_off()
+        elif chart_type in ('daily', 'weekly'):
+            labels = [row[0] for row in data]
+            positions = range(len(labels))
+            axis.bar(positions, [row[1] for row in data], color='#5865F2', label="질문")
+            axis.plot(positions, [row[2] for row in data], color='#57F287', marker='o', label="해결")
+            # At most ~15 tick labels, however long the period is
+            step = max(1, len(labels) // 15)
+            axis.set_xticks(list(positions)[::step])
+            axis.set_xticklabels(labels[::step], rotation=45, ha='right')
+            axis.set_xlabel("날짜" if chart_type == 'daily' else "주")
+            axis.set_ylabel("질문 수")
+            axis.legend()
+        elif chart_type == 'language':
+            labels = [row[0] for row in data]
+            axis.barh(range(len(labels)), [row[1] for row in data], color='#5865F2')
+            axis.set_yticks(range(len(labels)))
+            axis.set_yticklabels(labels)
+            axis.invert_yaxis()
+            axis.set_xlabel("질문 수")
+        elif chart_type == 'status':
+            axis.pie([row[1] for row in data], labels=[row[0] for row in data], autopct='%1.1f%%', startangle=90)
+            axis.axis('equal')
+        else:
+            raise ValueError(f"Unknown chart type: {chart_type}")
+        
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
+        return buffer.getvalue()
+    finally:
+        plt.close(figure)
+
+def data_version(data) -> str:
+    """Content hash of chart data, so a cached PNG is reused only for identical data"""
+    return hashlib.blake2b(pickle.dumps(data), digest_size=16).hexdigest()
+
+class ChartService:
+    """Renders charts in a process pool and caches the PNG bytes
+    
+    Entries are keyed by (chart type, period, data version); concurrent
+    requests for the same key share one render.
+    """
+    
+    def __init__(self, workers: int = 1, max_entries: int = 32):
+        self.workers = max(1, workers)
+        self.max_entries = max(1, max_entries)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._cache: 'OrderedDict[Tuple[str, str, str], bytes]' = OrderedDict()
+        self._rendering: Dict[Tuple[str, str, str], asyncio.Future] = {}
+        
+        self._metrics = {
+            'hits': 0,
+            'misses': 0,
+            'shared_renders': 0,
+            'renders': 0,
+            'failed_renders': 0,
+            'render_seconds': 0.0,
+        }
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Spawned workers, forking a process with a running event loop and threads is unsafe
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+    
+    async def render(self, chart_type: str, period: str, title: str, data: Sequence) -> bytes:
+        """PNG bytes of a chart, from the cache when the same data was rendered before"""
+        data = tuple(tuple(row) for row in data)
+        key = (chart_type, period, data_version((title, data)))
+        
+        png = self._cache.get(key)
+        if png is not None:
+            self._cache.move_to_end(key)
+            self._metrics['hits'] += 1
+            return png
+        
+        self._metrics['misses'] += 1
+        shared = self._rendering.get(key)
+        if shared is not None:
+            self._metrics['shared_renders'] += 1
+            return await asyncio.shield(shared)
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._rendering[key] = future
+        started = loop.time()
+        try:
+            png = await loop.run_in_executor(self._get_executor(), render_chart, chart_type, title, data)
+        except BaseException as e:
+            if isinstance(e, Exception):
+                self._metrics['failed_renders'] += 1
+                future.set_exception(e)
+                # Mark it retrieved, a failure nobody else waited for is not an error to log twice
+                future.exception()
+            else:
+                future.cancel()
+            raise
+        finally:
+            del self._rendering[key]
+        
+        self._metrics['renders'] += 1
+        self._metrics['render_seconds'] += loop.time() - started
+        future.set_result(png)
+        
+        self._cache[key] = png
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return png
+    
+    def close(self):
+        """Stop the render workers"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def get_metrics(self) -> Dict:
+        """Get cache and render counters"""
+        metrics = dict(self._metrics)
+        metrics['cached'] = len(self._cache)
+        lookups = metrics['hits'] + metrics['misses']
+        metrics['hit_ratio'] = metrics['hits'] / lookups if lookups else 0.0
+        return metrics
@@ -0,0 +1,168 @@
+import math
+import re
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Set
+
+from utils.tokenizer import Tokenizer, get_tokenizer, unique_terms
+
+# Field weights, a match in the question counts more than one in the answer
+FIELD_WEIGHTS = {'question': 5.0, 'keywords': 3.0, 'answer': 1.0}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Distinct query terms looked up per message
+MAX_QUERY_TERMS = 32
+
+# Only a word still being typed matches index terms as a prefix, and only from this length
+MIN_PREFIX_LENGTH = 3
+
+# FAQs scoring below this are not suggested: a word shared by several answers alone
+# scores under 1, one distinctive term in a question, keywords or answer 2 or more
+MIN_SCORE = 1.0
+
+# The word a message ends in, when it does not end in a space or punctuation
+PARTIAL_WORD_PATTERN = re.compile(r'\w+$')
+
+class FaqIndex:
+    """In-memory inverted index over FAQ question / answer / keywords, ranked with BM25F
+    
+    Postings hold the precomputed per-document term weight, so a search only
+    sums idf * weight over the posting lists of the query terms. Query terms
+    match index terms exactly, except the trailing word still being typed which
+    also matches as a prefix; the tokenizer strips Korean particles and adds
+    Hangul n-grams on both sides (e.g. "에러가" finds "에러").
+    """
+    
+    def __init__(self, tokenizer: Tokenizer = None):
+        self.tokenizer = tokenizer or get_tokenizer()
+        self._faqs: Dict[int, object] = {}
+        self._doc_terms: Dict[int, Dict[str, float]] = {}
+        self._doc_lengths: Dict[int, float] = {}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._total_length = 0.0
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+        self.searches = 0
+        self.search_seconds = 0.0
+    
+    def build(self, faqs: Iterable):
+        """Rebuild the whole index from FAQ records"""
+        self._faqs.clear()
+        self._doc_terms.clear()
+        self._doc_lengths.clear()
+        self._postings.clear()
+        self._total_length = 0.0
+        
+        for faq in faqs:
+            self._analyze(faq)
+        for faq_id in self._doc_terms:
+            self._post(faq_id)
+        self._vocabulary_dirty = True
+    
+    def upsert(self, faq):
+        """Add a new FAQ or replace an edited one"""
+        self.remove(faq['id'])
+        self._analyze(faq)
+        self._post(faq['id'])
+        self._vocabulary_dirty = True
+    
+    def remove(self, faq_id: int):
+        """Drop an FAQ from the index"""
+        terms = self._doc_terms.pop(faq_id, None)
+        if terms is None:
+            return
+        self._faqs.pop(faq_id, None)
+        self._total_length -= self._doc_lengths.pop(faq_id)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(faq_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._vocabulary_dirty = True
+    
+    def _analyze(self, faq):
+        """Count weighted term frequencies of one FAQ"""
+        frequencies = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in self.tokenizer.index_terms(faq.get(field)):
+                frequencies[term] += weight
+        
+        self._faqs[faq['id']] = faq
+        self._doc_terms[faq['id']] = dict(frequencies)
+        self._doc_lengths[faq['id']] = sum(frequencies.values())
+        self._total_length += self._doc_lengths[faq['id']]
+    
+    def _post(self, faq_id: int):
+        """Write the BM25 term weights of one FAQ into the posting lists"""
+        average_length = self._total_length / len(self._doc_terms) if self._doc_terms else 1.0
+        norm = K1 * (1 - B + B * self._doc_lengths[faq_id] / (average_length or 1.0))
+        for term, frequency in self._doc_terms[faq_id].items():
+            self._postings.setdefault(term, {})[faq_id] = frequency * (K1 + 1) / (frequency + norm)
+    
+    def _expand(self, prefix: str) -> List[str]:
+        """Get the index terms starting with prefix"""
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        
+        terms = []
+        position = bisect_left(self._vocabulary, prefix)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(prefix):
+            terms.append(self._vocabulary[position])
+            position += 1
+        return terms
+    
+    def _partial_terms(self, query: str) -> Set[str]:
+        """Get the terms of the word a query ends in, when it may still be incomplete"""
+        match = PARTIAL_WORD_PATTERN.search(query or '')
+        if not match:
+            return set()
+        return {term for term in self.tokenizer.words(match.group()) if len(term) >= MIN_PREFIX_LENGTH}
+    
+    def search(self, query: str, limit: int = 5, min_score: float = MIN_SCORE) -> List:
+        """Get the FAQs best matching any word of a free-text query"""
+        started = time.perf_counter()
+        total = len(self._faqs)
+        scores: Dict[int, float] = {}
+        partial = self._partial_terms(query)
+        
+        for query_term in unique_terms(self.tokenizer.index_terms(query), MAX_QUERY_TERMS):
+            if query_term in partial:
+                terms = self._expand(query_term)
+            else:
+                terms = [query_term] if query_term in self._postings else []
+            
+            # A query term counts once per FAQ, through its best matching expansion
+            best: Dict[int, float] = {}
+            for term in terms:
+                postings = self._postings[term]
+                idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                for faq_id, weight in postings.items():
+                    score = idf * weight
+                    if score > best.get(faq_id, 0.0):
+                        best[faq_id] = score
+            for faq_id, score in best.items():
+                scores[faq_id] = scores.get(faq_id, 0.0) + score
+        
+        ranked = sorted((faq_id for faq_id in scores if scores[faq_id] >= min_score),
+                        key=scores.get, reverse=True)[:limit]
+        self.searches += 1
+        self.search_seconds += time.perf_counter() - started
+        return [self._faqs[faq_id] for faq_id in ranked]
+    
+    def __len__(self) -> int:
+        return len(self._faqs)
+    
+    def get_metrics(self) -> Dict:
+        """Get index size and search timing"""
+        return {
+            'faqs': len(self._faqs),
+            'terms': len(self._postings),
+            'searches': self.searches,
+            'avg_search_us': self.search_seconds / self.searches * 1e6 if self.searches else 0.0,
+        }
@@ -0,0 +1,330 @@
+"""Copy the SQLite database into Supabase
+
+Rows are streamed from SQLite in primary-key (keyset) order, CHUNK_SIZE at a
+time, and upserted into Supabase with at most PARALLEL chunks in flight. After
+every chunk the highest key below which all chunks are stored is written to a
+checkpoint file, so an interrupted run resumes where it stopped; upserts make
+re-sending a chunk harmless. Finally row counts and per-table checksums of
+both sides are compared, and the rollups, user summaries and response time
+sketches are rebuilt from the copied history.
+
+Usage: python utils/migrate_to_supabase.py [--sqlite data/bot.db] [--chunk-size 500] [--parallel 4]
+                                           [--checkpoint data/migration_checkpoint.json] [--restart]
+                                           [--verify-only] [--no-checksum] [--tables users,questions]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from utils.logger import setup_logger
+
+CHUNK_SIZE = 500
+PARALLEL = 4
+UPLOAD_RETRIES = 3
+
+class MigrationTable(NamedTuple):
+    """A table to copy, with the columns whose values need converting"""
+    name: str
+    key: str
+    boolean_columns: tuple = ()
+    timestamp_columns: tuple = ('created_at',)
+    identity: bool = True
+
+# Foreign-key order: referenced tables first
+TABLES = [
+    MigrationTable('users', 'user_id', boolean_columns=('is_admin',), identity=False),
+    MigrationTable('questions', 'id', timestamp_columns=('created_at', 'updated_at', 'first_response_at', 'solved_at')),
+    MigrationTable('answers', 'id', boolean_columns=('is_solution',)),
+    MigrationTable('faq', 'id'),
+    MigrationTable('daily_stats', 'id'),
+    MigrationTable('response_times', 'id'),
+]
+
+def normalize_row(table: MigrationTable, row: Dict) -> Dict:
+    """Convert SQLite values to what Supabase stores (0/1 -> booleans)"""
+    for column in table.boolean_columns:
+        if row.get(column) is not None:
+            row[column] = bool(row[column])
+    return row
+
+def canonical_value(table: MigrationTable, column: str, value):
+    """Value as compared by the checksum, identical for both backends"""
+    if value is None:
+        return None
+    if column in table.boolean_columns:
+        return bool(value)
+    if column in table.timestamp_columns:
+        # SQLite: '2024-01-01 12:00:00' (UTC), Postgres: '2024-01-01T12:00:00+00:00'
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed.isoformat()
+    return value
+
+class TableChecksum:
+    """Order-sensitive sha256 over the canonical rows of a table"""
+    
+    def __init__(self, table: MigrationTable, columns: List[str]):
+        self.table = table
+        self.columns = columns
+        self.digest = hashlib.sha256()
+        self.rows = 0
+    
+    def update(self, rows: List[Dict]):
+        for row in rows:
+            values = [canonical_value(self.table, column, row.get(column)) for column in self.columns]
+            self.digest.update(json.dumps(values, ensure_ascii=False, default=str).encode())
+            self.digest.update(b'\n')
+        self.rows += len(rows)
+    
+    def hexdigest(self) -> str:
+        return self.digest.hexdigest()
+
+class Checkpoint:
+    """Per-table migration progress persisted as JSON"""
+    
+    def __init__(self, path: str, restart: bool = False):
+        self.path = path
+        self.tables: Dict[str, Dict] = {}
+        if not restart and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.tables = json.load(f).get('tables', {})
+    
+    def table(self, name: str) -> Dict:
+        return self.tables.setdefault(name, {'last_key': None, 'rows': 0, 'done': False})
+    
+    def save(self):
+        """Write atomically, a crash mid-write must not lose the previous checkpoint"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = self.path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({'tables': self.tables, 'updated_at': datetime.now().isoformat()}, f, indent=2)
+        os.replace(temporary, self.path)
+
+class SupabaseMigrator:
+    """Streams SQLite tables into Supabase through a SupabaseManager's client"""
+    
+    def __init__(self, sqlite_path: str, manager, checkpoint: Checkpoint,
+                 chunk_size: int = CHUNK_SIZE, parallel: int = PARALLEL):
+        self.sqlite_path = sqlite_path
+        self.manager = manager
+        self.checkpoint = checkpoint
+        self.chunk_size = chunk_size
+        self.parallel = parallel
+        self.logger = setup_logger()
+        # Read-only, the bot may still be running against the same file
+        self.conn = sqlite3.connect(f'file:{sqlite_path}?mode=ro', uri=True, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+    
+    def close(self):
+        self.conn.close()
+    
+    def columns(self, table: MigrationTable) -> List[str]:
+        return [row['name'] for row in self.conn.execute(f'PRAGMA table_info({table.name})')]
+    
+    def read_chunk(self, table: MigrationTable, after_key) -> List[Dict]:
+        """Next chunk in key order (keyset pagination, no OFFSET rescans)"""
+        if after_key is None:
+            cursor = self.conn.execute(
+                f'SELECT * FROM {table.name} ORDER BY {table.key} LIMIT ?', (self.chunk_size,)
+            )
+        else:
+            cursor = self.conn.execute(
+                f'SELECT * FROM {table.name} WHERE {table.key} > ? ORDER BY {table.key} LIMIT ?',
+                (after_key, self.chunk_size)
+            )
+        return [dict(row) for row in cursor.fetchall()]
+    
+    async def upload(self, table: MigrationTable, rows: List[Dict]):
+        """Upsert one chunk, retrying transient failures with backoff"""
+        for attempt in range(1, UPLOAD_RETRIES + 1):
+            try:
+                await self.manager.upsert_rows(table.name, rows, on_conflict=table.key)
+                return
+            except Exception as e:
+                if attempt == UPLOAD_RETRIES:
+                    raise
+                self.logger.warning(f"{table.name}: chunk upload failed ({e}), retry {attempt}/{UPLOAD_RETRIES - 1}")
+                await asyncio.sleep(2 ** attempt * 0.25)
+    
+    async def migrate_table(self, table: MigrationTable) -> Dict:
+        """Copy one table, resuming after its checkpointed key"""
+        state = self.checkpoint.table(table.name)
+        if state['done']:
+            self.logger.info(f"{table.name}: already migrated ({state['rows']} rows), skipping")
+            return {'table': table.name, 'rows': 0, 'seconds': 0.0, 'skipped': True}
+        
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.parallel)
+        finished: Dict[int, tuple] = {}
+        next_index = 0
+        uploaded = 0
+        failures: List[BaseException] = []
+        tasks = []
+        
+        def commit_finished():
+            # Advance the checkpoint only over a gap-free prefix of finished chunks
+            nonlocal next_index, uploaded
+            while next_index in finished:
+                last_key, count = finished.pop(next_index)
+                state['last_key'] = last_key
+                state['rows'] += count
+                uploaded += count
+                next_index += 1
+            self.checkpoint.save()
+        
+        async def run_chunk(index: int, rows: List[Dict]):
+            try:
+                await self.upload(table, [normalize_row(table, row) for row in rows])
+                finished[index] = (rows[-1][table.key], len(rows))
+                commit_finished()
+            except BaseException as e:
+                failures.append(e)
+            finally:
+                semaphore.release()
+        
+        after_key = state['last_key']
+        index = 0
+        while not failures:
+            rows = await asyncio.to_thread(self.read_chunk, table, after_key)
+            if not rows:
+                break
+            after_key = rows[-1][table.key]
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(run_chunk(index, rows)))
+            index += 1
+        
+        await asyncio.gather(*tasks)
+        if failures:
+            raise failures[0]
+        
+        state['done'] = True
+        self.checkpoint.save()
+        seconds = time.perf_counter() - started
+        self.logger.info(
+            f"{table.name}: {uploaded} rows in {seconds:.1f}s ({uploaded / seconds if seconds else 0:.0f} rows/s)"
+        )
+        return {'table': table.name, 'rows': uploaded, 'seconds': seconds, 'skipped': False}
+    
+    async def remote_count(self, table: MigrationTable) -> int:
+        return await self.manager.count_rows(table.name, table.key)
+    
+    async def verify_table(self, table: MigrationTable, checksum: bool = True) -> Dict:
+        """Compare row counts, and optionally checksums, of both sides"""
+        local_count = self.conn.execute(f'SELECT COUNT(*) FROM {table.name}').fetchone()[0]
+        remote_count = await self.remote_count(table)
+        report = {'table': table.name, 'local_rows': local_count, 'remote_rows': remote_count,
+                  'count_ok': local_count == remote_count}
+        if not checksum:
+            return report
+        
+        columns = self.columns(table)
+        local = TableChecksum(table, columns)
+        after_key = None
+        while True:
+            rows = await asyncio.to_thread(self.read_chunk, table, after_key)
+            if not rows:
+                break
+            local.update(rows)
+            after_key = rows[-1][table.key]
+        
+        remote = TableChecksum(table, columns)
+        async for page in self.manager.iter_rows(table.name, columns, order=table.key):
+            remote.update(page)
+        
+        report['local_checksum'] = local.hexdigest()
+        report['remote_checksum'] = remote.hexdigest()
+        report['checksum_ok'] = report['local_checksum'] == report['remote_checksum']
+        return report
+    
+    @staticmethod
+    def sequence_reset_sql(tables: List[MigrationTable]) -> str:
+        """SQL moving identity sequences past the copied ids"""
+        return '\n'.join(
+            f"select setval(pg_get_serial_sequence('{table.name}', '{table.key}'), "
+            f"coalesce((select max({table.key}) from {table.name}), 0) + 1, false);"
+            for table in tables if table.identity
+        )
+
+async def run(args) -> int:
+    from database.supabase_manager import SupabaseManager
+    
+    logger = setup_logger()
+    tables = TABLES
+    if args.tables:
+        wanted = args.tables.split(',')
+        tables = [table for table in TABLES if table.name in wanted]
+    
+    manager = SupabaseManager()
+    await manager.connect()
+    checkpoint = Checkpoint(args.checkpoint, restart=args.restart)
+    migrator = SupabaseMigrator(args.sqlite, manager, checkpoint, args.chunk_size, args.parallel)
+    
+    try:
+        if not args.verify_only:
+            started = time.perf_counter()
+            total = 0
+            for table in tables:
+                result = await migrator.migrate_table(table)
+                total += result['rows']
+            seconds = time.perf_counter() - started
+            print(f"Migrated {total} rows in {seconds:.1f}s ({total / seconds if seconds else 0:.0f} rows/s)")
+        
+        ok = True
+        for table in tables:
+            report = await migrator.verify_table(table, checksum=not args.no_checksum)
+            table_ok = report['count_ok'] and report.get('checksum_ok', True)
+            ok = ok and table_ok
+            checksum_note = '' if args.no_checksum else f", checksum {'ok' if report['checksum_ok'] else 'MISMATCH'}"
+            print(f"{'✅' if table_ok else '❌'} {table.name}: "
+                  f"{report['local_rows']} local / {report['remote_rows']} remote rows{checksum_note}")
+        
+        if not args.verify_only:
+            # Triggers only saw the copied rows piecemeal, and the sketches are never copied
+            print("\nRebuilding rollups, user summaries and response time sketches...")
+            try:
+                await manager.rebuild_rollups()
+                print("✅ Rebuilt rollups, user summaries and response time sketches")
+            except Exception as e:
+                ok = False
+                logger.error(f"Rebuilding the derived tables failed: {e}")
+                print("❌ Required follow-up: python -m database.rollups (with DATABASE_TYPE=supabase)")
+            
+            print("\nRun in the Supabase SQL editor so new rows do not reuse copied ids:")
+            print(migrator.sequence_reset_sql(tables))
+        return 0 if ok else 1
+    
+    except Exception as e:
+        logger.error(f"Migration failed, rerun to resume from {args.checkpoint}: {e}")
+        return 2
+    finally:
+        migrator.close()
+        await manager.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sqlite', default=Config.DATABASE_PATH, help='SQLite database file')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--parallel', type=int, default=PARALLEL, help='chunks uploaded concurrently')
+    parser.add_argument('--checkpoint', default=os.path.join('data', 'migration_checkpoint.json'))
+    parser.add_argument('--restart', action='store_true', help='ignore an existing checkpoint')
+    parser.add_argument('--verify-only', action='store_true', help='only compare counts / checksums')
+    parser.add_argument('--no-checksum', action='store_true', help='compare row counts only')
+    parser.add_argument('--tables', help='comma separated subset of tables')
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+if __name__ == '__main__':
+    main()
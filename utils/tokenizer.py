@@ -0,0 +1,128 @@
+import re
+from typing import Iterable, List
+
+# Runs of letters/digits; Hangul, Latin and digits are split apart ("python3에서" -> "python3", "에서")
+WORD_PATTERN = re.compile(r'[가-힣]+|[A-Za-z][A-Za-z0-9]*|[0-9]+')
+
+# camelCase / PascalCase / ACRONYMWord boundaries
+IDENTIFIER_PART_PATTERN = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+')
+
+HANGUL_PATTERN = re.compile(r'^[가-힣]+$')
+
+# Particles and verb endings stripped from the end of Hangul words, longest first
+KOREAN_SUFFIXES = sorted([
+    '에서는', '에서도', '으로는', '으로도', '하는데', '했는데', '해서', '하고', '하면', '했어요', '해요', '합니다',
+    '입니다', '이에요', '예요', '인데', '는데', '에서', '으로', '에게', '한테', '까지', '부터', '처럼', '보다',
+    '이랑', '랑', '은', '는', '이', '가', '을', '를', '의', '에', '도', '만', '와', '과', '로', '요',
+], key=len, reverse=True)
+
+# A stem shorter than this is kept unstripped ("사이" is not "사" + "이")
+MIN_STEM_LENGTH = 2
+MIN_TERM_LENGTH = 2
+# Latin words and numbers need one more character ("in", "to", "my" are not search terms)
+MIN_LATIN_TERM_LENGTH = 3
+
+# English function words common in questions, never worth matching on
+ENGLISH_STOPWORDS = frozenset([
+    'and', 'any', 'are', 'but', 'can', 'did', 'does', 'for', 'from', 'has', 'have', 'how', 'its',
+    'not', 'that', 'the', 'this', 'was', 'what', 'when', 'where', 'which', 'who', 'why', 'with', 'you', 'your',
+])
+
+def is_latin_term(word: str) -> bool:
+    """Check a lower-case Latin word / number is long enough and not a stopword"""
+    return len(word) >= MIN_LATIN_TERM_LENGTH and word not in ENGLISH_STOPWORDS
+
+def strip_korean_suffix(word: str) -> str:
+    """Strip one trailing particle / ending from a Hangul word"""
+    for suffix in KOREAN_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            return word[:-len(suffix)]
+    return word
+
+def split_identifier(word: str) -> List[str]:
+    """Split camelCase / PascalCase identifiers into lower-case parts"""
+    return [part.lower() for part in IDENTIFIER_PART_PATTERN.findall(word)]
+
+def char_ngrams(word: str, sizes: Iterable[int] = (2, 3)) -> List[str]:
+    """Character n-grams of a word"""
+    return [word[i:i + size] for size in sizes for i in range(len(word) - size + 1)]
+
+class Tokenizer:
+    """Plain lower-case word tokenizer, the behaviour before Korean-aware matching"""
+    
+    def words(self, text: str) -> List[str]:
+        """Search words of a text, in order (duplicates kept)"""
+        if not text:
+            return []
+        return [word for word in re.findall(r'\w+', text.lower()) if len(word) >= MIN_TERM_LENGTH]
+    
+    def index_terms(self, text: str) -> List[str]:
+        """Terms stored in an index for a text (duplicates kept for term frequency)"""
+        return self.words(text)
+
+class KoreanTokenizer(Tokenizer):
+    """Hangul-aware tokenizer
+    
+    - Hangul words lose trailing particles / endings ("에러가" -> "에러", "설치하는데" -> "설치")
+    - Latin words need 3 characters and English stopwords are dropped ("is it in my code" -> "code")
+    - identifiers are split as well as kept whole ("ModuleNotFoundError" -> "modulenotfounderror",
+      "module", "found", "error"; "no_such_file" -> "no_such_file", "such", "file")
+    - index terms add character bigrams / trigrams of Hangul stems, so compounds and
+      unknown endings still share terms with the query
+    """
+    
+    def __init__(self, ngram_sizes: Iterable[int] = (2, 3)):
+        self.ngram_sizes = tuple(ngram_sizes)
+    
+    def words(self, text: str) -> List[str]:
+        if not text:
+            return []
+        
+        words = []
+        for chunk in re.findall(r'\w+', text):
+            if '_' in chunk:
+                words.append(chunk.lower())
+            for word in WORD_PATTERN.findall(chunk):
+                if HANGUL_PATTERN.match(word):
+                    word = strip_korean_suffix(word)
+                    if len(word) >= MIN_TERM_LENGTH:
+                        words.append(word)
+                    continue
+                
+                lowered = word.lower()
+                if is_latin_term(lowered):
+                    words.append(lowered)
+                parts = split_identifier(word)
+                if len(parts) > 1:
+                    words.extend(part for part in parts if is_latin_term(part))
+        return words
+    
+    def index_terms(self, text: str) -> List[str]:
+        terms = []
+        for word in self.words(text):
+            terms.append(word)
+            if len(word) > 2 and HANGUL_PATTERN.match(word):
+                terms.extend(char_ngrams(word, [size for size in self.ngram_sizes if size < len(word)]))
+        return terms
+
+TOKENIZERS = {
+    'simple': Tokenizer,
+    'korean': KoreanTokenizer,
+}
+
+def get_tokenizer(name: str = 'korean') -> Tokenizer:
+    """Get a tokenizer by name ('simple' or 'korean')"""
+    try:
+        return TOKENIZERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown tokenizer: {name}") from None
+
+def unique_terms(terms: Iterable[str], limit: int = None) -> List[str]:
+    """Distinct terms in order of first appearance"""
+    seen = {}
+    for term in terms:
+        if term not in seen:
+            seen[term] = None
+            if limit is not None and len(seen) >= limit:
+                break
+    return list(seen)